@@ -1,15 +1,26 @@
 """Main application for CLI interface."""
 
 import asyncio
+import os
 import signal
 import sys
-from typing import List
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 from .args import ArgParser
 from ..config.provider import EnvConfigProvider
 from ..config.params import AiParameters
 from ..llm.factory import LLMClientFactory
+from ..llm.warmup import ConnectionWarmer
+from .fanout import HEADER, combinations, fan_out, format_row
+from .pipe import DEFAULT_JOBS, PipeMode
 from ..core.assistant import AssistantService
 from ..core.history import HistoryManager
+from ..core.metrics import metrics
+from ..core.profiler import TurnProfiler
+from ..core.stats import report, totals
+from ..core.turn import TurnInfo
+from ..utils.console import ainput
+
+OUTPUT_FORMATS = ("text", "json", "jsonl")
 
 
 class Application:
@@ -49,6 +60,12 @@ class Application:
         else:
             return "stub-model"
 
+    @staticmethod
+    def _tools_enabled() -> bool:
+        """Let the model call intents as tools unless ``LLM_TOOLS=0``."""
+        import os
+        return os.getenv("LLM_TOOLS", "1").strip().lower() not in ("0", "false", "off", "no")
+
     @staticmethod
     def configure_ctrl_c() -> None:
         try:
@@ -79,7 +96,72 @@ class Application:
         print("  history clear         - Clear current conversation")
         print("  history help          - Show this help")
 
-    async def process_query(self, user_input: str, assistant: AssistantService) -> None:
+    def handle_profile_command(self, argv: List[str], profiler: TurnProfiler) -> None:
+        """``profile on``, ``profile off`` or ``profile`` (status)."""
+        action = argv[1].lower() if len(argv) > 1 else ""
+        if action == "on":
+            profiler.start()
+        elif action == "off":
+            profiler.stop()
+        elif action:
+            print("Usage: profile on|off")
+            return
+        state = f"on, writing to {profiler.directory}" if profiler.enabled else "off"
+        print(f"Profiling is {state}.")
+
+    @staticmethod
+    def show_routing(client, last: int = 10) -> None:
+        """Print the routing rules and the latest decisions, if the client routes between models."""
+        router = getattr(client, "router", None)
+        if router is None:
+            print("Routing is off; set LLM_FAST_MODEL and LLM_STRONG_MODEL to enable it.")
+            return
+        print("Routing rules:")
+        for line in router.rules.describe():
+            print(f"  {line}")
+        decisions = client.decisions[-last:]
+        if decisions:
+            print(f"Last {len(decisions)} decisions:")
+        for d in decisions:
+            latency = f"{d.latency:.2f}s" if d.latency is not None else "-"
+            print(f"  {d.tier:<6} {d.model:<24} score {d.score}  {latency:>7}  {'; '.join(d.reasons) or 'no signals'}")
+
+    @staticmethod
+    def handle_stats_command(argv: List[str]) -> None:
+        """``stats`` (report), ``stats reset`` or ``stats save PATH``."""
+        action = argv[1].lower() if len(argv) > 1 else ""
+        if action == "reset":
+            metrics.reset()
+            print("Statistics cleared.")
+        elif action == "save" and len(argv) == 3:
+            metrics.dump(argv[2], {"totals": totals(metrics)})
+            print(f"Statistics written to {argv[2]}")
+        elif action:
+            print("Usage: stats [reset | save PATH]")
+        else:
+            for line in report(metrics):
+                print(line)
+
+    @staticmethod
+    def _dump_stats() -> None:
+        """Write the session's statistics to ``METRICS_FILE``, if set."""
+        path = os.getenv("METRICS_FILE")
+        if not path:
+            return
+        try:
+            metrics.dump(path, {"totals": totals(metrics)})
+        except OSError as ex:
+            print(f"Could not write statistics to {path}: {ex}", file=sys.stderr)
+
+    @staticmethod
+    def _report_profile(paths: List[str]) -> None:
+        if paths:
+            print(f"Profile: {', '.join(paths)}", file=sys.stderr)
+
+    async def process_query(self, user_input: str, assistant: AssistantService, output: str = "text") -> None:
+        if output != "text":
+            print(await self.answer_record(user_input, assistant, output))
+            return
         try:
             answer = (await assistant.answer(user_input)).strip()
         except Exception as ex:  # noqa: BLE001
@@ -92,59 +174,221 @@ class Application:
         print(answer)
         print("\nCan I help you with anything else?")
 
+    @staticmethod
+    async def answer_record(
+        user_input: str, assistant: AssistantService, output: str, queued: Optional[float] = None
+    ) -> str:
+        """Answer ``user_input`` and return the turn as JSON (indented for ``json``, one line for ``jsonl``)."""
+        try:
+            await assistant.answer(user_input)
+            turn = assistant.last_turn
+        except Exception as ex:  # noqa: BLE001 - reported in the record
+            turn = assistant.last_turn or TurnInfo(user_input)
+            turn.error = str(ex)
+        if queued is not None:
+            turn.timings["queue"] = queued
+        return turn.to_json(indent=2 if output == "json" else None)
+
+    @staticmethod
+    def _record_output(holder: List[Optional[AssistantService]]) -> Callable[[str], None]:
+        """Command output sink that adds to the current turn of ``holder[0]``."""
+        def record(text: str) -> None:
+            assistant = holder[0]
+            if assistant is not None and assistant.last_turn is not None:
+                assistant.last_turn.output.append(text)
+        return record
+
+    async def run_pipe(self, params: AiParameters, client, jobs: int, output: str = "text") -> None:
+        """Answer each line of stdin, ``jobs`` at a time, printing answers in input order.
+
+        Commands are never prompted for, since stdin carries prompts: only
+        allowlisted ones run. Lines of the form ``session<TAB>prompt`` share
+        that session's history and run in order. With ``output`` ``json`` or
+        ``jsonl`` each answer is written as a turn record.
+        """
+        print(f"Agent: {params.agent} | Provider: {params.provider} | Model: {params.model} | Jobs: {jobs}", file=sys.stderr)
+        commands = AssistantService.create_command_service(interactive=False)
+        sessions: Dict[str, Tuple[AssistantService, List[Callable[[str], None]]]] = {}
+        use_tools = self._tools_enabled()
+
+        def assistant_for(sink: Callable[[str], None]) -> AssistantService:
+            service = commands.fork(commands.confirmation, sink)
+            return AssistantService(params, client, HistoryManager(), use_tools, service)
+
+        async def ask(assistant: AssistantService, prompt: str, waited: float) -> str:
+            if output == "text":
+                return await assistant.answer(prompt)
+            return await self.answer_record(prompt, assistant, output, waited)
+
+        async def answer(session: Optional[str], prompt: str, printed: Callable[[str], None], waited: float) -> str:
+            # In the JSON formats command output goes into the record instead
+            if session is None:
+                holder: List[Optional[AssistantService]] = [None]
+                holder[0] = assistant_for(printed if output == "text" else self._record_output(holder))
+                return await ask(holder[0], prompt, waited)
+            # A session's prompts run one at a time, so its output goes to the current prompt's sink
+            if session not in sessions:
+                sink: List[Callable[[str], None]] = [printed]
+                sessions[session] = (assistant_for(lambda text: sink[0](text)), sink)
+            assistant, sink = sessions[session]
+            sink[0] = printed if output == "text" else self._record_output([assistant])
+            return await ask(assistant, prompt, waited)
+
+        # print() ends each record's line; text answers get a blank line between them
+        try:
+            await PipeMode(answer, jobs, separator="\n" if output == "text" else "").run()
+        finally:
+            await commands.close()
+
+    def _params_for(self, params: AiParameters, agent: Optional[str], model: Optional[str]) -> AiParameters:
+        """``params`` with the agent (and its provider, key and default model) and the model overridden."""
+        if agent:
+            normalized_agent = ArgParser.normalize_agent(agent) or params.agent
+            provider = self._get_provider_for_agent(normalized_agent)
+            api_key = self._get_api_key_for_provider(provider)
+            default_model = self._get_default_model_for_provider(provider)
+            params = AiParameters(
+                agent=normalized_agent,
+                model=default_model,
+                provider=provider,
+                api_key=api_key,
+                system_prompt=params.system_prompt,
+            )
+        if model:
+            params = AiParameters(
+                agent=params.agent,
+                model=model,
+                provider=params.provider,
+                api_key=params.api_key,
+                system_prompt=params.system_prompt,
+            )
+        return params
+
+    async def run_fanout(
+        self, params: AiParameters, question: str, agents: List[str], models: List[str], output: str = "text"
+    ) -> List[TurnInfo]:
+        """Ask ``question`` of every agent/model combination at once, printing each result as it arrives.
+
+        As in pipe mode commands are never prompted for, and each result
+        carries its own command output.
+        """
+        def provider_of(agent: str) -> str:
+            return self._get_provider_for_agent(ArgParser.normalize_agent(agent) or params.agent)
+
+        if agents:
+            pairs = combinations(agents, models or [None], provider_of)
+        else:
+            pairs = [(None, model) for model in models]  # the configured agent with each model
+        if not pairs:
+            print("No agent serves any of the requested models.", file=sys.stderr)
+            return []
+        commands = AssistantService.create_command_service(interactive=False)
+        use_tools = self._tools_enabled()
+
+        def run_for(target: AiParameters) -> Callable[[], Awaitable[TurnInfo]]:
+            async def run() -> TurnInfo:
+                holder: List[Optional[AssistantService]] = [None]
+                service = commands.fork(commands.confirmation, self._record_output(holder))
+                assistant = holder[0] = AssistantService(
+                    target, LLMClientFactory.create(target), HistoryManager(), use_tools, service
+                )
+                try:
+                    await assistant.answer(question)
+                except Exception as ex:  # noqa: BLE001 - one failed model must not stop the rest
+                    assistant.last_turn.error = str(ex)
+                return assistant.last_turn
+            return run
+
+        targets = [self._params_for(params, agent, model) for agent, model in pairs]
+        print(f"Asking {len(targets)} agent/model combinations", file=sys.stderr)
+        if output == "text":
+            print(HEADER)
+            write = lambda turn: print(format_row(turn))
+        else:
+            write = lambda turn: print(turn.to_json(indent=2 if output == "json" else None))
+        try:
+            return await fan_out([run_for(target) for target in targets], write)
+        finally:
+            await commands.close()
+
+    async def run_once(self, argv: List[str], params: AiParameters, history_manager: HistoryManager) -> None:
+        """Answer the question in ``argv``, or every line of stdin for ``-``."""
+        jobs, rest = ArgParser.extract_option(argv, "jobs")
+        output, rest = ArgParser.extract_option(rest, "output")
+        output = (output or "text").lower()
+        if output not in OUTPUT_FORMATS:
+            print(f"Unknown --output {output!r}; use one of: {', '.join(OUTPUT_FORMATS)}", file=sys.stderr)
+            return
+        question, agent_override, model_override = self._arg_parser.parse(rest)
+        agents = [a.strip() for a in (agent_override or "").split(",") if a.strip()]
+        models = [m.strip() for m in (model_override or "").split(",") if m.strip()]
+        if len(agents) > 1 or len(models) > 1:
+            if question.strip() == "-":
+                print("Several agents or models cannot be combined with pipe mode.", file=sys.stderr)
+                return
+            await self.run_fanout(params, question, agents, models, output)
+            return
+        params = self._params_for(params, agent_override, model_override)
+        client = LLMClientFactory.create(params)
+        if question.strip() == "-":
+            await self.run_pipe(params, client, int(jobs or os.getenv("PIPE_JOBS") or DEFAULT_JOBS), output)
+            return
+        # Keep stdout for the record: banner to stderr, command output into the record,
+        # and no confirmation prompts (only allowlisted commands run)
+        banner = {} if output == "text" else {"file": sys.stderr}
+        holder: List[Optional[AssistantService]] = [None]
+        commands = None if output == "text" else AssistantService.create_command_service(
+            interactive=False, output=self._record_output(holder)
+        )
+        assistant = AssistantService(params, client, history_manager, self._tools_enabled(), commands)
+        holder[0] = assistant
+        print(f"Agent: {params.agent} | Provider: {params.provider} | Model: {params.model}", **banner)
+        if params.provider == "stub":
+            print("WARNING: No API key detected — using stub client. Set OPENAI_API_KEY or GEMINI_API_KEY in .env.", **banner)
+        try:
+            await self.process_query(question, assistant, output)
+        finally:
+            await assistant.close()
+
     async def run(self, argv: List[str]) -> None:
         self.configure_ctrl_c()
+        profile, args = ArgParser.extract_flag(argv[1:], "profile")
+        profiler = TurnProfiler.from_env()
+        if profile:
+            profiler.start()
 
         # Check for history commands first
-        if len(argv) > 1 and self._arg_parser.is_history_command(argv[1:]):
-            self.handle_history_command(argv[1:])
+        if args and self._arg_parser.is_history_command(args):
+            self.handle_history_command(args)
             return
 
         # Build params + assistant once (REPL preserves memory)
         params = EnvConfigProvider().load()
         history_manager = HistoryManager()
 
-        # ONE-SHOT
-        if len(argv) > 1:
-            question, agent_override, model_override = self._arg_parser.parse(argv[1:])
-            if agent_override:
-                normalized_agent = ArgParser.normalize_agent(agent_override) or params.agent
-                provider = self._get_provider_for_agent(normalized_agent)
-                api_key = self._get_api_key_for_provider(provider)
-                model = self._get_default_model_for_provider(provider)
-                params = AiParameters(
-                    agent=normalized_agent,
-                    model=model,
-                    provider=provider,
-                    api_key=api_key,
-                    system_prompt=params.system_prompt,
-                )
-            if model_override:
-                params = AiParameters(
-                    agent=params.agent,
-                    model=model_override,
-                    provider=params.provider,
-                    api_key=params.api_key,
-                    system_prompt=params.system_prompt,
-                )
-            client = LLMClientFactory.create(params)
-            assistant = AssistantService(params, client, history_manager)
-            print(f"Agent: {params.agent} | Provider: {params.provider} | Model: {params.model}")
-            if params.provider == "stub":
-                print("WARNING: No API key detected — using stub client. Set OPENAI_API_KEY or GEMINI_API_KEY in .env.")
-            await self.process_query(question, assistant)
+        # ONE-SHOT (or "-": every line of stdin), profiled as a single turn
+        if args:
+            with profiler.turn(" ".join(args)) as paths:
+                await self.run_once(args, params, history_manager)
+            self._report_profile(paths)
+            self._dump_stats()
             return
 
         # REPL
         client = LLMClientFactory.create(params)
-        assistant = AssistantService(params, client, history_manager)
+        # Connect to the provider while the user types the first question
+        warmer = ConnectionWarmer.from_env(client)
+        if warmer is not None:
+            warmer.start()
+            client = warmer.client
+        assistant = AssistantService(params, client, history_manager, use_tools=self._tools_enabled())
         print(f"Agent: {params.agent} | Provider: {params.provider} | Model: {params.model}")
         if params.provider == "stub":
             print("WARNING: No API key detected — using stub client. Set OPENAI_API_KEY or GEMINI_API_KEY in .env.")
         print("Type your request (or 'exit', 'history help' for history commands)")
         while True:
             try:
-                user_in = input("\nHow can I help?\n> ")
+                user_in = await ainput("\nHow can I help?\n> ")
             except (EOFError, KeyboardInterrupt):
                 print("\nBye!")
                 break
@@ -157,13 +401,28 @@ class Application:
             if self._arg_parser.is_history_command(command_parts):
                 self.handle_history_command(command_parts, assistant)
                 continue
+            if command_parts[:1] == ["profile"]:
+                self.handle_profile_command(command_parts, profiler)
+                continue
+            if command_parts[:1] == ["routing"]:
+                self.show_routing(client)
+                continue
+            if command_parts[:1] == ["stats"]:
+                self.handle_stats_command(command_parts)
+                continue
             
             try:
-                await self.process_query(user_in, assistant)
+                with profiler.turn(user_in) as paths:
+                    await self.process_query(user_in, assistant)
+                self._report_profile(paths)
             except KeyboardInterrupt:
                 print("\nCanceled.")
             except Exception as e:  # noqa: BLE001
                 print(f"Error: {e}", file=sys.stderr)
+        await assistant.close()
+        if warmer is not None:
+            await warmer.stop()
+        self._dump_stats()
 
 
 async def main_async(argv: list[str]) -> None:
@@ -27,6 +27,33 @@ class ArgParser:
             i += 1
         return (" ".join(parts), agent, model)
     
+    @staticmethod
+    def extract_option(argv: List[str], name: str) -> Tuple[Optional[str], List[str]]:
+        """Remove ``--name=value`` / ``--name value`` from ``argv``; return the value and the rest."""
+        value = None
+        rest: List[str] = []
+        flag = f"--{name}"
+        i = 0
+        while i < len(argv):
+            a = argv[i]
+            low = a.lower()
+            if low.startswith(flag + "="):
+                value = a.split("=", 1)[1]
+            elif low == flag and i + 1 < len(argv):
+                i += 1
+                value = argv[i]
+            else:
+                rest.append(a)
+            i += 1
+        return value, rest
+
+    @staticmethod
+    def extract_flag(argv: List[str], name: str) -> Tuple[bool, List[str]]:
+        """Remove every ``--name`` from ``argv``; return whether there was one and the rest."""
+        flag = f"--{name}"
+        rest = [a for a in argv if a.lower() != flag]
+        return len(rest) != len(argv), rest
+
     def is_history_command(self, argv: List[str]) -> bool:
         """Check if the command is a history management command."""
         if not argv:
@@ -0,0 +1,53 @@
+"""Asking one question of several agents and models at once."""
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+from ..core.turn import TurnInfo
+from ..llm.pricing import provider_for
+
+HEADER = f"{'provider/model':<32} {'latency':>8} {'tokens':>7} {'cost':>10}"
+
+
+def combinations(
+    agents: Sequence[str], models: Sequence[Optional[str]], provider_of: Callable[[str], str]
+) -> List[Tuple[str, Optional[str]]]:
+    """Every (agent, model) pair whose agent can serve the model.
+
+    A model is skipped for agents of another provider when its name says
+    which provider serves it (``gpt-*``, ``gemini-*``); unknown names are
+    tried with every agent. A None model means the agent's default.
+    """
+    pairs = []
+    for agent in agents:
+        provider = provider_of(agent)
+        for model in models:
+            owner = provider_for(model) if model else None
+            if owner is None or provider == "stub" or owner == provider:
+                pairs.append((agent, model))
+    return pairs
+
+
+def format_row(turn: TurnInfo) -> str:
+    """One result: a row of the table followed by the indented answer."""
+    label = f"{turn.provider}/{turn.model}"
+    latency = f"{turn.timings.get('total', 0.0):.2f}s"
+    tokens = str(turn.usage["total_tokens"]) if turn.usage else "-"
+    cost = f"${turn.cost:.6f}" if turn.cost is not None else "-"
+    body = [f"error: {turn.error}"] if turn.error else turn.output + [turn.answer.strip() or "No answer."]
+    lines = "\n".join(body).splitlines()
+    return "\n".join([f"{label:<32} {latency:>8} {tokens:>7} {cost:>10}"] + ["    " + line for line in lines])
+
+
+async def fan_out(
+    runs: Sequence[Callable[[], Awaitable[TurnInfo]]], write: Callable[[TurnInfo], None]
+) -> List[TurnInfo]:
+    """Start every run at once and ``write`` each turn as soon as it finishes.
+
+    Returns the turns in completion order.
+    """
+    finished: List[TurnInfo] = []
+    for done in asyncio.as_completed([run() for run in runs]):
+        turn = await done
+        write(turn)
+        finished.append(turn)
+    return finished
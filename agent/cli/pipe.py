@@ -0,0 +1,113 @@
+"""Answering prompts piped on stdin concurrently, in input order."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from ..utils.console import ainput
+
+DEFAULT_JOBS = 4
+
+# Runs one prompt; the callable passed in receives printed output lines and
+# the float is how long the prompt waited for its turn, in seconds. The
+# session key is None for a prompt with a session of its own.
+Answerer = Callable[[Optional[str], str, Callable[[str], None], float], Awaitable[str]]
+
+
+def parse_line(line: str) -> Tuple[Optional[str], str]:
+    """``session<TAB>prompt`` belongs to a named session; any other line stands alone."""
+    session, sep, prompt = line.partition("\t")
+    if sep and session.strip():
+        return session.strip(), prompt.strip()
+    return None, line.strip()
+
+
+class PipeMode:
+    """Reads prompts until EOF and answers up to ``jobs`` of them at once.
+
+    Prompts of the same named session run one after another so each sees
+    the previous answers; all others run independently. Answers are
+    written in input order. Reading pauses while ``window`` prompts are
+    started but not yet written, so a slow prompt holds at most that many
+    finished answers in memory.
+    """
+
+    def __init__(
+        self,
+        answer: Answerer,
+        jobs: int = DEFAULT_JOBS,
+        window: Optional[int] = None,
+        write: Callable[[str], None] = print,
+        read: Callable[[], Awaitable[str]] = ainput,
+        separator: str = "\n",
+    ) -> None:
+        if jobs < 1:
+            raise ValueError("jobs must be at least 1")
+        self._answer = answer
+        self._slots = asyncio.Semaphore(jobs)
+        self._window = max(window or 4 * jobs, jobs)
+        self._write = write
+        self._read = read
+        self._separator = separator  # written after each answer
+        self._done: Dict[int, str] = {}
+        self._next = 0  # index of the next answer to write
+        self._progress = asyncio.Condition()
+
+    async def run(self) -> int:
+        """Answer every prompt on stdin; return how many there were."""
+        tails: Dict[str, "asyncio.Task[None]"] = {}  # last unfinished prompt of each session
+        running: Set["asyncio.Task[None]"] = set()  # finished tasks are dropped as they end
+        failures: List[BaseException] = []
+        index = 0
+
+        def finished(task: "asyncio.Task[None]", session: Optional[str]) -> None:
+            running.discard(task)
+            if session and tails.get(session) is task:
+                del tails[session]
+            if not task.cancelled() and task.exception() is not None:
+                failures.append(task.exception())
+
+        try:
+            while not failures:
+                try:
+                    line = await self._read()
+                except EOFError:
+                    break
+                session, prompt = parse_line(line)
+                if not prompt:
+                    continue
+                async with self._progress:
+                    await self._progress.wait_for(lambda: index - self._next < self._window)
+                task = asyncio.ensure_future(self._run_one(index, session, prompt, tails.get(session or "")))
+                if session:
+                    tails[session] = task
+                running.add(task)
+                task.add_done_callback(lambda t, s=session: finished(t, s))
+                index += 1
+            await asyncio.gather(*running)
+            if failures:
+                raise failures[0]
+        finally:
+            for task in list(running):
+                task.cancel()
+        return index
+
+    async def _run_one(
+        self, index: int, session: Optional[str], prompt: str, after: Optional["asyncio.Task[None]"]
+    ) -> None:
+        queued = time.perf_counter()
+        if after is not None:
+            await asyncio.gather(after, return_exceptions=True)
+        lines: List[str] = []
+        async with self._slots:
+            try:
+                waited = time.perf_counter() - queued
+                answer = (await self._answer(session, prompt, lines.append, waited)).strip()
+            except Exception as ex:  # noqa: BLE001 - one failed prompt must not stop the rest
+                answer = f"LLM error: {ex}"
+        lines.append(answer or "No answer.")
+        async with self._progress:
+            self._done[index] = "\n".join(lines)
+            while self._next in self._done:
+                self._write(self._done.pop(self._next) + self._separator)
+                self._next += 1
+            self._progress.notify_all()
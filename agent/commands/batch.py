@@ -0,0 +1,40 @@
+"""Run several command-producing tasks concurrently behind one confirmation."""
+
+from typing import List
+from .confirm import BatchConfirmation
+from .service import CommandService
+
+
+class CommandBatch:
+    """Per-task views of a CommandService for concurrent intent handlers.
+
+    Each slot shares the runner but confirms through one BatchConfirmation
+    and buffers what it prints. Buffers are written to the parent service
+    in slot order: a slot's output appears once it and every slot before
+    it have finished, so the transcript does not depend on timing. With
+    ``echo=False`` nothing is written and callers collect ``text(slot)``,
+    which then holds only the commands' own output, unframed.
+    """
+
+    def __init__(self, service: CommandService, slots: int, echo: bool = True) -> None:
+        self._service = service
+        self._echo = echo
+        self._confirmation = BatchConfirmation(service.confirmation, slots)
+        self._buffers: List[List[str]] = [[] for _ in range(slots)]
+        self._done = [False] * slots
+        self._flushed = 0
+        self.slots = [service.fork(self._confirmation, buffer.append, framed=echo) for buffer in self._buffers]
+
+    def finish(self, slot: int) -> None:
+        """Mark ``slot`` finished and write out every completed leading slot."""
+        self._done[slot] = True
+        self._confirmation.slot_done()
+        while self._flushed < len(self._done) and self._done[self._flushed]:
+            if self._echo:
+                for text in self._buffers[self._flushed]:
+                    self._service.write(text)
+            self._flushed += 1
+
+    def text(self, slot: int) -> str:
+        """Everything ``slot`` has printed so far."""
+        return "\n".join(self._buffers[slot]).strip()
@@ -1,6 +1,8 @@
 """User confirmation interfaces and implementations."""
 
-from typing import Protocol
+import asyncio
+from typing import List, Protocol, Set, Tuple
+from ..utils.console import ainput
 
 
 class UserConfirmation(Protocol):
@@ -13,7 +15,54 @@ class StdInConfirmation:
         print("\nIn order to do that, you need to run:")
         print(command)
         try:
-            reply = input("Would you like to run this command? [y/N] ").strip().lower()
+            reply = (await ainput("Would you like to run this command? [y/N] ")).strip().lower()
             return reply == "y"
         except (EOFError, KeyboardInterrupt):
             return False
+
+
+class BatchConfirmation:
+    """Collects confirmations from ``slots`` concurrent callers and asks once.
+
+    A request is held until every slot still running is waiting for an
+    answer (or has called ``slot_done``); the held commands are then shown
+    together and the single answer applies to all of them. Commands the
+    inner confirmation can settle without asking (its ``decide`` method,
+    if any) are answered at once.
+    """
+
+    def __init__(self, inner: UserConfirmation, slots: int) -> None:
+        self._inner = inner
+        self._active = slots
+        self._pending: List[Tuple[str, "asyncio.Future[bool]"]] = []
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    async def confirm(self, command: str) -> bool:
+        decide = getattr(type(self._inner), "decide", None)
+        if decide is not None and (decided := decide(self._inner, command)) is not None:
+            return decided
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((command, future))
+        self._maybe_ask()
+        return await future
+
+    def slot_done(self) -> None:
+        self._active -= 1
+        self._maybe_ask()
+
+    def _maybe_ask(self) -> None:
+        if not self._pending or len(self._pending) < self._active:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._ask(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _ask(self, batch: List[Tuple[str, "asyncio.Future[bool]"]]) -> None:
+        try:
+            approved = await self._inner.confirm("\n".join(command for command, _ in batch))
+        except Exception:  # noqa: BLE001 - treat a failed prompt as a refusal
+            approved = False
+        for _, future in batch:
+            if not future.done():
+                future.set_result(approved)
@@ -0,0 +1,192 @@
+"""Rule-based command approval in front of an interactive prompt."""
+
+import json
+import os
+import shlex
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatchcase
+from typing import Deque, Iterable, List, Optional
+from ..core.metrics import Metrics, metrics as default_metrics
+from ..utils.os_utils import simple_argv
+from .confirm import UserConfirmation
+
+# Read-only commands the built-in intents issue. Each word is a glob matched
+# against one word of the command; commands with shell syntax never match.
+DEFAULT_ALLOW = (
+    "date",
+    "date +*",
+    "ls",
+    "ls -l",
+    "ls -la",
+    "curl -s https://wttr.in",
+    "curl -s https://wttr.in/*",
+    "curl -s https://ifconfig.me",
+    "curl.exe -s https://wttr.in",
+    "curl.exe -s https://wttr.in/*",
+    'powershell -Command "Get-Date -Format *"',
+    "GET https://wttr.in/*",
+    "GET https://ifconfig.me/ip",
+)
+
+# Commands that only read state. CommandService may start these while the
+# user is still deciding, and throws the output away if they say no.
+READ_ONLY = (
+    "date",
+    "date +*",
+    "ls ...",
+    "pwd",
+    "whoami",
+    "hostname",
+    "uname ...",
+    "curl -s https://wttr.in",
+    "curl -s https://wttr.in/*",
+    "curl -s https://ifconfig.me",
+    "curl.exe -s https://wttr.in",
+    "curl.exe -s https://wttr.in/*",
+    'powershell -Command "Get-Date -Format *"',
+    "GET https://wttr.in/*",
+    "GET https://ifconfig.me/ip",
+)
+
+PROMPT = "prompt"
+DENY = "deny"
+
+
+@dataclass(frozen=True)
+class Decision:
+    command: str
+    approved: bool
+    reason: str  # "allowlist", "prompt" or "non-interactive"
+    rule: Optional[str] = None
+    time: float = 0.0
+
+
+class CommandPolicy:
+    """An allowlist of argv patterns such as ``date +*`` or ``ls -l``.
+
+    A rule matches a command with the same number of words whose words
+    each match the rule's glob; a final ``...`` word matches any further
+    words. Commands that use pipes, redirects, substitutions or other
+    shell syntax are never matched.
+    """
+
+    def __init__(self, rules: Iterable[str]) -> None:
+        self._rules = [(rule, shlex.split(rule)) for rule in rules if rule.strip()]
+
+    @property
+    def rules(self) -> List[str]:
+        return [rule for rule, _ in self._rules]
+
+    @classmethod
+    def from_env(cls) -> "CommandPolicy":
+        """Defaults plus ``COMMAND_ALLOW`` (``;``-separated) and ``COMMAND_ALLOW_FILE`` (one rule per line)."""
+        rules = list(DEFAULT_ALLOW)
+        rules += os.getenv("COMMAND_ALLOW", "").split(";")
+        path = os.getenv("COMMAND_ALLOW_FILE")
+        if path:
+            with open(os.path.expanduser(path), encoding="utf-8") as f:
+                rules += [line.strip() for line in f if not line.lstrip().startswith("#")]
+        return cls(rules)
+
+    def match(self, command: str) -> Optional[str]:
+        """Return the rule that allows ``command``, or None."""
+        argv = simple_argv(command.strip())
+        if not argv:
+            return None
+        for rule, words in self._rules:
+            if words and words[-1] == "...":
+                words = words[:-1]
+                if len(argv) < len(words):
+                    continue
+            elif len(words) != len(argv):
+                continue
+            if all(fnmatchcase(a, w) for a, w in zip(argv, words)):
+                return rule
+        return None
+
+
+class PolicyConfirmation:
+    """Approves allowlisted commands without asking and prompts for the rest.
+
+    With ``interactive`` off nothing is ever prompted: commands outside the
+    allowlist are refused. Every decision is kept in ``decisions`` (the
+    last ``history`` of them), counted in ``metrics`` and, with
+    ``log_path``, appended to a JSON-lines file.
+    """
+
+    def __init__(
+        self,
+        inner: UserConfirmation,
+        policy: CommandPolicy,
+        interactive: bool = True,
+        log_path: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+        history: int = 100,
+    ) -> None:
+        self._inner = inner
+        self._policy = policy
+        self._interactive = interactive
+        self._log_path = log_path
+        self._metrics = metrics or default_metrics
+        self._decisions: Deque[Decision] = deque(maxlen=history)
+
+    @classmethod
+    def from_env(cls, inner: UserConfirmation, interactive: bool = True) -> "PolicyConfirmation":
+        """``COMMAND_APPROVAL=prompt`` (default) or ``deny``; ``COMMAND_APPROVAL_LOG`` names the log file.
+
+        ``interactive=False`` forces ``deny``, e.g. when stdin carries input rather than answers.
+        """
+        mode = os.getenv("COMMAND_APPROVAL", PROMPT).strip().lower()
+        if mode not in (PROMPT, DENY):
+            raise ValueError(f"COMMAND_APPROVAL must be '{PROMPT}' or '{DENY}', not {mode!r}")
+        log_path = os.getenv("COMMAND_APPROVAL_LOG")
+        return cls(
+            inner,
+            CommandPolicy.from_env(),
+            interactive=interactive and mode == PROMPT,
+            log_path=os.path.expanduser(log_path) if log_path else None,
+        )
+
+    @property
+    def interactive(self) -> bool:
+        return self._interactive
+
+    @property
+    def decisions(self) -> List[Decision]:
+        return list(self._decisions)
+
+    def decide(self, command: str) -> Optional[bool]:
+        """Decide ``command`` without prompting, or return None if the user must be asked.
+
+        A multi-line ``command`` (a batch) is allowed only if every line is.
+        """
+        rules = [self._policy.match(line) for line in command.splitlines()]
+        if rules and all(rules):
+            self._record(Decision(command, True, "allowlist", "; ".join(dict.fromkeys(rules)), time.time()))
+            return True
+        if not self._interactive:
+            self._record(Decision(command, False, "non-interactive", None, time.time()))
+            return False
+        return None
+
+    async def confirm(self, command: str) -> bool:
+        decided = self.decide(command)
+        if decided is not None:
+            return decided
+        approved = await self._inner.confirm(command)
+        self._record(Decision(command, approved, "prompt", None, time.time()))
+        return approved
+
+    def _record(self, decision: Decision) -> None:
+        self._decisions.append(decision)
+        if decision.reason == "prompt":
+            self._metrics.incr("confirm.prompted")
+        self._metrics.incr("confirm.approved" if decision.approved else "confirm.refused")
+        if self._log_path:
+            try:
+                with open(self._log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(decision)) + "\n")
+            except OSError:
+                pass  # the log is best effort; never block a command on it
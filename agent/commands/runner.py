@@ -1,9 +1,69 @@
 """Command execution interfaces and implementations."""
 
 import asyncio
-from typing import Protocol, Tuple
+import codecs
+import os
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Protocol, Tuple
+from ..core.metrics import Metrics, metrics as default_metrics
 from ..utils.os_utils import OS
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Called with ("stdout" | "stderr", line) for every line as it is read.
+LineCallback = Callable[[str, str], None]
+
+DEFAULT_TAIL_LINES = 200
+DEFAULT_TIMEOUT = 60.0
+_READ_SIZE = 64 * 1024
+_KILL_GRACE = 2.0
+
+
+@dataclass(frozen=True)
+class CommandStats:
+    """Resource use of one command.
+
+    CPU time and max RSS come from ``RUSAGE_CHILDREN`` deltas, so they are
+    approximate when several commands finish at the same time; max RSS is
+    None when this command did not raise the children's high-water mark.
+    """
+    wall_time: float
+    cpu_time: Optional[float] = None
+    max_rss_kb: Optional[int] = None
+    timed_out: bool = False
+
+
+class CommandResult(tuple):
+    """``(code, stdout, stderr)`` that also carries the command's stats."""
+
+    stats: Optional[CommandStats]
+
+    def __new__(cls, code: int, stdout: str, stderr: str, stats: Optional[CommandStats] = None) -> "CommandResult":
+        result = super().__new__(cls, (code, stdout, stderr))
+        result.stats = stats
+        return result
+
+
+def limits_from_env() -> Dict[str, Any]:
+    """Runner limits from ``COMMAND_TIMEOUT`` (seconds, 0 = none), ``COMMAND_CPU_SECONDS`` and ``COMMAND_MAX_MEMORY_MB``.
+
+    Returned as ``timeout``, ``cpu_seconds`` and ``memory_bytes`` keyword arguments.
+    """
+    timeout = float(os.getenv("COMMAND_TIMEOUT", DEFAULT_TIMEOUT))
+    cpu = os.getenv("COMMAND_CPU_SECONDS")
+    memory = os.getenv("COMMAND_MAX_MEMORY_MB")
+    return {
+        "timeout": timeout or None,
+        "cpu_seconds": int(cpu) if cpu else None,
+        "memory_bytes": int(memory) * 1024 * 1024 if memory else None,
+    }
+
 
 class CommandRunner(Protocol):
     async def run(self, command: str) -> Tuple[int, str, str]:
@@ -11,20 +71,200 @@ class CommandRunner(Protocol):
 
 
 class SubprocessRunner:
+    """Runs commands through the platform shell.
+
+    Each command gets ``timeout`` seconds, after which its whole process
+    group is terminated (then killed). ``cpu_seconds`` and
+    ``memory_bytes`` become RLIMIT_CPU / RLIMIT_AS for the child on POSIX.
+    Commands without shell syntax are exec'd directly unless ``direct`` is
+    False (see ``OS.direct_args``).
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        cpu_seconds: Optional[int] = None,
+        memory_bytes: Optional[int] = None,
+        metrics: Optional[Metrics] = None,
+        direct: bool = True,
+    ) -> None:
+        self._timeout = timeout
+        self._direct = direct
+        self._cpu_seconds = cpu_seconds
+        self._memory_bytes = memory_bytes
+        self._metrics = metrics or default_metrics
+
+    @classmethod
+    def from_env(cls) -> "SubprocessRunner":
+        """Build with the limits from ``limits_from_env()``."""
+        return cls(**limits_from_env())
+
     async def run(self, command: str) -> Tuple[int, str, str]:
+        proc = await self._spawn(command)
+
+        async def communicate() -> Tuple[str, str]:
+            stdout, stderr = await proc.communicate()
+            return (stdout or b"").decode(), (stderr or b"").decode()
+
+        return await self._supervise(proc, communicate())
+
+    async def run_streaming(
+        self,
+        command: str,
+        on_line: LineCallback,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        max_line_bytes: int = _READ_SIZE,
+    ) -> Tuple[int, str, str]:
+        """Run ``command``, passing each output line to ``on_line`` as it arrives.
+
+        stdout and stderr are read concurrently. Only the last ``tail_lines``
+        lines of each are kept and returned, and a line longer than
+        ``max_line_bytes`` is split, so memory stays bounded however much
+        the command prints.
+        """
+        proc = await self._spawn(command)
+        stdout: Deque[str] = deque(maxlen=tail_lines)
+        stderr: Deque[str] = deque(maxlen=tail_lines)
+
+        async def pump() -> Tuple[str, str]:
+            await asyncio.gather(
+                _pump(proc.stdout, "stdout", stdout, on_line, max_line_bytes),
+                _pump(proc.stderr, "stderr", stderr, on_line, max_line_bytes),
+            )
+            await proc.wait()
+            return "\n".join(stdout), "\n".join(stderr)
+
+        result = await self._supervise(proc, pump())
+        if result.stats and result.stats.timed_out:
+            # Keep what was printed before the deadline
+            return CommandResult(result[0], "\n".join(stdout), "\n".join([*stderr, result[2]]), result.stats)
+        return result
+
+    async def _supervise(self, proc: Any, work: Awaitable[Tuple[str, str]]) -> CommandResult:
+        """Wait for ``work`` within the deadline, killing the process group on timeout or cancel."""
+        before = _children_usage()
+        start = time.monotonic()
+        timed_out = False
+        try:
+            stdout, stderr = await asyncio.wait_for(work, self._timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            await self._kill(proc)
+            stdout, stderr = "", f"Command timed out after {self._timeout:g}s and was killed"
+        except BaseException:  # cancelled or Ctrl-C: do not leave the command running
+            await self._kill(proc)
+            raise
+        stats = _stats(before, _children_usage(), time.monotonic() - start, timed_out)
+        code = proc.returncode if proc.returncode is not None else -1
+        self._record(stats)
+        return CommandResult(code, stdout, stderr, stats)
+
+    async def _kill(self, proc: Any) -> None:
+        if proc.returncode is not None:
+            return
+        for sig in (signal.SIGTERM, getattr(signal, "SIGKILL", signal.SIGTERM)):
+            try:
+                if OS.is_windows():
+                    proc.kill()
+                else:
+                    os.killpg(proc.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                pass
+            try:
+                await asyncio.wait_for(proc.wait(), _KILL_GRACE)
+                return
+            except asyncio.TimeoutError:
+                continue
+
+    def _record(self, stats: CommandStats) -> None:
+        self._metrics.incr("commands.run")
+        self._metrics.observe("commands.wall_seconds", stats.wall_time)
+        if stats.timed_out:
+            self._metrics.incr("commands.timed_out")
+        if stats.cpu_time is not None:
+            self._metrics.observe("commands.cpu_seconds", stats.cpu_time)
+        if stats.max_rss_kb is not None:
+            self._metrics.observe("commands.max_rss_kb", stats.max_rss_kb)
+
+    def _spawn_options(self) -> Dict[str, Any]:
+        if OS.is_windows():
+            return {}
+        options: Dict[str, Any] = {"start_new_session": True}  # own process group, killed as a whole
+        limits = []
+        if resource is not None and self._cpu_seconds:
+            limits.append((resource.RLIMIT_CPU, self._cpu_seconds))
+        if resource is not None and self._memory_bytes:
+            limits.append((resource.RLIMIT_AS, self._memory_bytes))
+        if limits:
+            def _apply_limits() -> None:
+                for limit, value in limits:
+                    resource.setrlimit(limit, (value, value))
+            options["preexec_fn"] = _apply_limits
+        return options
+
+    async def _spawn(self, command: str) -> asyncio.subprocess.Process:
         # For PowerShell commands, run them directly
         if command.startswith("powershell -Command"):
             # Extract the actual PowerShell command
             ps_command = command[20:].strip('"')  # Remove "powershell -Command " prefix and quotes
-            proc = await asyncio.create_subprocess_exec(
+            return await asyncio.create_subprocess_exec(
                 "powershell", "-Command", ps_command,
                 stdout=asyncio.subprocess.PIPE, 
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                **self._spawn_options(),
             )
-        else:
-            args = OS.shell_and_args(command)
-            proc = await asyncio.create_subprocess_exec(
-                *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-        stdout, stderr = await proc.communicate()
-        return proc.returncode, (stdout or b"").decode(), (stderr or b"").decode()
+        argv = OS.direct_args(command) if self._direct else None
+        if argv is not None:
+            # Plain command: exec it directly and save starting a shell
+            try:
+                return await asyncio.create_subprocess_exec(
+                    *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, **self._spawn_options()
+                )
+            except (FileNotFoundError, PermissionError):
+                pass  # let the shell report it the usual way
+        args = OS.shell_and_args(command)
+        return await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, **self._spawn_options()
+        )
+
+
+def _children_usage() -> Optional[Tuple[float, int]]:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss
+
+
+def _stats(before: Optional[Tuple[float, int]], after: Optional[Tuple[float, int]], wall: float, timed_out: bool) -> CommandStats:
+    if before is None or after is None:
+        return CommandStats(wall, timed_out=timed_out)
+    max_rss = after[1] if after[1] > before[1] else None
+    if max_rss is not None and OS.is_macos():
+        max_rss //= 1024  # bytes on macOS, KiB elsewhere
+    return CommandStats(wall, max(0.0, after[0] - before[0]), max_rss, timed_out)
+
+
+async def _pump(
+    reader: asyncio.StreamReader, name: str, tail: Deque[str], on_line: LineCallback, max_line_bytes: int
+) -> None:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = bytearray()
+
+    def emit(raw: bytes) -> None:
+        for i in range(0, max(len(raw), 1), max_line_bytes):
+            line = decoder.decode(raw[i:i + max_line_bytes]).rstrip("\r")
+            tail.append(line)
+            on_line(name, line)
+
+    while chunk := await reader.read(_READ_SIZE):
+        pending += chunk
+        start = 0
+        while (end := pending.find(b"\n", start)) != -1:
+            emit(bytes(pending[start:end]))
+            start = end + 1
+        del pending[:start]
+        while len(pending) > max_line_bytes:
+            emit(bytes(pending[:max_line_bytes]))
+            del pending[:max_line_bytes]
+    if pending:
+        emit(bytes(pending))
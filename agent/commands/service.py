@@ -1,25 +1,267 @@
 """Command service for high-level command execution."""
 
-from .runner import CommandRunner
+import asyncio
+import inspect
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Awaitable, Callable, Deque, Iterable, Iterator, List, Optional, Tuple, Union
+from ..core.metrics import Metrics, metrics as default_metrics
+from .runner import DEFAULT_TAIL_LINES, CommandRunner, CommandStats
 from .confirm import UserConfirmation
+from .policy import CommandPolicy
+
+# Streamed lines are produced in a worker thread this many at a time, so a
+# slow producer (scanning a huge directory) never blocks the event loop.
+_NATIVE_BATCH = 256
 
 
 class CommandService:
-    """High-level API for confirming and running commands."""
+    """High-level API for confirming and running commands.
+
+    With ``stream`` set, and a runner that supports ``run_streaming``,
+    ``maybe_run`` prints output lines as the command produces them and only
+    the last ``tail_lines`` of each stream are kept for the return value.
+
+    Commands (and native action descriptions) matching the ``speculate``
+    policy are started while the confirmation is still pending; their
+    output is held back and shown at once if approved, or discarded and
+    the command cancelled if not.
+    """
 
-    def __init__(self, runner: CommandRunner, confirmation: UserConfirmation) -> None:
+    def __init__(
+        self,
+        runner: CommandRunner,
+        confirmation: UserConfirmation,
+        output: Optional[Callable[[str], None]] = None,
+        stream: bool = False,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        speculate: Optional[CommandPolicy] = None,
+        metrics: Optional[Metrics] = None,
+        framed: bool = True,
+    ) -> None:
         self._runner = runner
         self._confirmation = confirmation
+        self._output = output
+        self._stream = stream
+        self._tail_lines = tail_lines
+        self._speculate = speculate
+        self._metrics = metrics or default_metrics
+        self._framed = framed
 
-    async def maybe_run(self, command: str) -> None:
-        if not await self._confirmation.confirm(command):
-            print("Skipping execution.")
-            return
-        print("\n> Running the command...")
-        code, stdout, stderr = await self._runner.run(command)
-        print("\n---------------- Command output ----------------")
+    @property
+    def confirmation(self) -> UserConfirmation:
+        return self._confirmation
+
+    def fork(
+        self, confirmation: UserConfirmation, output: Callable[[str], None], framed: bool = True
+    ) -> "CommandService":
+        """Return a service that shares this runner but confirms and prints elsewhere.
+
+        With ``framed`` unset the fork prints only what commands produce (and
+        a failing exit status), without the console's headers and banners.
+        """
+        return CommandService(
+            self._runner, confirmation, output, self._stream, self._tail_lines, self._speculate, self._metrics, framed
+        )
+
+    def write(self, text: str) -> None:
+        """Print ``text`` to this service's output (stdout by default)."""
+        self._emit(text)
+
+    def _emit(self, text: str) -> None:
+        (self._output or print)(text)
+
+    def _frame(self, text: str) -> None:
+        if self._framed:
+            self._emit(text)
+
+    def _exit(self, code: int, stats: Optional[CommandStats]) -> None:
+        if self._framed or code != 0:
+            self._emit(_describe_exit(code, stats))
+
+    async def close(self) -> None:
+        """Stop the runner's long-lived processes, if it keeps any (shared with forks)."""
+        close = getattr(self._runner, "close", None)
+        if close is not None:
+            await close()
+
+    async def maybe_run(self, command: str) -> Optional[Tuple[int, str, str]]:
+        """Confirm, run and print ``command``; return its result, or None if skipped."""
+        run_streaming = getattr(self._runner, "run_streaming", None) if self._stream else None
+        held = _HeldLines(self._emit_line, self._tail_lines)
+        if run_streaming is None:
+            speculative = self._speculate_on(command, lambda: self._runner.run(command))
+        else:
+            speculative = self._speculate_on(command, lambda: run_streaming(command, held.line, self._tail_lines))
+        if not await self._confirm(command, speculative):
+            return None
+        self._frame("\n> Running the command...")
+        if run_streaming is None:
+            result = await (speculative or self._runner.run(command))
+            code, stdout, stderr = result
+            self._print_result(code, stdout, stderr, stats=getattr(result, "stats", None))
+            return result
+
+        self._frame("\n---------------- Command output ----------------")
+        if speculative is not None:
+            held.release()  # what it printed so far, then live lines
+            result = await speculative
+        else:
+            result = await run_streaming(command, self._emit_line, self._tail_lines)
+        self._exit(result[0], getattr(result, "stats", None))
+        return result
+
+    async def run_quiet(self, command: str) -> Tuple[int, str, str]:
+        """Run a previously approved command without prompting or printing."""
+        return await self._runner.run(command)
+
+    def show_cached(self, output: str, age: float) -> None:
+        """Print a result served from the cache instead of running anything."""
+        self._frame(f"\n> Using a cached result from {_describe_age(age)} ago")
+        self._print_result(None, output, "")
+
+    async def run_native(
+        self,
+        description: str,
+        action: Callable[[], Union[str, Iterable[str], Awaitable[str]]],
+        confirm: bool = False,
+    ) -> Optional[str]:
+        """Run an in-process action and print its output like a command's.
+
+        ``description`` is what the user is asked to approve when ``confirm``
+        is set; read-only actions such as reading the clock skip the prompt.
+        An action may return (or await to) its whole output, which is also
+        returned, or an iterable of lines that are printed as they are
+        produced; those are pulled in batches on a worker thread. Returns
+        None if skipped, streamed or failed.
+        """
+        speculative = self._speculate_on(description, lambda: _resolve(action)) if confirm else None
+        if confirm and not await self._confirm(description, speculative):
+            return None
+        streaming = False
+        try:
+            result = await (speculative or _resolve(action))
+            if isinstance(result, str):
+                self._print_result(None, result, "")
+                return result
+            self._frame("\n---------------- Command output ----------------")
+            streaming = True
+            lines = iter(result)
+            while True:
+                batch, error = await asyncio.to_thread(_take, lines, _NATIVE_BATCH)
+                for line in batch:
+                    self._emit(line)
+                if error is not None:
+                    raise error
+                if len(batch) < _NATIVE_BATCH:
+                    break
+        except Exception as ex:  # noqa: BLE001
+            self._print_result(1, "", str(ex), header=not streaming)
+        return None
+
+    def _speculate_on(self, command: str, start: Callable[[], Awaitable[Any]]) -> Optional["asyncio.Future[Any]"]:
+        """Start a read-only ``command`` before it is approved; None if it must wait."""
+        if self._speculate is None or self._speculate.match(command) is None:
+            return None
+        self._metrics.incr("commands.speculative.started")
+        return asyncio.ensure_future(start())
+
+    async def _confirm(self, command: str, speculative: Optional["asyncio.Future[Any]"]) -> bool:
+        asked = time.monotonic()
+        try:
+            approved = await self._confirmation.confirm(command)
+        except BaseException:
+            await self._discard(speculative)
+            raise
+        if not approved:
+            await self._discard(speculative)
+            self._emit("Skipping execution.")
+            return False
+        if speculative is not None:
+            self._metrics.incr("commands.speculative.used")
+            self._metrics.observe("commands.speculative.head_start_seconds", time.monotonic() - asked)
+        return True
+
+    async def _discard(self, speculative: Optional["asyncio.Future[Any]"]) -> None:
+        if speculative is not None:
+            speculative.cancel()  # the runner kills the command's process group
+            await asyncio.gather(speculative, return_exceptions=True)
+            self._metrics.incr("commands.speculative.discarded")
+
+    def _emit_line(self, stream: str, line: str) -> None:
+        self._emit(line if stream == "stdout" else f"[stderr] {line}")
+
+    def _print_result(
+        self, code: Optional[int], stdout: str, stderr: str, header: bool = True, stats: Optional[CommandStats] = None
+    ) -> None:
+        if header:
+            self._frame("\n---------------- Command output ----------------")
         if stdout.strip():
-            print(stdout.rstrip())
+            self._emit(stdout.rstrip())
         if stderr.strip():
-            print(f"\n[stderr]\n{stderr.rstrip()}")
-        print(f"(exit {code})")
+            self._emit(f"\n[stderr]\n{stderr.rstrip()}")
+        if code is not None:
+            self._exit(code, stats)
+
+
+def _take(lines: Iterator[str], count: int) -> Tuple[List[str], Optional[Exception]]:
+    """Up to ``count`` lines, and the error that cut them short, if any."""
+    batch: List[str] = []
+    try:
+        batch.extend(islice(lines, count))
+    except Exception as ex:  # noqa: BLE001 - raised by the caller after the lines are printed
+        return batch, ex
+    return batch, None
+
+
+async def _resolve(action: Callable[[], Union[str, Iterable[str], Awaitable[str]]]) -> Union[str, Iterable[str]]:
+    result = action()
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class _HeldLines:
+    """Holds streamed lines (the last ``limit``) until ``release``, then passes them straight on."""
+
+    def __init__(self, emit: Callable[[str, str], None], limit: int) -> None:
+        self._emit = emit
+        self._held: Optional[Deque[Tuple[str, str]]] = deque(maxlen=limit)
+        self._dropped = 0
+
+    def line(self, stream: str, line: str) -> None:
+        if self._held is None:
+            self._emit(stream, line)
+            return
+        if len(self._held) == self._held.maxlen:
+            self._dropped += 1
+        self._held.append((stream, line))
+
+    def release(self) -> None:
+        held, self._held = self._held or deque(), None
+        if self._dropped:
+            self._emit("stdout", f"[{self._dropped} earlier lines not shown]")
+        for stream, line in held:
+            self._emit(stream, line)
+
+
+def _describe_exit(code: int, stats: Optional[CommandStats]) -> str:
+    """``(exit 0)``, plus the resource use when the runner measured it."""
+    if stats is None:
+        return f"(exit {code})"
+    parts = [f"{stats.wall_time:.2f}s wall"]
+    if stats.cpu_time is not None:
+        parts.append(f"{stats.cpu_time:.2f}s CPU")
+    if stats.max_rss_kb is not None:
+        parts.append(f"{stats.max_rss_kb / 1024:.1f} MB max RSS")
+    prefix = "timed out, killed" if stats.timed_out else f"exit {code}"
+    return f"({prefix}; {', '.join(parts)})"
+
+
+def _describe_age(seconds: float) -> str:
+    if seconds < 90:
+        return f"{int(seconds)}s"
+    if seconds < 90 * 60:
+        return f"{int(seconds // 60)} min"
+    return f"{seconds / 3600:.1f} h"
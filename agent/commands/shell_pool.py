@@ -0,0 +1,324 @@
+"""Command runner backed by a pool of long-lived shell coprocesses."""
+
+import asyncio
+import codecs
+import os
+import secrets
+import shlex
+import signal
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional, Tuple
+from ..core.metrics import Metrics, metrics as default_metrics
+from .runner import DEFAULT_TAIL_LINES, CommandResult, CommandStats, LineCallback, limits_from_env
+
+DEFAULT_POOL_SIZE = 2
+_READ_SIZE = 64 * 1024
+_KILL_GRACE = 2.0
+_PING_TIMEOUT = 2.0
+DEFAULT_CHECK_AFTER = 30.0
+
+
+class ShellDiedError(Exception):
+    """The shell exited before finishing the command's framing."""
+
+
+class _NotSentError(ShellDiedError):
+    """The shell died before the command was written, so it is safe to retry."""
+
+
+class _Shell:
+    """One ``sh`` driven over pipes; commands are framed by a random sentinel."""
+
+    def __init__(self, proc: Any) -> None:
+        self.proc = proc
+        self.commands = 0
+        self.idle_since = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def execute(
+        self,
+        script: str,
+        on_stdout: Callable[[str], None],
+        on_stderr: Callable[[str], None],
+    ) -> int:
+        """Send ``script`` and stream its output until the sentinels; return its exit code."""
+        token = secrets.token_hex(8)
+        # The leading "\n" ends any unterminated last line; the reader drops it again.
+        framed = (
+            f"{script}\n"
+            f"__rc=$?; printf '\\n{token} %d\\n' \"$__rc\"; printf '\\n{token}\\n' >&2\n"
+        )
+        try:
+            self.proc.stdin.write(framed.encode())
+            await self.proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise _NotSentError("shell is not accepting input") from exc
+        self.commands += 1
+        out_marker = f"\n{token} ".encode()
+        err_marker = f"\n{token}\n".encode()
+        rest, _ = await asyncio.gather(
+            _read_framed(self.proc.stdout, out_marker, on_stdout),
+            _read_framed(self.proc.stderr, err_marker, on_stderr),
+        )
+        while b"\n" not in rest:
+            chunk = await self.proc.stdout.read(_READ_SIZE)
+            if not chunk:
+                raise ShellDiedError("shell exited while reporting the exit code")
+            rest += chunk
+        status, _, extra = rest.partition(b"\n")
+        if extra:
+            raise ShellDiedError("unexpected output after the exit code")
+        return int(status)
+
+    async def kill(self) -> None:
+        if self.proc.returncode is not None:
+            return
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(self.proc.pid, sig)  # the shell and whatever it is running
+            except (ProcessLookupError, PermissionError):
+                pass
+            try:
+                await asyncio.wait_for(self.proc.wait(), _KILL_GRACE)
+                return
+            except asyncio.TimeoutError:
+                continue
+
+
+class ShellPoolRunner:
+    """Runs commands in up to ``size`` persistent ``sh`` processes (POSIX only).
+
+    Each command runs in a subshell that first changes to ``cwd`` (the
+    current directory at run time by default), so ``cd``, ``export`` and
+    variable assignments never leak into the next command. A shell that
+    dies is replaced on next use, one that times out is killed with its
+    process group, and one idle for ``check_after`` seconds or more is
+    pinged before it is reused (``check()`` pings all idle shells at once).
+    ``close()`` stops the pool.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        timeout: Optional[float] = None,
+        cpu_seconds: Optional[int] = None,
+        memory_bytes: Optional[int] = None,
+        cwd: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+        shell: str = "sh",
+        check_after: Optional[float] = DEFAULT_CHECK_AFTER,
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._size = size
+        self._timeout = timeout
+        self._cpu_seconds = cpu_seconds
+        self._memory_bytes = memory_bytes
+        self._cwd = cwd
+        self._metrics = metrics or default_metrics
+        self._shell = shell
+        self._check_after = check_after
+        self._idle: List[_Shell] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_env(cls) -> "ShellPoolRunner":
+        """Build from ``COMMAND_SHELL_POOL_SIZE`` and ``COMMAND_SHELL_CHECK_AFTER`` plus ``limits_from_env()``."""
+        check_after = os.getenv("COMMAND_SHELL_CHECK_AFTER")
+        return cls(
+            size=int(os.getenv("COMMAND_SHELL_POOL_SIZE", DEFAULT_POOL_SIZE)),
+            check_after=float(check_after) if check_after else DEFAULT_CHECK_AFTER,
+            **limits_from_env(),
+        )
+
+    async def run(self, command: str) -> Tuple[int, str, str]:
+        stdout: List[str] = []
+        stderr: List[str] = []
+        return await self._run(command, stdout.append, stderr.append, lambda: ("".join(stdout), "".join(stderr)))
+
+    async def run_streaming(
+        self,
+        command: str,
+        on_line: LineCallback,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        max_line_bytes: int = _READ_SIZE,
+    ) -> Tuple[int, str, str]:
+        """Like ``SubprocessRunner.run_streaming``: lines go to ``on_line``, only the tails are kept."""
+        out = _LineSplitter("stdout", on_line, tail_lines, max_line_bytes)
+        err = _LineSplitter("stderr", on_line, tail_lines, max_line_bytes)
+
+        def collect() -> Tuple[str, str]:
+            return out.finish(), err.finish()
+
+        return await self._run(command, out.feed, err.feed, collect)
+
+    async def check(self) -> int:
+        """Ping every idle shell, replacing any that do not answer; return how many are healthy."""
+        idle, self._idle = self._idle, []
+        healthy = 0
+        for shell in idle:
+            if await self._healthy(shell):
+                healthy += 1
+                shell.idle_since = time.monotonic()
+                self._idle.append(shell)
+        return healthy
+
+    async def close(self) -> None:
+        """Stop all idle shells; busy ones exit when their pipes close."""
+        idle, self._idle = self._idle, []
+        for shell in idle:
+            await shell.kill()
+
+    async def _run(
+        self,
+        command: str,
+        on_stdout: Callable[[str], None],
+        on_stderr: Callable[[str], None],
+        collect: Callable[[], Tuple[str, str]],
+    ) -> CommandResult:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._size)
+        async with self._slots:
+            shell = await self._acquire()
+            script = self._script(command)
+            start = time.monotonic()
+            died = timed_out = False
+            try:
+                try:
+                    code = await asyncio.wait_for(shell.execute(script, on_stdout, on_stderr), self._timeout)
+                except _NotSentError:
+                    # The command never reached the shell, so run it on a fresh one
+                    await shell.kill()
+                    shell = await self._acquire()
+                    code = await asyncio.wait_for(shell.execute(script, on_stdout, on_stderr), self._timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                code = -int(signal.SIGTERM)
+            except ShellDiedError:
+                died = True
+                code = -1
+            except BaseException:  # cancelled or Ctrl-C: the shell is mid-command, discard it
+                await shell.kill()
+                raise
+            stats = CommandStats(time.monotonic() - start, timed_out=timed_out)
+            self._record(stats)
+            stdout, stderr = collect()
+            if timed_out:
+                stderr = _append(stderr, f"Command timed out after {self._timeout:g}s and was killed")
+            elif died:
+                self._metrics.incr("shell_pool.died")
+                stderr = _append(stderr, "Shell exited unexpectedly")
+            if timed_out or died:
+                await shell.kill()
+            else:
+                shell.idle_since = time.monotonic()
+                self._idle.append(shell)
+            return CommandResult(code, stdout, stderr, stats)
+
+    async def _healthy(self, shell: _Shell) -> bool:
+        """Ping ``shell``; kill it and count it as unhealthy if it does not answer."""
+        try:
+            ok = shell.alive and await asyncio.wait_for(
+                shell.execute(":", lambda _: None, lambda _: None), _PING_TIMEOUT
+            ) == 0
+        except (ShellDiedError, ValueError, asyncio.TimeoutError):
+            ok = False
+        if not ok:
+            await shell.kill()
+            self._metrics.incr("shell_pool.unhealthy")
+        return ok
+
+    async def _acquire(self) -> _Shell:
+        while self._idle:
+            shell = self._idle.pop()
+            if not shell.alive:
+                self._metrics.incr("shell_pool.died")
+                continue
+            idle_for = time.monotonic() - shell.idle_since
+            if self._check_after is not None and idle_for >= self._check_after and not await self._healthy(shell):
+                continue
+            return shell
+        proc = await asyncio.create_subprocess_exec(
+            self._shell,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,  # own process group, killed as a whole
+        )
+        self._metrics.incr("shell_pool.spawned")
+        return _Shell(proc)
+
+    def _script(self, command: str) -> str:
+        """Wrap ``command`` in a subshell with its own cwd, limits and no stdin."""
+        setup = [f"cd -- {shlex.quote(self._cwd or os.getcwd())}"]
+        if self._cpu_seconds:
+            setup.append(f"ulimit -t {int(self._cpu_seconds)}")
+        if self._memory_bytes:
+            setup.append(f"ulimit -v {int(self._memory_bytes) // 1024}")
+        return f"( {' && '.join(setup)} && eval {shlex.quote(command)} ) </dev/null"
+
+    def _record(self, stats: CommandStats) -> None:
+        self._metrics.incr("commands.run")
+        self._metrics.observe("commands.wall_seconds", stats.wall_time)
+        if stats.timed_out:
+            self._metrics.incr("commands.timed_out")
+
+
+def _append(text: str, message: str) -> str:
+    return f"{text}\n{message}" if text and not text.endswith("\n") else text + message
+
+
+async def _read_framed(reader: asyncio.StreamReader, marker: bytes, on_text: Callable[[str], None]) -> bytes:
+    """Pass decoded output to ``on_text`` up to ``marker``; return the bytes after it."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = bytearray()
+    while True:
+        end = pending.find(marker)
+        if end != -1:
+            on_text(decoder.decode(bytes(pending[:end]), final=True))
+            return bytes(pending[end + len(marker):])
+        # Everything except a possible partial marker at the end is output
+        safe = len(pending) - len(marker) + 1
+        if safe > 0:
+            on_text(decoder.decode(bytes(pending[:safe])))
+            del pending[:safe]
+        chunk = await reader.read(_READ_SIZE)
+        if not chunk:
+            raise ShellDiedError("shell exited before the command finished")
+        pending += chunk
+
+
+class _LineSplitter:
+    """Turns decoded output chunks into ``on_line`` calls and keeps the last lines."""
+
+    def __init__(self, name: str, on_line: LineCallback, tail_lines: int, max_line_bytes: int) -> None:
+        self._name = name
+        self._on_line = on_line
+        self._max = max_line_bytes
+        self._partial = ""
+        self.tail: Deque[str] = deque(maxlen=tail_lines)
+
+    def feed(self, text: str) -> None:
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._emit(line)
+        while len(self._partial) > self._max:
+            self._emit(self._partial[:self._max])
+            self._partial = self._partial[self._max:]
+
+    def finish(self) -> str:
+        if self._partial:
+            self._emit(self._partial)
+            self._partial = ""
+        return "\n".join(self.tail)
+
+    def _emit(self, line: str) -> None:
+        for i in range(0, max(len(line), 1), self._max):
+            part = line[i:i + self._max].rstrip("\r")
+            self.tail.append(part)
+            self._on_line(self._name, part)
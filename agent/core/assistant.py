@@ -1,25 +1,69 @@
 """Assistant service for handling user interactions."""
 
-from typing import List, Dict, Any, Optional
+import os
+import time
+import uuid
+from typing import Callable, List, Dict, Any, Optional
 from ..config.params import AiParameters
 from ..llm.interfaces import LLMClient
 from .history import HistoryManager
+from .metrics import Metrics
+from .stats import record_turn
+from .turn import TurnInfo
+from ..llm.cassette import conversation
+from ..llm.pricing import cost
+from ..llm.usage import track_usage
 from ..intents.chain import IntentChain
+from ..intents.registry import default_registry
+from ..intents.tools import IntentToolbox
 from ..intents.base import IntentContext
+from ..intents.cache import ResultCache
 from ..commands.service import CommandService
-from ..commands.runner import SubprocessRunner
+from ..commands.runner import CommandRunner, SubprocessRunner
+from ..commands.shell_pool import ShellPoolRunner
 from ..commands.confirm import StdInConfirmation
+from ..commands.policy import READ_ONLY, CommandPolicy, PolicyConfirmation
+from ..utils.os_utils import OS
 
 
 class AssistantService:
-    def __init__(self, params: AiParameters, client: LLMClient, history_manager: Optional[HistoryManager] = None) -> None:
+    def __init__(
+        self,
+        params: AiParameters,
+        client: LLMClient,
+        history_manager: Optional[HistoryManager] = None,
+        use_tools: bool = False,
+        command_service: Optional[CommandService] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
         self._p = params
+        self._metrics = metrics
         self._client = client
         self._history_manager = history_manager or HistoryManager()
-        self._command_service = CommandService(SubprocessRunner(), StdInConfirmation())
+        self._command_service = command_service or self.create_command_service()
+        self._result_cache = ResultCache.from_env()
         self._intent_chain = self._create_intent_chain()
+        # Intents the model can call when no pattern matched the prompt itself
+        self._toolbox = IntentToolbox(default_registry()) if use_tools else None
+        self.last_turn: Optional[TurnInfo] = None
+        # Names this conversation in recorded cassettes
+        self.session = uuid.uuid4().hex[:12]
 
     async def answer(self, user_prompt: str, use_history: bool = True) -> str:
+        turn = self.last_turn = TurnInfo(user_prompt, self._p.provider, self._p.model)
+        start = time.perf_counter()
+        try:
+            with conversation(self.session):
+                turn.answer = await self._answer(user_prompt, use_history, turn)
+        except Exception as ex:
+            turn.error = str(ex)
+            raise
+        finally:
+            turn.timings["total"] = time.perf_counter() - start
+            record_turn(turn, self._metrics)
+        return turn.answer
+
+    async def _answer(self, user_prompt: str, use_history: bool, turn: TurnInfo) -> str:
         if not user_prompt.strip():
             return "Please enter a non-empty request."
         
@@ -27,27 +71,48 @@ class AssistantService:
         self._history_manager.add_message("user", user_prompt)
         
         # Check for intents first
-        intent_context = IntentContext(self._command_service)
+        intent_context = IntentContext(self._command_service, self._result_cache, turn)
+        started = time.perf_counter()
         intent_handled = await self._intent_chain.try_handle(user_prompt, intent_context)
+        turn.timings["intent"] = time.perf_counter() - started
         
         if intent_handled:
             # Intent was handled, add a generic response to history
             reply = "Intent handled successfully."
             self._history_manager.add_message("assistant", reply)
             return reply
+        turn.intents.clear()  # matched, but the handler declined
         
         # No intent matched, proceed with LLM
         # Build enhanced system prompt
+        started = time.perf_counter()
         system = self._build_enhanced_system_prompt()
         
         # Get conversation history
         history = self._history_manager.get_conversation_history()[:-1] if use_history else []  # Exclude current user message
+        turn.timings["prompt_build"] = time.perf_counter() - started
         
         # Get response from LLM
-        if use_history and history:
-            reply = await self._client.complete_with_history(user_prompt, system, history)
-        else:
-            reply = await self._client.complete(user_prompt, system)
+        started = time.perf_counter()
+        with track_usage() as usage:
+            complete_with_tools = getattr(self._client, "complete_with_tools", None)
+            if self._toolbox is not None and complete_with_tools is not None:
+                reply = await complete_with_tools(
+                    user_prompt,
+                    system,
+                    history,
+                    self._toolbox.definitions,
+                    lambda calls: self._toolbox.run(calls, intent_context),
+                )
+            elif use_history and history:
+                reply = await self._client.complete_with_history(user_prompt, system, history)
+            else:
+                reply = await self._client.complete(user_prompt, system)
+        turn.timings["first_token"] = time.perf_counter() - started
+        turn.usage = usage.as_dict() if usage.requests else None
+        turn.model = usage.model or turn.model  # a routing client may have picked another model
+        turn.profile = usage.profile or None
+        turn.cost = cost(turn.model, turn.usage)
         
         # Add assistant response to history
         self._history_manager.add_message("assistant", reply)
@@ -92,24 +157,38 @@ class AssistantService:
     def clear_history(self) -> None:
         """Clear the current conversation history."""
         self._history_manager.clear_current_conversation()
+
+    async def close(self) -> None:
+        """Stop the command runner's pooled shells, if any."""
+        await self._command_service.close()
     
+    @classmethod
+    def create_command_service(
+        cls, interactive: bool = True, output: Optional[Callable[[str], None]] = None
+    ) -> CommandService:
+        """The command service sessions share; with ``interactive`` off nothing is ever prompted."""
+        return CommandService(
+            cls._create_runner(),
+            PolicyConfirmation.from_env(StdInConfirmation(), interactive=interactive),
+            output,
+            stream=True,
+            speculate=cls._speculation_policy(),
+        )
+
+    @staticmethod
+    def _create_runner() -> CommandRunner:
+        """Spawn a process per command, or reuse pooled shells with ``COMMAND_RUNNER=pool`` (POSIX)."""
+        if os.getenv("COMMAND_RUNNER", "").lower() == "pool" and not OS.is_windows():
+            return ShellPoolRunner.from_env()
+        return SubprocessRunner.from_env()
+
+    @staticmethod
+    def _speculation_policy() -> Optional[CommandPolicy]:
+        """Start read-only commands while the user decides, unless ``COMMAND_SPECULATE=0``."""
+        if os.getenv("COMMAND_SPECULATE", "1").strip().lower() in ("0", "false", "off", "no"):
+            return None
+        return CommandPolicy(READ_ONLY)
+
     def _create_intent_chain(self) -> IntentChain:
-        """Create and configure the intent chain with all available handlers."""
-        from ..intents.weather import WeatherHandler
-        from ..intents.public_ip import PublicIpHandler
-        from ..intents.date_time import DateTimeHandler
-        from ..intents.time_only import TimeHandler
-        from ..intents.date_only import DateHandler
-        from ..intents.list_files import ListFilesHandler
-        
-        handlers = [
-            WeatherHandler(),
-            PublicIpHandler(),
-            DateTimeHandler(),
-            TimeHandler(),
-            DateHandler(),
-            ListFilesHandler(),
-        ]
-        
-        return IntentChain(handlers)
-    
+        """Return the shared intent chain; handlers are imported on first match."""
+        return default_registry().chain()
@@ -0,0 +1,146 @@
+"""In-process counters, value summaries and latency histograms."""
+
+import json
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass
+class Summary:
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Histogram:
+    """Counts values in logarithmic buckets, HDR-style.
+
+    Each bucket is ``precision`` (relative) wider than the one below, so
+    percentiles are accurate to about that fraction at any magnitude while
+    memory grows only with the range of values seen, not their number.
+    Values of zero or less share one bucket.
+    """
+
+    def __init__(self, precision: float = 0.01) -> None:
+        self._growth = math.log1p(precision)
+        self._buckets: Dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float) -> None:
+        if value <= 0:
+            self._zero += 1
+        else:
+            index = math.floor(math.log(value) / self._growth)
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction: float) -> float:
+        """The value below which ``fraction`` (0..1) of the values fall; 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = self._zero
+        if seen >= rank:
+            return min(0.0, self.max)
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                middle = math.exp((index + 0.5) * self._growth)
+                return min(max(middle, self.min), self.max)
+        return self.max
+
+    def copy(self) -> "Histogram":
+        other = Histogram.__new__(Histogram)
+        other.__dict__.update(self.__dict__, _buckets=dict(self._buckets))
+        return other
+
+
+def labeled(name: str, **labels: Any) -> str:
+    """``name{key=value,...}``, leaving out labels that are None or empty."""
+    parts = [f"{key}={value}" for key, value in labels.items() if value not in (None, "")]
+    return f"{name}{{{','.join(parts)}}}" if parts else name
+
+
+class Metrics:
+    """Thread-safe named counters and observed values (summary and histogram)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._summaries: Dict[str, Summary] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self._summaries.setdefault(name, Summary()).add(value)
+            self._histograms.setdefault(name, Histogram()).add(value)
+
+    def counter(self, name: str) -> float:
+        return self._counters.get(name, 0)
+
+    def summary(self, name: str) -> Summary:
+        with self._lock:
+            s = self._summaries.get(name, Summary())
+            return Summary(s.count, s.total, s.min, s.max)
+
+    def histogram(self, name: str) -> Histogram:
+        with self._lock:
+            h = self._histograms.get(name)
+            return h.copy() if h is not None else Histogram()
+
+    def counters(self, prefix: str = "") -> Dict[str, float]:
+        with self._lock:
+            return {k: v for k, v in sorted(self._counters.items()) if k.startswith(prefix)}
+
+    def series(self, prefix: str = "") -> List[str]:
+        """Names of the observed values starting with ``prefix``."""
+        with self._lock:
+            return sorted(k for k in self._summaries if k.startswith(prefix))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters, and per observed value its count, mean, min, max and p50/p90/p99."""
+        observed = {}
+        for name in self.series():
+            s, h = self.summary(name), self.histogram(name)
+            observed[name] = {"count": s.count, "mean": s.mean, "min": s.min, "max": s.max}
+            observed[name].update({f"p{round(q * 100)}": h.percentile(q) for q in PERCENTILES})
+        return {"counters": self.counters(), "observed": observed}
+
+    def dump(self, path: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Write ``snapshot()`` (plus ``extra``) to ``path`` as JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({**(extra or {}), **self.snapshot()}, f, indent=2)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+            self._histograms.clear()
+
+
+# Process-wide metrics; components record here unless given their own.
+metrics = Metrics()
@@ -0,0 +1,122 @@
+"""Per-turn CPU and memory profiles written to disk."""
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+DEFAULT_DIR = "profiles"
+DEFAULT_TOP = 25
+
+
+class TurnProfiler:
+    """Records each turn with cProfile and tracemalloc while enabled.
+
+    Every turn writes ``<start time>-turn-NNNN.pstats`` (load with
+    ``python -m pstats`` or snakeviz) and a ``.txt`` report next to it: the functions with the most
+    cumulative time, the lines holding the most memory and the lines whose
+    allocations grew most since the previous turn. tracemalloc slows
+    Python down noticeably, so it only runs while profiling is on.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR, top: int = DEFAULT_TOP) -> None:
+        self._directory = directory
+        self._top = top
+        self._turns = 0
+        self._session = time.strftime("%Y%m%d-%H%M%S")  # keeps one run's files from overwriting another's
+        self._enabled = False
+        self._started_tracing = False
+        self._previous: Optional[tracemalloc.Snapshot] = None
+
+    @classmethod
+    def from_env(cls) -> "TurnProfiler":
+        """``PROFILE_DIR`` (default ``./profiles``) and ``PROFILE_TOP`` (lines per section)."""
+        return cls(os.getenv("PROFILE_DIR") or DEFAULT_DIR, int(os.getenv("PROFILE_TOP") or DEFAULT_TOP))
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def start(self) -> None:
+        if self._enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._previous = _snapshot()  # growth of the first turn is measured from here
+        self._enabled = True
+
+    def stop(self) -> None:
+        if not self._enabled:
+            return
+        self._enabled = False
+        self._previous = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def turn(self, label: str) -> Iterator[List[str]]:
+        """Profile the block when enabled; the yielded list receives the report paths afterwards."""
+        paths: List[str] = []
+        if not self._enabled:
+            yield paths
+            return
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield paths
+        finally:
+            profile.disable()
+            paths.extend(self._write(label, profile, time.perf_counter() - started))
+
+    def _write(self, label: str, profile: cProfile.Profile, elapsed: float) -> List[str]:
+        self._turns += 1
+        os.makedirs(self._directory, exist_ok=True)
+        base = os.path.join(self._directory, f"{self._session}-turn-{self._turns:04d}")
+        profile.dump_stats(base + ".pstats")
+
+        snapshot = _snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        cpu = io.StringIO()
+        pstats.Stats(profile, stream=cpu).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self._top)
+
+        lines = [
+            f"Turn {self._turns}: {label}",
+            f"Wall time: {elapsed:.3f}s",
+            f"Traced memory: {current / 1024:.1f} KiB now, {peak / 1024:.1f} KiB peak",
+            "",
+            f"== CPU: top {self._top} by cumulative time ==",
+            cpu.getvalue().strip(),
+            "",
+            f"== Memory: top {self._top} allocators ==",
+        ]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[: self._top]]
+        lines += ["", f"== Memory: top {self._top} growth since the previous turn =="]
+        if self._previous is not None:
+            growth = [d for d in snapshot.compare_to(self._previous, "lineno") if d.size_diff > 0]
+            lines += [str(diff) for diff in growth[: self._top]]
+        self._previous = snapshot
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return [base + ".pstats", base + ".txt"]
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    """The current allocations, leaving out the profilers' own and the import system's."""
+    return tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, pstats.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+    )
@@ -0,0 +1,84 @@
+"""Per-turn latency, token and cost accounting on top of ``Metrics``."""
+
+from typing import Any, Dict, List, Optional
+from .metrics import PERCENTILES, Metrics, labeled, metrics as default_metrics
+from .turn import TurnInfo
+
+
+def record_turn(turn: TurnInfo, metrics: Optional[Metrics] = None) -> None:
+    """Add ``turn`` to the latency histograms and the token and cost counters.
+
+    Latencies are observed per provider/model (``turn.seconds``,
+    ``llm.seconds``) and per intent (``intent.seconds``); tokens are
+    counted per model as ``tokens.input``, ``tokens.output`` and
+    ``tokens.cached`` and the estimated spend as ``cost.usd``.
+    """
+    m = metrics or default_metrics
+    m.incr("turns")
+    if turn.error:
+        m.incr("turns.failed")
+    model = {"provider": turn.provider, "model": turn.model}
+    timings = turn.timings
+    if "first_token" in timings:
+        m.observe(labeled("llm.seconds", **model), timings["first_token"])
+    intents = ",".join(dict.fromkeys(turn.intents))
+    if intents and "intent" in timings:
+        m.observe(labeled("intent.seconds", intent=intents), timings["intent"])
+    if "total" in timings:
+        # A turn answered by intents alone never reached the model.
+        by = {"intent": intents} if intents and "first_token" not in timings else model
+        m.observe(labeled("turn.seconds", **by), timings["total"])
+    if turn.usage:
+        m.incr(labeled("llm.requests", **model), turn.usage.get("requests", 0))
+        m.incr(labeled("tokens.input", **model), turn.usage.get("prompt_tokens", 0))
+        m.incr(labeled("tokens.output", **model), turn.usage.get("completion_tokens", 0))
+        m.incr(labeled("tokens.cached", **model), turn.usage.get("cached_tokens", 0))
+    if turn.cost is not None:
+        m.incr(labeled("cost.usd", **model), turn.cost)
+
+
+def totals(metrics: Optional[Metrics] = None) -> Dict[str, Any]:
+    """Session totals: turns, tokens, estimated cost and the intent cache hit rate."""
+    m = metrics or default_metrics
+    hits = m.counter("intent_cache.hit") + m.counter("intent_cache.stale_hit")
+    lookups = hits + m.counter("intent_cache.miss")
+    return {
+        "turns": int(m.counter("turns")),
+        "failed_turns": int(m.counter("turns.failed")),
+        "input_tokens": int(sum(m.counters("tokens.input").values())),
+        "output_tokens": int(sum(m.counters("tokens.output").values())),
+        "cached_tokens": int(sum(m.counters("tokens.cached").values())),
+        "cost_usd": sum(m.counters("cost.usd").values()),
+        "intent_cache_lookups": int(lookups),
+        "intent_cache_hit_rate": hits / lookups if lookups else None,
+    }
+
+
+def report(metrics: Optional[Metrics] = None) -> List[str]:
+    """Totals, latency percentiles and the remaining counters, as lines for the terminal."""
+    m = metrics or default_metrics
+    t = totals(m)
+    lines = [
+        f"Turns: {t['turns']} ({t['failed_turns']} failed)",
+        f"Tokens: {t['input_tokens']} in ({t['cached_tokens']} cached), {t['output_tokens']} out",
+        f"Estimated cost: ${t['cost_usd']:.6f}",
+    ]
+    if t["intent_cache_hit_rate"] is not None:
+        lines.append(f"Intent cache: {t['intent_cache_hit_rate']:.0%} hit rate ({t['intent_cache_lookups']} lookups)")
+    names = m.series()
+    if names:
+        width = max(len(name) for name in names + ["observed (seconds in ms)"])
+        headers = "".join(f"{'p' + str(round(q * 100)):>9}" for q in PERCENTILES)
+        lines += ["", f"{'observed (seconds in ms)':<{width}} {'count':>7}{headers}{'max':>9}"]
+        for name in names:
+            h = m.histogram(name)
+            # Latencies are kept in seconds but read better in milliseconds.
+            scale = 1000 if name.split("{")[0].endswith("seconds") else 1
+            values = "".join(f"{h.percentile(q) * scale:>9.1f}" for q in PERCENTILES)
+            lines.append(f"{name:<{width}} {h.count:>7}{values}{h.max * scale:>9.1f}")
+    shown = ("turns", "tokens.", "cost.usd", "intent_cache.")
+    others = {k: v for k, v in m.counters().items() if not k.startswith(shown)}
+    if others:
+        lines += ["", "counters:"]
+        lines += [f"  {name} {value:g}" for name, value in others.items()]
+    return lines
@@ -0,0 +1,41 @@
+"""Structured record of one question and how it was answered."""
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class TurnInfo:
+    """What happened while answering ``prompt``.
+
+    ``timings`` holds seconds per stage: ``intent_match`` (routing),
+    ``intent`` (routing plus running the handler), ``prompt_build``,
+    ``queue`` (waiting for a pipe-mode slot), ``first_token`` (until the
+    model's reply arrived; replies are not streamed, so this is the whole
+    model call) and ``total``.
+    """
+    prompt: str
+    provider: str = ""
+    model: str = ""
+    answer: str = ""
+    intents: List[str] = field(default_factory=list)
+    cache_hit: bool = False
+    usage: Optional[Dict[str, int]] = None
+    cost: Optional[float] = None  # estimated USD, when the model has a known price
+    profile: Optional[str] = None  # generation profile the model was asked with
+    output: List[str] = field(default_factory=list)  # command output, when captured
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = asdict(self)
+        intents = record.pop("intents")
+        record = {**{k: record.pop(k) for k in ("prompt", "provider", "model", "answer")}, "intent": intents or None, **record}
+        record["timings"] = {k: round(v, 6) for k, v in self.timings.items()}
+        if self.cost is not None:
+            record["cost"] = round(self.cost, 8)
+        return record
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
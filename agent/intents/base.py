@@ -1,8 +1,13 @@
 """Intent handling base classes."""
 
-from typing import Protocol
+import os
+from typing import Optional, Protocol, TYPE_CHECKING
 from ..commands.service import CommandService
 
+if TYPE_CHECKING:
+    from .cache import ResultCache
+    from ..core.turn import TurnInfo
+
 
 class IntentHandler(Protocol):
     def matches(self, user_input: str) -> bool:
@@ -13,5 +18,26 @@ class IntentHandler(Protocol):
 
 
 class IntentContext:
-    def __init__(self, command_service: CommandService) -> None:
+    def __init__(
+        self,
+        command_service: CommandService,
+        cache: Optional["ResultCache"] = None,
+        turn: Optional["TurnInfo"] = None,
+    ) -> None:
         self.commands = command_service
+        self.cache = cache
+        self.turn = turn  # records which intents ran and whether the cache answered
+
+
+def intent_name(handler: object) -> str:
+    """The registry name of ``handler``, or its class name."""
+    spec = getattr(handler, "spec", None)
+    return getattr(spec, "name", None) or type(handler).__name__
+
+
+def use_shell_commands() -> bool:
+    """Whether intents should run shell commands instead of in-process executors.
+
+    Controlled by ``INTENT_EXEC=shell``; in-process execution is the default.
+    """
+    return os.getenv("INTENT_EXEC", "native").strip().lower() == "shell"
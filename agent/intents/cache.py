@@ -0,0 +1,240 @@
+"""TTL result cache for intents that fetch remote data."""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+from ..core.metrics import Metrics, metrics as default_metrics
+
+Loader = Callable[[], Awaitable[Optional[str]]]
+
+
+@dataclass
+class CacheEntry:
+    value: str
+    stored_at: float
+    ttl: float
+    stale_ttl: float
+    source: Optional[str] = None  # the approved command that produced ``value``
+
+    def age(self, now: float) -> float:
+        return max(0.0, now - self.stored_at)
+
+
+class ResultCache:
+    """Memory + disk cache with per-entry TTL and stale-while-revalidate.
+
+    Entries younger than ``ttl`` are served as-is. Entries younger than
+    ``stale_ttl`` are served immediately while a background task refreshes
+    them. Each namespace is persisted as one JSON file in ``directory`` so
+    that separate CLI invocations share results.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        self._dir = Path(directory) if directory else None
+        self._clock = clock
+        self._metrics = metrics or default_metrics
+        self._entries: Dict[str, Dict[str, CacheEntry]] = {}
+        self._refreshing: Set[Tuple[str, str]] = set()
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ResultCache"]:
+        """Build the cache from ``INTENT_CACHE``/``INTENT_CACHE_DIR``; None if disabled."""
+        if os.getenv("INTENT_CACHE", "1").strip().lower() in ("0", "false", "off", "no"):
+            return None
+        directory = os.getenv("INTENT_CACHE_DIR")
+        if not directory:
+            base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            directory = os.path.join(base, "ai-assistant")
+        return cls(directory)
+
+    def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        """Return the entry if it is still within its stale window."""
+        entry = self._namespace(namespace).get(key)
+        if entry is None or entry.age(self._clock()) >= entry.stale_ttl:
+            return None
+        return entry
+
+    def age_of(self, entry: CacheEntry) -> float:
+        return entry.age(self._clock())
+
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        value: str,
+        ttl: float,
+        stale_ttl: Optional[float] = None,
+        source: Optional[str] = None,
+    ) -> None:
+        entries = self._namespace(namespace)
+        entries[key] = CacheEntry(value, self._clock(), ttl, max(ttl, stale_ttl or ttl), source)
+        self._save(namespace, entries)
+
+    async def fetch(
+        self,
+        namespace: str,
+        key: str,
+        ttl: float,
+        load: Loader,
+        refresh: Optional[Loader] = None,
+        stale_ttl: Optional[float] = None,
+        source: Optional[str] = None,
+    ) -> Tuple[Optional[str], Optional[CacheEntry]]:
+        """Return ``(value, entry)``; ``entry`` is set when the value came from the cache.
+
+        ``load`` runs on a miss and its value is stored with ``source``.
+        ``refresh`` (default ``load``) runs in the background when a stale
+        entry is served; it must not need user input, and the refreshed
+        value keeps the entry's own ``source``. A loader returning None
+        leaves the cache untouched.
+        """
+        entry = self.get(namespace, key)
+        if entry is not None:
+            if entry.age(self._clock()) < entry.ttl:
+                self.hits += 1
+                self._metrics.incr("intent_cache.hit")
+            else:
+                self.stale_hits += 1
+                self._metrics.incr("intent_cache.stale_hit")
+                self._revalidate(namespace, key, ttl, stale_ttl, refresh or load, entry.source)
+            return entry.value, entry
+        self.misses += 1
+        self._metrics.incr("intent_cache.miss")
+        value = await load()
+        if value is not None:
+            self.put(namespace, key, value, ttl, stale_ttl, source)
+        return value, None
+
+    def _revalidate(
+        self,
+        namespace: str,
+        key: str,
+        ttl: float,
+        stale_ttl: Optional[float],
+        refresh: Loader,
+        source: Optional[str],
+    ) -> None:
+        if (namespace, key) in self._refreshing:
+            return
+        self._refreshing.add((namespace, key))
+
+        async def _run() -> None:
+            try:
+                value = await refresh()
+                if value is not None:
+                    self.put(namespace, key, value, ttl, stale_ttl, source)
+            except Exception:  # noqa: BLE001 - a failed refresh keeps the stale entry
+                pass
+            finally:
+                self._refreshing.discard((namespace, key))
+
+        task = asyncio.ensure_future(_run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _namespace(self, namespace: str) -> Dict[str, CacheEntry]:
+        if namespace not in self._entries:
+            self._entries[namespace] = self._load(namespace)
+        return self._entries[namespace]
+
+    def _path(self, namespace: str) -> Optional[Path]:
+        return self._dir / f"{namespace}.json" if self._dir else None
+
+    def _load(self, namespace: str) -> Dict[str, CacheEntry]:
+        path = self._path(namespace)
+        if path is None or not path.exists():
+            return {}
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            return {k: CacheEntry(**v) for k, v in raw.items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def _save(self, namespace: str, entries: Dict[str, CacheEntry]) -> None:
+        path = self._path(namespace)
+        if path is None:
+            return
+        # Merge with what other processes stored since this one loaded the file
+        for k, e in self._load(namespace).items():
+            if k not in entries or entries[k].stored_at < e.stored_at:
+                entries[k] = e
+        now = self._clock()
+        live = {k: asdict(e) for k, e in entries.items() if e.age(now) < e.stale_ttl}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{namespace}.")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(live, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # the memory tier still works
+
+
+async def run_cached_command(ctx, namespace: str, key: str, command: str, ttl: float, stale_ttl: float) -> None:
+    """Serve ``command``'s output from ``ctx.cache``, running it on a miss.
+
+    Misses go through the normal confirm-and-run path, and the approved
+    command is stored with its output. Background revalidation re-runs
+    that stored command quietly, never ``command`` itself: keys are
+    normalized (and may come from another process's disk tier), so a
+    matching key says nothing about whether this exact text was approved.
+    Only successful, non-empty output is cached.
+    """
+    def _output(result: Optional[Tuple[int, str, str]]) -> Optional[str]:
+        if not result:
+            return None
+        code, stdout, _ = result
+        return stdout if code == 0 and stdout.strip() else None
+
+    async def load() -> Optional[str]:
+        return _output(await ctx.commands.maybe_run(command))
+
+    async def refresh() -> Optional[str]:
+        entry = ctx.cache.get(namespace, key)
+        approved = entry.source if entry is not None else None
+        if approved is None:
+            return None  # stored before commands were recorded; wait for the next miss
+        return _output(await ctx.commands.run_quiet(approved))
+
+    await _serve(ctx, namespace, key, ttl, stale_ttl, load, refresh, command)
+
+
+async def run_cached_native(
+    ctx, namespace: str, key: str, description: str, action: Loader, ttl: float, stale_ttl: float
+) -> None:
+    """Serve an in-process fetch from ``ctx.cache``, confirming it on a miss."""
+    async def load() -> Optional[str]:
+        return await ctx.commands.run_native(description, action, confirm=True)
+
+    await _serve(ctx, namespace, key, ttl, stale_ttl, load, action)
+
+
+async def _serve(
+    ctx,
+    namespace: str,
+    key: str,
+    ttl: float,
+    stale_ttl: float,
+    load: Loader,
+    refresh: Loader,
+    source: Optional[str] = None,
+) -> None:
+    value, entry = await ctx.cache.fetch(namespace, key, ttl, load, refresh, stale_ttl, source)
+    if entry is not None:
+        ctx.commands.show_cached(value, ctx.cache.age_of(entry))
+        if getattr(ctx, "turn", None) is not None:
+            ctx.turn.cache_hit = True
@@ -1,15 +1,69 @@
 """Intent chain for processing user intents."""
 
-from typing import Iterable
-from .base import IntentHandler, IntentContext
+import asyncio
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+from .base import IntentHandler, IntentContext, intent_name
+from ..commands.batch import CommandBatch
+from .router import IntentRouter, DEFAULT_MAX_SCAN_CHARS
+
+Fallback = Callable[[str], Optional[IntentHandler]]
 
 
 class IntentChain:
-    def __init__(self, handlers: Iterable[IntentHandler]) -> None:
+    def __init__(
+        self,
+        handlers: Iterable[IntentHandler],
+        max_scan_chars: Optional[int] = DEFAULT_MAX_SCAN_CHARS,
+        fallback: Optional[Fallback] = None,
+    ) -> None:
         self._handlers = list(handlers)
+        self._router = IntentRouter(self._handlers, max_scan_chars)
+        self._fallback = fallback
 
     async def try_handle(self, user_input: str, ctx: IntentContext) -> bool:
-        for h in self._handlers:
-            if h.matches(user_input):
-                return await h.handle(user_input, ctx)
-        return False
+        start = time.perf_counter()
+        routed = self.match(user_input)
+        self._note(ctx, start, [h for h, _ in routed])
+        if len(routed) >= 2:
+            return await self._handle_all(routed, ctx)
+        if not routed:
+            return False
+        h, _ = routed[0]
+        return await h.handle(user_input, ctx)
+
+    def match(self, user_input: str) -> List[Tuple[IntentHandler, str]]:
+        """The ``(handler, clause)`` pairs ``try_handle`` would run, without running them."""
+        routed = self._router.match(user_input)
+        if not routed and self._fallback is not None:
+            # Second stage for prompts the patterns miss, e.g. a classifier
+            h = self._fallback(user_input)
+            if h is not None:
+                routed = [(h, user_input)]
+        return routed
+
+    @staticmethod
+    def _note(ctx: IntentContext, start: float, handlers: List[IntentHandler]) -> None:
+        turn = getattr(ctx, "turn", None)
+        if turn is not None:
+            turn.timings["intent_match"] = time.perf_counter() - start
+            turn.intents.extend(intent_name(h) for h in handlers)
+
+    async def _handle_all(self, routed: List[Tuple[IntentHandler, str]], ctx: IntentContext) -> bool:
+        """Run one handler per clause concurrently with a shared confirmation."""
+        batch = CommandBatch(ctx.commands, len(routed))
+
+        async def run(slot: int, handler: IntentHandler, clause: str) -> bool:
+            try:
+                slot_ctx = IntentContext(batch.slots[slot], getattr(ctx, "cache", None), getattr(ctx, "turn", None))
+                return await handler.handle(clause, slot_ctx)
+            finally:
+                batch.finish(slot)
+
+        results = await asyncio.gather(
+            *(run(i, h, clause) for i, (h, clause) in enumerate(routed)), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return any(results)
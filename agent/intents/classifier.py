@@ -0,0 +1,87 @@
+"""TF-IDF + softmax intent classifier used when no intent regex matches."""
+
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+DATA_DIR = Path(__file__).with_name("data")
+MODEL_PATH = DATA_DIR / "intent_model.json"
+CORPUS_PATH = DATA_DIR / "intent_corpus.tsv"
+NO_INTENT = "none"
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def features(text: str) -> List[str]:
+    """Word unigrams, word bigrams and character trigrams of ``text``."""
+    tokens = _TOKEN.findall(text.lower())
+    feats = [f"w:{t}" for t in tokens]
+    feats += [f"b:{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for t in tokens:
+        padded = f" {t} "
+        feats += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return feats
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> List[Tuple[str, str]]:
+    """Read ``label<TAB>prompt`` lines, skipping blanks and ``#`` comments."""
+    rows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip() and not line.startswith("#"):
+            label, text = line.split("\t", 1)
+            rows.append((label.strip(), text.strip()))
+    return rows
+
+
+class IntentClassifier:
+    """Linear model over sparse TF-IDF features, loaded from a JSON file.
+
+    ``classify`` returns an intent name only when the top class is not
+    ``"none"`` and its softmax probability reaches ``threshold``; prompts
+    longer than ``max_words`` are left to the LLM.
+    """
+
+    def __init__(self, model: Dict[str, Any], threshold: Optional[float] = None) -> None:
+        self.labels: List[str] = list(model["labels"])
+        self.threshold = float(model["threshold"] if threshold is None else threshold)
+        self.max_words = int(model.get("max_words", 16))
+        self._index = {f: i for i, f in enumerate(model["features"])}
+        self._idf = np.asarray(model["idf"], dtype=np.float64)
+        self._weights = np.asarray(model["weights"], dtype=np.float64)
+        self._bias = np.asarray(model["bias"], dtype=np.float64)
+
+    @classmethod
+    def load(cls, path: Path = MODEL_PATH, threshold: Optional[float] = None) -> "IntentClassifier":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")), threshold)
+
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (feature indices, L2-normalised TF-IDF values) of ``text``."""
+        counts = Counter(f for f in features(text) if f in self._index)
+        if not counts:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        idx = np.fromiter((self._index[f] for f in counts), dtype=np.intp, count=len(counts))
+        tf = np.fromiter((1.0 + math.log(c) for c in counts.values()), dtype=np.float64, count=len(counts))
+        values = tf * self._idf[idx]
+        return idx, values / np.linalg.norm(values)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Return the most likely label and its probability."""
+        idx, values = self.vectorize(text)
+        logits = self._weights[:, idx] @ values + self._bias
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best])
+
+    def classify(self, text: str) -> Optional[str]:
+        """Return the intent name for ``text``, or None to fall through to the LLM."""
+        if len(text.split()) > self.max_words:
+            return None
+        label, confidence = self.predict(text)
+        if label == NO_INTENT or confidence < self.threshold:
+            return None
+        return label
@@ -1,7 +1,10 @@
 """Date and time intent handler."""
 
 import re
-from .base import IntentContext
+from typing import Optional
+from . import keywords
+from .base import IntentContext, use_shell_commands
+from ..utils import clock
 from ..utils.os_utils import OS
 
 
@@ -9,11 +12,20 @@ class DateTimeHandler:
     _PATTERN = re.compile(
         r"\b(datetime|date\s*time|time\s*and\s*date|current\s+(date\s+and\s+time|datetime)|what'?s\s+the\s+date\s+and\s+time)\b", re.I,
     )
+    _KEYWORDS = keywords.DATE_TIME
+    _FORMAT = "%Y-%m-%d %H:%M:%S"
+
+    def __init__(self, use_shell: Optional[bool] = None) -> None:
+        self._use_shell = use_shell_commands() if use_shell is None else use_shell
+        self._zone = clock.local_zone()
 
     def matches(self, user_input: str) -> bool:
         return bool(self._PATTERN.search(user_input))
 
     async def handle(self, user_input: str, ctx: IntentContext) -> bool:
+        if not self._use_shell:
+            await ctx.commands.run_native("current date and time", lambda: clock.now(self._zone).strftime(self._FORMAT))
+            return True
         cmd = "powershell -Command \"Get-Date -Format 'yyyy-MM-dd HH:mm:ss'\"" if OS.is_windows() else "date '+%Y-%m-%d %H:%M:%S'"
         await ctx.commands.maybe_run(cmd)
         return True
@@ -0,0 +1,14 @@
+"""Prefilter keywords of the built-in intents.
+
+Kept apart from the handlers so the registry can route on them without
+importing a handler's module; each handler exposes its tuple as
+``_KEYWORDS``. At least one keyword (lowercase) occurs in every input
+the handler's pattern matches.
+"""
+
+WEATHER = ("weather",)
+PUBLIC_IP = ("ip",)
+DATE_TIME = ("date",)
+TIME = ("time",)
+DATE = ("date",)
+LIST_FILES = ("list", "show", "display", "print", "ls", "dir", "files")
@@ -1,7 +1,11 @@
 """List files intent handler."""
 
+import os
 import re
-from .base import IntentContext
+from typing import Optional
+from . import keywords
+from .base import IntentContext, use_shell_commands
+from ..utils.listing import DirectoryLister, ListingOptions
 from ..utils.os_utils import OS
 
 
@@ -15,15 +19,58 @@ class ListFilesHandler:
         # | \bfiles\b
         """
     )
+    _KEYWORDS = keywords.LIST_FILES
+
+    _HIDDEN = re.compile(r"\b(all|hidden|including\s+hidden|/a|-a)\b", re.I)
+    _GLOB = re.compile(r"(?<!\S)(\S*\*\S*|\S+\?\S+)")
+    _PAGE = re.compile(r"\bpage\s+(\d+)\b", re.I)
+    _LIMIT = re.compile(r"\b(?:first|top|limit)\s+(\d+)\b", re.I)
+    _SORT = re.compile(r"\b(?:by|sorted\s+by)\s+(name|size|date|time|modified|mtime)\b|\b(largest|biggest|newest|latest|recent|unsorted)\b", re.I)
+
+    def __init__(self, use_shell: Optional[bool] = None, page_size: int = 200) -> None:
+        self._use_shell = use_shell_commands() if use_shell is None else use_shell
+        self._page_size = page_size
 
     def matches(self, user_input: str) -> bool:
         return bool(self._PATTERN.search(user_input))
 
     async def handle(self, user_input: str, ctx: IntentContext) -> bool:
-        want_all = re.search(r"\b(all|hidden|including\s+hidden|/a|-a)\b", user_input, re.I) is not None
+        if not self._use_shell:
+            options = self.parse_options(user_input)
+            # Confirmed like any command: a tool call would otherwise send the
+            # directory's contents to the model provider unasked.
+            await ctx.commands.run_native(
+                f"list files in {os.getcwd()}", lambda: DirectoryLister(".").iter_lines(options), confirm=True
+            )
+            return True
+        want_all = self._HIDDEN.search(user_input) is not None
         if OS.is_windows():
             cmd = f"powershell -Command \"Get-ChildItem {'-Force' if want_all else ''}\""
         else:
             cmd = "ls -la" if want_all else "ls -l"
         await ctx.commands.maybe_run(cmd)
-        return True
\ No newline at end of file
+        return True
+
+    def parse_options(self, user_input: str) -> ListingOptions:
+        """Read hidden/glob/sort/pagination hints from the request."""
+        glob = self._GLOB.search(user_input)
+        page = self._PAGE.search(user_input)
+        limit = self._LIMIT.search(user_input)
+        sort, reverse = "name", False
+        m = self._SORT.search(user_input)
+        if m:
+            word = (m.group(1) or m.group(2)).lower()
+            if word in ("size", "largest", "biggest"):
+                sort, reverse = "size", True
+            elif word in ("date", "time", "modified", "mtime", "newest", "latest", "recent"):
+                sort, reverse = "mtime", True
+            elif word == "unsorted":
+                sort = "none"
+        return ListingOptions(
+            show_hidden=self._HIDDEN.search(user_input) is not None,
+            pattern=glob.group(1).strip("'\"") if glob else None,
+            sort=sort,
+            reverse=reverse,
+            page=int(page.group(1)) if page else 1,
+            page_size=int(limit.group(1)) if limit else self._page_size,
+        )
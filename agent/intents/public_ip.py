@@ -1,17 +1,54 @@
 """Public IP intent handler."""
 
+import ipaddress
 import re
-from .base import IntentContext
+from typing import Optional
+from . import keywords
+from .base import IntentContext, use_shell_commands
+from .cache import run_cached_command, run_cached_native
+from ..net.http_client import HttpClient, shared_client
 from ..utils.os_utils import OS
 
 
 class PublicIpHandler:
     _PATTERN = re.compile(r"\b(my|public|external)\s+ip\b|^ip$|what is my ip", re.I)
+    _KEYWORDS = keywords.PUBLIC_IP
+    _CACHE_TTL = 60 * 60
+    _STALE_TTL = 24 * 60 * 60
+
+    def __init__(
+        self,
+        use_shell: Optional[bool] = None,
+        url: str = "https://ifconfig.me/ip",
+        http: Optional[HttpClient] = None,
+    ) -> None:
+        self._use_shell = use_shell_commands() if use_shell is None else use_shell
+        self._url = url
+        self._http = http
 
     def matches(self, user_input: str) -> bool:
         return bool(self._PATTERN.search(user_input))
 
     async def handle(self, user_input: str, ctx: IntentContext) -> bool:
-        cmd = "powershell -Command \"(Invoke-RestMethod 'https://ifconfig.me/ip')\"" if OS.is_windows() else "curl -s https://ifconfig.me"
-        await ctx.commands.maybe_run(cmd)
+        if self._use_shell:
+            cmd = "powershell -Command \"(Invoke-RestMethod 'https://ifconfig.me/ip')\"" if OS.is_windows() else "curl -s https://ifconfig.me"
+            if getattr(ctx, "cache", None) is None:
+                await ctx.commands.maybe_run(cmd)
+            else:
+                await run_cached_command(ctx, "public_ip_shell", "", cmd, self._CACHE_TTL, self._STALE_TTL)
+            return True
+
+        description = f"GET {self._url}"
+        if getattr(ctx, "cache", None) is None:
+            await ctx.commands.run_native(description, self._fetch, confirm=True)
+        else:
+            await run_cached_native(ctx, "public_ip", "", description, self._fetch, self._CACHE_TTL, self._STALE_TTL)
         return True
+
+    async def _fetch(self) -> str:
+        response = await (self._http or shared_client()).get(self._url)
+        text = response.text().strip()
+        try:
+            return str(ipaddress.ip_address(text))
+        except ValueError:
+            raise ValueError(f"Unexpected response from {self._url}: {text[:80]!r}") from None
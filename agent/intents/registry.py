@@ -0,0 +1,232 @@
+"""Lazy registry of intent handlers."""
+
+import os
+import threading
+import warnings
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+from . import keywords
+from .base import IntentContext, IntentHandler
+from .chain import IntentChain
+
+ENTRY_POINT_GROUP = "ai_assistant.intents"
+
+
+@dataclass(frozen=True)
+class IntentSpec:
+    """Everything needed to route to a handler without importing it.
+
+    ``target`` is ``"package.module:ClassName"``; the class is built with no
+    arguments. ``keywords`` are lowercase literals, one of which appears in
+    every input the handler matches; without them the handler is imported
+    as soon as a prompt has to be checked against it. Lower ``priority``
+    values are tried first.
+    """
+    name: str
+    target: str
+    priority: int = 100
+    keywords: Optional[Tuple[str, ...]] = None
+
+
+BUILTIN_SPECS = (
+    IntentSpec("weather", "agent.intents.weather:WeatherHandler", 10, keywords.WEATHER),
+    IntentSpec("public_ip", "agent.intents.public_ip:PublicIpHandler", 20, keywords.PUBLIC_IP),
+    IntentSpec("date_time", "agent.intents.date_time:DateTimeHandler", 30, keywords.DATE_TIME),
+    IntentSpec("time", "agent.intents.time_only:TimeHandler", 40, keywords.TIME),
+    IntentSpec("date", "agent.intents.date_only:DateHandler", 50, keywords.DATE),
+    IntentSpec("list_files", "agent.intents.list_files:ListFilesHandler", 60, keywords.LIST_FILES),
+)
+
+
+class LazyHandler:
+    """Stand-in that imports and builds its handler the first time it is asked.
+
+    Exposes the spec's keywords as ``_KEYWORDS`` so the router can skip it
+    without triggering the import.
+    """
+
+    def __init__(self, spec: IntentSpec, registry: "IntentRegistry") -> None:
+        self.spec = spec
+        self._registry = registry
+        self._KEYWORDS = spec.keywords
+        self._broken = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._registry.is_loaded(self.spec.name)
+
+    def matches(self, user_input: str) -> bool:
+        """Never matches once the handler failed to build; the failure is warned about once."""
+        if self._broken:
+            return False
+        try:
+            handler = self._registry.handler(self.spec.name)
+        except Exception as ex:  # noqa: BLE001 - a broken plugin must not break every prompt
+            self._broken = True
+            self._registry.drop(self.spec.name, ex)
+            return False
+        return handler.matches(user_input)
+
+    async def handle(self, user_input: str, ctx: IntentContext) -> bool:
+        return await self._registry.handler(self.spec.name).handle(user_input, ctx)
+
+
+class Classifier(Protocol):
+    def classify(self, text: str) -> Optional[str]: ...
+
+
+class IntentRegistry:
+    """Known intents, ordered by priority, with one shared instance each.
+
+    ``classifier`` builds an optional second stage that names an intent for
+    prompts none of the patterns match; it is called once, on the first
+    such prompt, and may return None to disable the stage. Chains rebuilt
+    after ``register()`` keep the stage and share the built classifier.
+    """
+
+    def __init__(
+        self,
+        specs: Iterable[IntentSpec] = (),
+        classifier: Optional[Callable[[], Optional[Classifier]]] = None,
+    ) -> None:
+        self._specs: Dict[str, IntentSpec] = {}
+        self._instances: Dict[str, IntentHandler] = {}
+        self._lock = threading.Lock()
+        self._chain: Optional[IntentChain] = None
+        self._classifier_factory = classifier
+        self._classifier: Optional[Classifier] = None
+        self._classifier_built = False
+        self._lazy: Dict[str, LazyHandler] = {}
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: IntentSpec) -> None:
+        """Add or replace an intent; a replaced intent is rebuilt on next use."""
+        with self._lock:
+            self._specs[spec.name] = spec
+            self._instances.pop(spec.name, None)
+            self._chain = None
+
+    def specs(self) -> List[IntentSpec]:
+        """Registered specs in priority order (ties keep registration order)."""
+        return sorted(self._specs.values(), key=lambda s: s.priority)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def drop(self, name: str, error: BaseException) -> None:
+        """Unregister an intent whose handler could not be built, with a warning."""
+        warnings.warn(f"Skipping intent plugin {name!r}: {error}", stacklevel=2)
+        with self._lock:
+            if self._specs.pop(name, None) is not None:
+                self._chain = None
+
+    def handler(self, name: str) -> IntentHandler:
+        """Return the shared handler instance, importing its module on first use."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name not in self._instances:
+                module_name, _, attr = self._specs[name].target.partition(":")
+                self._instances[name] = getattr(import_module(module_name), attr)()
+            return self._instances[name]
+
+    def chain(self) -> IntentChain:
+        """Return a chain over lazy stand-ins; it is shared until the specs change."""
+        chain = self._chain
+        if chain is None:
+            self._lazy = {spec.name: LazyHandler(spec, self) for spec in self.specs()}
+            fallback = self._classify if self._classifier_factory is not None else None
+            chain = IntentChain(self._lazy.values(), fallback=fallback)
+            self._chain = chain
+        return chain
+
+    def _classify(self, user_input: str) -> Optional[IntentHandler]:
+        if not self._classifier_built and self._classifier_factory is not None:
+            self._classifier = self._classifier_factory()
+            self._classifier_built = True
+        if self._classifier is None:
+            return None
+        name = self._classifier.classify(user_input)
+        return self._lazy.get(name) if name else None
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> None:
+        """Register IntentSpec objects published by installed packages.
+
+        A plugin that fails to load or is not an IntentSpec is skipped with
+        a warning, so one broken package cannot disable every intent.
+        """
+        from importlib.metadata import entry_points
+        for ep in entry_points(group=group):
+            try:
+                spec = ep.load()
+            except Exception as ex:  # noqa: BLE001 - any import error in a third-party plugin
+                warnings.warn(f"Skipping intent plugin {ep.name!r}: {ex}", stacklevel=2)
+                continue
+            if not isinstance(spec, IntentSpec):
+                warnings.warn(
+                    f"Skipping intent plugin {ep.name!r}: it must point to an IntentSpec, got {type(spec).__name__}",
+                    stacklevel=2,
+                )
+                continue
+            self.register(spec)
+
+    def load_config(self, value: Optional[str]) -> None:
+        """Register handlers listed as ``module:Class[@priority]``, comma-separated.
+
+        Each class is imported here, since these handlers have no keywords
+        and would be imported by the first prompt anyway; an entry that
+        cannot be parsed or imported is skipped with a warning.
+        """
+        for item in (value or "").split(","):
+            item = item.strip()
+            if not item:
+                continue
+            target, _, priority = item.partition("@")
+            module_name, _, attr = target.strip().partition(":")
+            try:
+                order = int(priority) if priority else 100
+                if not module_name or not attr:
+                    raise ValueError("expected module:Class")
+                if not callable(getattr(import_module(module_name), attr)):
+                    raise TypeError(f"{attr} is not a class")
+            except Exception as ex:  # noqa: BLE001 - import errors of any kind in user config
+                warnings.warn(f"Skipping INTENT_PLUGINS entry {item!r}: {ex}", stacklevel=2)
+                continue
+            self.register(IntentSpec(attr.lower(), f"{module_name}:{attr}", order))
+
+
+def load_classifier() -> Optional[Classifier]:
+    """Build the bundled classifier unless ``INTENT_CLASSIFIER=0``, NumPy or the model is missing."""
+    if os.getenv("INTENT_CLASSIFIER", "1").strip().lower() in ("0", "false", "off", "no"):
+        return None
+    try:
+        from .classifier import IntentClassifier
+    except ImportError:
+        return None
+    threshold = os.getenv("INTENT_CLASSIFIER_THRESHOLD")
+    try:
+        return IntentClassifier.load(threshold=float(threshold) if threshold else None)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+_default: Optional[IntentRegistry] = None
+_default_lock = threading.Lock()
+
+
+def default_registry() -> IntentRegistry:
+    """Process-wide registry: built-ins, entry points, then ``INTENT_PLUGINS``.
+
+    Prompts no pattern matches are offered to the bundled classifier.
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            registry = IntentRegistry(BUILTIN_SPECS, classifier=load_classifier)
+            registry.load_entry_points()
+            registry.load_config(os.getenv("INTENT_PLUGINS"))
+            _default = registry
+        return _default
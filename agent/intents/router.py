@@ -0,0 +1,99 @@
+"""Keyword-prefiltered intent router."""
+
+import re
+from typing import Iterable, List, Optional, Tuple
+from .base import IntentHandler
+
+# Intent prompts are short; anything past this is not scanned.
+DEFAULT_MAX_SCAN_CHARS = 2048
+
+# Characters that ``re.I`` treats as equal to an ASCII letter but that
+# ``str.lower()`` leaves alone; folded so the prefilter never misses a match.
+_FOLD = str.maketrans({"İ": "i", "ı": "i", "ſ": "s"})
+
+# Where a compound prompt ("the time and the weather in Paris") is split.
+_CLAUSE_SPLIT = re.compile(r"\s*(?:[,;&]|\b(?:and|also|plus|then)\b)\s*", re.I)
+
+
+def _keywords_of(handler: IntentHandler) -> Optional[Tuple[str, ...]]:
+    """Return the handler's prefilter keywords, if it declares any."""
+    keywords = getattr(handler, "_KEYWORDS", None)
+    if isinstance(keywords, tuple) and all(isinstance(k, str) for k in keywords):
+        return keywords
+    return None
+
+
+class IntentRouter:
+    """Pick the first matching handler, skipping regexes that cannot match.
+
+    Handlers may declare ``_KEYWORDS``: lowercase literals, at least one of
+    which occurs in every input their pattern matches. The input is folded
+    to lowercase once and a handler's ``matches()`` only runs when one of
+    its keywords is present, so a prompt with no intent (most traffic) costs
+    a few substring checks instead of a regex scan per handler. Handlers are
+    still tried in priority order, so the result is the same as calling
+    ``matches()`` on each in turn. Handlers without keywords are always
+    asked.
+    """
+
+    def __init__(self, handlers: Iterable[IntentHandler], max_scan_chars: Optional[int] = DEFAULT_MAX_SCAN_CHARS) -> None:
+        self._handlers = list(handlers)
+        self._keywords = [_keywords_of(h) for h in self._handlers]
+        self._max_scan_chars = max_scan_chars
+
+    def _clip(self, user_input: str) -> str:
+        if self._max_scan_chars is None:
+            return user_input
+        return user_input[: self._max_scan_chars]
+
+    def route(self, user_input: str) -> Optional[IntentHandler]:
+        """Return the highest-priority handler matching ``user_input``."""
+        text = self._clip(user_input)
+        return self._first(text, self._candidates(text.translate(_FOLD).lower()))
+
+    def route_all(self, user_input: str) -> List[Tuple[IntentHandler, str]]:
+        """Route each clause of a compound prompt separately.
+
+        Returns ``(handler, clause)`` pairs in prompt order when at least two
+        clauses match; otherwise an empty list, so that phrases such as
+        "date and time" keep going to the single handler that matches the
+        whole prompt.
+        """
+        routed = self.match(user_input)
+        return routed if len(routed) >= 2 else []
+
+    def match(self, user_input: str) -> List[Tuple[IntentHandler, str]]:
+        """``(handler, clause)`` pairs for a compound prompt, else at most one for the whole prompt.
+
+        The prompt is only split into clauses when the keywords of at least
+        two handlers occur in it, and clauses are only checked against those
+        handlers, so a prompt with one intent or none costs a single pass.
+        """
+        text = self._clip(user_input)
+        candidates = self._candidates(text.translate(_FOLD).lower())
+        if len(candidates) >= 2:
+            clauses = [c for c in _CLAUSE_SPLIT.split(text) if c]
+            if len(clauses) >= 2:
+                routed = [(h, c) for c in clauses for h in (self._first(c, candidates, True),) if h is not None]
+                if len(routed) >= 2:
+                    return routed
+        h = self._first(text, candidates)
+        return [(h, user_input)] if h is not None else []
+
+    def _candidates(self, folded: str) -> List[int]:
+        """Indexes of the handlers that have no keywords or one present in ``folded``."""
+        return [
+            i for i, keywords in enumerate(self._keywords)
+            if keywords is None or any(k in folded for k in keywords)
+        ]
+
+    def _first(self, text: str, candidates: List[int], refilter: bool = False) -> Optional[IntentHandler]:
+        """The first candidate matching ``text``; ``refilter`` rechecks keywords against ``text`` itself."""
+        folded = text.translate(_FOLD).lower() if refilter else None
+        for i in candidates:
+            keywords = self._keywords[i]
+            if folded is not None and keywords is not None and not any(k in folded for k in keywords):
+                continue
+            if self._handlers[i].matches(text):
+                return self._handlers[i]
+        return None
@@ -1,17 +1,29 @@
 """Time-only intent handler."""
 
 import re
-from .base import IntentContext
+from typing import Optional
+from . import keywords
+from .base import IntentContext, use_shell_commands
+from ..utils import clock
 from ..utils.os_utils import OS
 
 
 class TimeHandler:
     _PATTERN = re.compile(r"\b(what'?s\s+the\s+time|current\s+time|local\s+time|time\s+(now|right\s*now))\b", re.I)
+    _KEYWORDS = keywords.TIME
+    _FORMAT = "%H:%M:%S"
+
+    def __init__(self, use_shell: Optional[bool] = None) -> None:
+        self._use_shell = use_shell_commands() if use_shell is None else use_shell
+        self._zone = clock.local_zone()
 
     def matches(self, user_input: str) -> bool:
         return bool(self._PATTERN.search(user_input))
 
     async def handle(self, user_input: str, ctx: IntentContext) -> bool:
+        if not self._use_shell:
+            await ctx.commands.run_native("current time", lambda: clock.now(self._zone).strftime(self._FORMAT))
+            return True
         cmd = "powershell -Command \"Get-Date -Format HH:mm:ss\"" if OS.is_windows() else "date '+%T'"
         await ctx.commands.maybe_run(cmd)
         return True
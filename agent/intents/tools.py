@@ -0,0 +1,130 @@
+"""Intent handlers exposed to the LLM as callable tools."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence
+from .base import IntentContext
+from .registry import IntentRegistry
+from ..commands.batch import CommandBatch
+from ..llm.interfaces import ToolCall, ToolDefinition
+
+_NO_PARAMETERS: Dict[str, Any] = {"type": "object", "properties": {}}
+
+
+@dataclass(frozen=True)
+class IntentTool:
+    """A tool definition backed by a registered intent.
+
+    ``prompt`` turns the model's arguments into the request text the
+    handler already understands, so tools reuse the handlers' parsing.
+    """
+    definition: ToolDefinition
+    intent: str
+    prompt: Callable[[Dict[str, Any]], str]
+
+
+def _list_files_prompt(args: Dict[str, Any]) -> str:
+    words = ["list files"]
+    pattern = "*".join(str(args.get("pattern") or "").split())
+    if pattern:
+        words.append(_as_glob(pattern))
+    if args.get("show_hidden"):
+        words.append("all")
+    sort = {"size": "by size", "mtime": "by date", "name": "by name"}.get(args.get("sort") or "")
+    if sort:
+        words.append(sort)
+    if args.get("page"):
+        words.append(f"page {int(args['page'])}")
+    return " ".join(words)
+
+
+
+def _as_glob(pattern: str) -> str:
+    """``*.py`` stays as is; a bare ``.py`` or ``test`` becomes ``*.py`` or ``*test*``."""
+    if "*" in pattern or "?" in pattern:
+        return pattern
+    return f"*{pattern}" if pattern.startswith(".") else f"*{pattern}*"
+
+
+BUILTIN_TOOLS = (
+    IntentTool(
+        ToolDefinition("get_current_date", "Today's date on the user's machine (YYYY-MM-DD).", _NO_PARAMETERS),
+        "date",
+        lambda args: "what's the date",
+    ),
+    IntentTool(
+        ToolDefinition("get_current_time", "The current local time on the user's machine (HH:MM:SS).", _NO_PARAMETERS),
+        "time",
+        lambda args: "what's the time",
+    ),
+    IntentTool(
+        ToolDefinition(
+            "list_files",
+            "List files in the user's current directory, 200 per page.",
+            {
+                "type": "object",
+                "properties": {
+                    "pattern": {"type": "string", "description": "Glob filter such as *.py"},
+                    "sort": {"type": "string", "enum": ["name", "size", "mtime"]},
+                    "show_hidden": {"type": "boolean"},
+                    "page": {"type": "integer", "minimum": 1},
+                },
+            },
+        ),
+        "list_files",
+        _list_files_prompt,
+    ),
+    IntentTool(
+        ToolDefinition(
+            "get_weather",
+            "Current weather for a city, or for the user's location if no city is given.",
+            {"type": "object", "properties": {"city": {"type": "string"}}},
+        ),
+        "weather",
+        lambda args: f"weather in {args['city']}" if args.get("city") else "weather",
+    ),
+    IntentTool(
+        ToolDefinition("get_public_ip", "The user's public IP address.", _NO_PARAMETERS),
+        "public_ip",
+        lambda args: "what is my ip",
+    ),
+)
+
+
+class IntentToolbox:
+    """Runs tool calls through the registry's shared intent handlers."""
+
+    def __init__(self, registry: IntentRegistry, tools: Sequence[IntentTool] = BUILTIN_TOOLS) -> None:
+        names = {spec.name for spec in registry.specs()}
+        self._registry = registry
+        self._tools = {t.definition.name: t for t in tools if t.intent in names}
+
+    @property
+    def definitions(self) -> List[ToolDefinition]:
+        return [t.definition for t in self._tools.values()]
+
+    async def run(self, calls: Sequence[ToolCall], ctx: IntentContext) -> List[str]:
+        """Run ``calls`` concurrently and return each one's captured output.
+
+        Commands that need approval are confirmed together, once; nothing is
+        printed, the output goes back to the model instead.
+        """
+        batch = CommandBatch(ctx.commands, len(calls), echo=False)
+
+        async def run_one(slot: int, call: ToolCall) -> str:
+            try:
+                tool = self._tools.get(call.name)
+                if tool is None:
+                    return f"Unknown tool: {call.name}"
+                handler = self._registry.handler(tool.intent)
+                slot_ctx = IntentContext(batch.slots[slot], getattr(ctx, "cache", None), getattr(ctx, "turn", None))
+                if slot_ctx.turn is not None:
+                    slot_ctx.turn.intents.append(tool.intent)
+                await handler.handle(tool.prompt(call.arguments), slot_ctx)
+                return batch.text(slot) or "(no output)"
+            except Exception as ex:  # noqa: BLE001 - reported to the model as the result
+                return f"Error: {ex}"
+            finally:
+                batch.finish(slot)
+
+        return list(await asyncio.gather(*(run_one(i, call) for i, call in enumerate(calls))))
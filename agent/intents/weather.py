@@ -1,22 +1,81 @@
 """Weather intent handler."""
 
 import re
-from .base import IntentContext
+from functools import partial
+from typing import Optional
+from urllib.parse import quote, urlencode
+from . import keywords
+from .base import IntentContext, use_shell_commands
+from .cache import run_cached_command, run_cached_native
+from ..net.http_client import HttpClient, shared_client
 from ..utils.os_utils import OS
 
 
 class WeatherHandler:
     _PATTERN = re.compile(r"weather", re.I)
-    
+    _KEYWORDS = keywords.WEATHER
+    _CACHE_TTL = 10 * 60
+    _STALE_TTL = 60 * 60
+    # wttr.in one-line format: location|condition|temp|feels like|wind|humidity|precipitation
+    _FORMAT = "%l|%C|%t|%f|%w|%h|%p"
+    _CITY = re.compile(r"weather\s+(in|for)\s+(?P<city>.+)$", re.I)
+    # Paraphrases routed here by the classifier: "is it raining in Oslo today?"
+    _CITY_FALLBACK = re.compile(
+        r"\b(?:in|for|at)\s+(?!(?:today|tonight|tomorrow|now)\b)(?P<city>[^\W\d][\w'. -]*?)(?:\s+(?:today|tonight|tomorrow|(?:right\s+)?now))?\W*$", re.I
+    )
+
+    def __init__(
+        self,
+        use_shell: Optional[bool] = None,
+        base_url: str = "https://wttr.in",
+        http: Optional[HttpClient] = None,
+    ) -> None:
+        self._use_shell = use_shell_commands() if use_shell is None else use_shell
+        self._base_url = base_url.rstrip("/")
+        self._http = http
+
     def matches(self, user_input: str) -> bool:
         return bool(self._PATTERN.search(user_input))
 
     async def handle(self, user_input: str, ctx: IntentContext) -> bool:
-        m = re.search(r"weather\s+(in|for)\s+(?P<city>.+)$", user_input or "", re.I)
+        m = self._CITY.search(user_input or "") or self._CITY_FALLBACK.search(user_input or "")
         city = (m.group("city").strip() if m else "").replace(" ", "_").rstrip(".!?")
+        key = re.sub(r"[\s_]+", "_", city.lower()).strip("_")
+        if self._use_shell:
+            await self._handle_shell(city, key, ctx)
+            return True
+
+        url = f"{self._base_url}/{quote(city)}?{urlencode({'format': self._FORMAT})}"
+        description = f"GET {self._base_url}/{city}"
+        fetch = partial(self._fetch, url)
+        if getattr(ctx, "cache", None) is None:
+            await ctx.commands.run_native(description, fetch, confirm=True)
+        else:
+            await run_cached_native(ctx, "weather", key, description, fetch, self._CACHE_TTL, self._STALE_TTL)
+        return True
+
+    async def _handle_shell(self, city: str, key: str, ctx: IntentContext) -> None:
         if OS.is_windows():
             cmd = f"curl.exe -s https://wttr.in/{city}" if city else "curl.exe -s https://wttr.in"
         else:
             cmd = f"curl -s https://wttr.in/{city}" if city else "curl -s https://wttr.in"
-        await ctx.commands.maybe_run(cmd)
-        return True
+        if getattr(ctx, "cache", None) is None:
+            await ctx.commands.maybe_run(cmd)
+        else:
+            await run_cached_command(ctx, "weather_shell", key, cmd, self._CACHE_TTL, self._STALE_TTL)
+
+    async def _fetch(self, url: str) -> str:
+        response = await (self._http or shared_client()).get(url)
+        return self.render(response.text())
+
+    @staticmethod
+    def render(line: str) -> str:
+        """Turn a one-line wttr.in report into a readable sentence."""
+        parts = [p.strip() for p in line.strip().split("|")]
+        if len(parts) != 7:
+            return line.strip()
+        location, condition, temp, feels, wind, humidity, precip = parts
+        return (
+            f"{location}: {condition}, {temp} (feels like {feels}), "
+            f"wind {wind}, humidity {humidity}, precipitation {precip}"
+        )
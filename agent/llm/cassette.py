@@ -0,0 +1,248 @@
+"""Recording LLM traffic to a cassette file and replaying it offline."""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import IO, Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from .interfaces import ToolCall, ToolDefinition, ToolRunner
+from .usage import merge_usage, note_model, track_usage
+
+
+@dataclass
+class Interaction:
+    """One recorded request: what was asked, what came back and how long the model took.
+
+    ``latencies`` holds the model's time per round trip, without the time
+    spent running tools: one entry, or two when the model called tools.
+    """
+    session: str
+    turn: int
+    method: str  # "complete", "complete_with_history" or "complete_with_tools"
+    key: str
+    prompt: str
+    reply: str
+    latencies: List[float]
+    model: str = ""
+    history: int = 0  # messages of history sent along
+    usage: Optional[Dict[str, int]] = None
+    tool_calls: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+# The conversation a request belongs to; one client may serve many at once (pipe mode).
+_conversation: ContextVar[Optional[str]] = ContextVar("cassette_conversation", default=None)
+
+
+@contextmanager
+def conversation(session: str) -> Iterator[None]:
+    """Record the requests made inside the block as part of ``session``."""
+    token = _conversation.set(session)
+    try:
+        yield
+    finally:
+        _conversation.reset(token)
+
+
+def request_key(prompt: str, history: Sequence[Dict[str, Any]] = ()) -> str:
+    """Identifies a request by prompt and history; the system prompt carries timestamps, so it is left out."""
+    payload = json.dumps([prompt, [(m.get("role"), m.get("content")) for m in history]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8")
+
+
+def load(path: str) -> List[Interaction]:
+    """Read a cassette written by ``RecordingClient`` (``.gz`` paths are gzip-compressed)."""
+    with _open(os.path.expanduser(path), "r") as f:
+        return [Interaction(**json.loads(line)) for line in f if line.strip()]
+
+
+class RecordingClient:
+    """Passes requests to ``inner`` and appends each one, with its latency, to a cassette.
+
+    Each line of the cassette is one compact JSON ``Interaction``. Requests
+    made inside ``conversation(session)`` are recorded under that session,
+    each with its own turn count; others under the client's own ``session``.
+    A cassette holding several runs or concurrent conversations can thus
+    be replayed conversation by conversation. ``model`` is what the
+    request reported serving it (see ``note_model``), else the one given.
+    """
+
+    def __init__(self, inner: Any, path: str, session: Optional[str] = None, model: str = "") -> None:
+        self._inner = inner
+        self._path = os.path.expanduser(path)
+        self._session = session or uuid.uuid4().hex[:12]
+        self._model = model
+        self._turns: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def wrap(cls, inner: Any, path: str, session: Optional[str] = None, model: str = "") -> "RecordingClient":
+        """A recording client that offers ``complete_with_tools`` only if ``inner`` does."""
+        kind = RecordingToolClient if hasattr(inner, "complete_with_tools") else cls
+        return kind(inner, path, session, model)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)  # warm_up and anything else pass straight through
+
+    async def complete(self, prompt: str, system_prompt: str) -> str:
+        return self._finish(*await self._call("complete", prompt, [], lambda: self._inner.complete(prompt, system_prompt)))
+
+    async def complete_with_history(self, prompt: str, system_prompt: str, history: List[Dict[str, Any]]) -> str:
+        return self._finish(*await self._call(
+            "complete_with_history",
+            prompt,
+            history,
+            lambda: self._inner.complete_with_history(prompt, system_prompt, history),
+        ))
+
+    async def _call(
+        self, method: str, prompt: str, history: List[Dict[str, Any]], call: Callable[[], Awaitable[str]]
+    ) -> Tuple[Interaction, Optional[Exception]]:
+        session = _conversation.get() or self._session
+        self._turns[session] += 1
+        key = request_key(prompt, history)
+        interaction = Interaction(session, self._turns[session], method, key, prompt, "", [], self._model, len(history))
+        error: Optional[Exception] = None
+        started = time.perf_counter()
+        with track_usage() as usage:
+            try:
+                interaction.reply = await call()
+            except Exception as ex:  # noqa: BLE001 - recorded, then raised to the caller
+                interaction.error, error = str(ex), ex
+        interaction.latencies = [time.perf_counter() - started]
+        interaction.model = usage.model or self._model
+        interaction.usage = usage.as_dict() if usage.requests else None
+        return interaction, error
+
+    def _finish(self, interaction: Interaction, error: Optional[Exception]) -> str:
+        self._write(interaction)
+        if error is not None:
+            raise error
+        return interaction.reply
+
+    def _write(self, interaction: Interaction) -> None:
+        record = asdict(interaction)
+        record["latencies"] = [round(seconds, 6) for seconds in interaction.latencies]
+        line = json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+        with _open(self._path, "a") as f:
+            f.write(line + "\n")
+
+
+class RecordingToolClient(RecordingClient):
+    """Records tool-calling requests too, with the calls the model made."""
+
+    async def complete_with_tools(
+        self,
+        prompt: str,
+        system_prompt: str,
+        history: List[Dict[str, Any]],
+        tools: Sequence[ToolDefinition],
+        run_tools: ToolRunner,
+    ) -> str:
+        calls: List[ToolCall] = []
+        model_first = 0.0  # model time before the tools ran
+        tool_time = 0.0
+
+        async def timed_tools(batch: Sequence[ToolCall]) -> List[str]:
+            nonlocal model_first, tool_time
+            model_first = time.perf_counter() - started
+            calls.extend(batch)
+            try:
+                return await run_tools(batch)
+            finally:
+                tool_time += time.perf_counter() - started - model_first
+
+        started = time.perf_counter()
+        interaction, error = await self._call(
+            "complete_with_tools",
+            prompt,
+            history,
+            lambda: self._inner.complete_with_tools(prompt, system_prompt, history, tools, timed_tools),
+        )
+        if calls:
+            model_second = interaction.latencies[0] - model_first - tool_time
+            interaction.latencies = [model_first, max(0.0, model_second)]
+            interaction.tool_calls = [{"id": c.id, "name": c.name, "arguments": c.arguments} for c in calls]
+        return self._finish(interaction, error)
+
+
+class ReplayClient:
+    """Answers from a cassette instead of calling a provider.
+
+    Requests are matched by prompt and history, falling back to the prompt
+    alone when the history differs (e.g. a replayed session skipped turns
+    that never reached the model). Each recorded answer is used once, in
+    recorded order; after that the last one for the prompt repeats. Each
+    answer waits the recorded latency times ``scale`` (0 answers at once),
+    runs the recorded tool calls through ``run_tools`` and reports the
+    recorded token usage, whichever method asks. A prompt that was never
+    recorded raises ``LookupError``.
+    """
+
+    def __init__(self, interactions: Iterable[Interaction], scale: float = 1.0) -> None:
+        self._scale = scale
+        self._recorded: Dict[str, List[Interaction]] = defaultdict(list)
+        self._used: Set[int] = set()
+        for interaction in interactions:
+            self._recorded[interaction.prompt].append(interaction)
+
+    @classmethod
+    def from_file(cls, path: str, scale: float = 1.0) -> "ReplayClient":
+        return cls(load(path), scale)
+
+    async def complete(self, prompt: str, system_prompt: str) -> str:
+        return await self._replay(prompt, [])
+
+    async def complete_with_history(self, prompt: str, system_prompt: str, history: List[Dict[str, Any]]) -> str:
+        return await self._replay(prompt, history)
+
+    async def complete_with_tools(
+        self,
+        prompt: str,
+        system_prompt: str,
+        history: List[Dict[str, Any]],
+        tools: Sequence[ToolDefinition],
+        run_tools: ToolRunner,
+    ) -> str:
+        return await self._replay(prompt, history, run_tools)
+
+    def _pick(self, prompt: str, history: List[Dict[str, Any]]) -> Interaction:
+        recorded = self._recorded.get(prompt)
+        if not recorded:
+            raise LookupError(f"No recorded answer for {prompt!r}")
+        key = request_key(prompt, history)
+        fresh = [i for i in recorded if id(i) not in self._used]
+        chosen = next((i for i in fresh if i.key == key), None) or (fresh[0] if fresh else recorded[-1])
+        self._used.add(id(chosen))
+        return chosen
+
+    async def _replay(self, prompt: str, history: List[Dict[str, Any]], run_tools: Optional[ToolRunner] = None) -> str:
+        interaction = self._pick(prompt, history)
+        latencies = list(interaction.latencies) or [0.0]
+        await self._wait(latencies[0])
+        if interaction.tool_calls and run_tools is not None:
+            await run_tools([ToolCall(c["id"], c["name"], c["arguments"]) for c in interaction.tool_calls])
+            await self._wait(sum(latencies[1:]))
+        if interaction.usage:
+            merge_usage(interaction.usage)
+        if interaction.model:
+            note_model(interaction.model)
+        if interaction.error is not None:
+            raise RuntimeError(interaction.error)
+        return interaction.reply
+
+    async def _wait(self, seconds: float) -> None:
+        if self._scale > 0 and seconds > 0:
+            await asyncio.sleep(seconds * self._scale)
@@ -1,5 +1,9 @@
 """LLM client factory."""
 
+import os
+from dataclasses import replace
+from .cassette import RecordingClient, ReplayClient
+from .routing import ModelRouter, RoutingClient, RoutingRules
 from .interfaces import LLMClient
 from .gemini_client import GeminiClient
 from .openai_client import OpenAIClient
@@ -10,7 +14,32 @@ from ..config.params import AiParameters
 class LLMClientFactory:
     @staticmethod
     def create(params: AiParameters) -> LLMClient:
-        """Return appropriate LLM client based on provider and API key."""
+        """Return appropriate LLM client based on provider and API key.
+
+        ``LLM_REPLAY`` names a cassette to answer from instead (recorded
+        latencies times ``LLM_REPLAY_SCALE``, default 1); ``LLM_RECORD``
+        names one to append every request to. With ``LLM_FAST_MODEL`` and
+        ``LLM_STRONG_MODEL`` set, each request goes to one of those two
+        models of the provider (see ``RoutingRules``).
+        """
+        replay = os.getenv("LLM_REPLAY")
+        if replay:
+            return ReplayClient.from_file(replay, float(os.getenv("LLM_REPLAY_SCALE") or 1.0))
+        rules = RoutingRules.from_env()
+        if rules is None:
+            client = LLMClientFactory._create(params)
+        else:
+            client = RoutingClient.wrap(
+                LLMClientFactory._create(replace(params, model=rules.fast_model)),
+                LLMClientFactory._create(replace(params, model=rules.strong_model)),
+                ModelRouter(rules),
+                os.getenv("LLM_ROUTE_LOG"),
+            )
+        record = os.getenv("LLM_RECORD")
+        return RecordingClient.wrap(client, record, model=params.model) if record else client
+
+    @staticmethod
+    def _create(params: AiParameters) -> LLMClient:
         api_key = (params.api_key or "").strip()
 
         if params.provider == "gemini" and api_key:
@@ -1,8 +1,11 @@
 """Gemini client implementation (test-friendly)."""
 
 import asyncio
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence
 from importlib import import_module
+from .generation import GenerationProfile, GenerationProfiles
+from .interfaces import ToolCall, ToolDefinition, ToolRunner
+from .usage import record_usage
 
 
 def genai():  # <-- patch target for tests
@@ -18,6 +21,7 @@ def genai():  # <-- patch target for tests
 class GeminiClient:
     def __init__(self, model: str, api_key: Optional[str]) -> None:
         self._model = None
+        self._profiles = GenerationProfiles.from_env()
         try:
             if not api_key:
                 raise ImportError("missing key")
@@ -29,6 +33,11 @@ class GeminiClient:
             # Degrade gracefully; complete() will return a stub string
             self._model = None
 
+    async def warm_up(self) -> None:
+        """Open (or keep open) the API connection with a free token-count request."""
+        if self._model:
+            await asyncio.to_thread(self._model.count_tokens, "ping")
+
     async def complete(
         self,
         prompt: str,
@@ -36,13 +45,15 @@ class GeminiClient:
     ) -> str:
         if not self._model:
             return "(Gemini unavailable)"
+        profile = self._profiles.select(prompt)
 
         def _build_full_prompt() -> str:
             return f"{system_prompt}\n\n---\n\nUser: {prompt}"
 
         def _call() -> str:
             full_prompt = _build_full_prompt()
-            resp = self._model.generate_content(full_prompt)
+            resp = self._model.generate_content(full_prompt, generation_config=_generation_config(profile))
+            self._record(resp, profile)
             text = getattr(resp, "text", "") or ""
             return text.strip() or "(empty)"
 
@@ -56,25 +67,130 @@ class GeminiClient:
     ) -> str:
         if not self._model:
             return "(Gemini unavailable)"
-
-        def _build_full_prompt() -> str:
-            # Build conversation history with better formatting
-            conversation_text = ""
-            for i, msg in enumerate(history, 1):
-                role_label = "User" if msg["role"] == "user" else "Assistant"
-                conversation_text += f"{i}. {role_label}: {msg['content']}\n\n"
-            
-            # Add current user prompt with clear separation
-            full_prompt = f"{system_prompt}\n\n"
-            if conversation_text:
-                full_prompt += f"## Previous Conversation\n{conversation_text}---\n\n"
-            full_prompt += f"## Current Request\nUser: {prompt}"
-            return full_prompt
+        profile = self._profiles.select(prompt)
 
         def _call() -> str:
-            full_prompt = _build_full_prompt()
-            resp = self._model.generate_content(full_prompt)
+            full_prompt = _conversation_prompt(prompt, system_prompt, history)
+            resp = self._model.generate_content(full_prompt, generation_config=_generation_config(profile))
+            self._record(resp, profile)
             text = getattr(resp, "text", "") or ""
             return text.strip() or "(empty)"
 
         return await asyncio.to_thread(_call)
+
+    async def complete_with_tools(
+        self,
+        prompt: str,
+        system_prompt: str,
+        history: List[Dict[str, Any]],
+        tools: Sequence[ToolDefinition],
+        run_tools: ToolRunner,
+    ) -> str:
+        if not self._model:
+            return "(Gemini unavailable)"
+        if not tools:
+            return await self.complete_with_history(prompt, system_prompt, history)
+
+        profile = self._profiles.select(prompt)
+        config = _generation_config(profile)
+        declarations = [{"function_declarations": [_declaration(t) for t in tools]}]
+        contents: List[Any] = [{"role": "user", "parts": [_conversation_prompt(prompt, system_prompt, history)]}]
+
+        resp = await asyncio.to_thread(
+            self._model.generate_content, contents, tools=declarations, generation_config=config
+        )
+        self._record(resp, profile)
+        calls = _function_calls(resp)
+        if not calls:
+            return _text(resp)
+
+        # Run every call from this response at once, then ask for the answer in one more request
+        results = await run_tools(calls)
+        contents.append(resp.candidates[0].content)
+        contents.append({
+            "role": "user",
+            "parts": [
+                {"function_response": {"name": call.name, "response": {"result": result}}}
+                for call, result in zip(calls, results)
+            ],
+        })
+        resp = await asyncio.to_thread(
+            self._model.generate_content,
+            contents,
+            tools=declarations,
+            tool_config={"function_calling_config": {"mode": "NONE"}},
+            generation_config=config,
+        )
+        self._record(resp, profile)
+        return _text(resp)
+
+    def _record(self, resp: Any, profile: GenerationProfile) -> None:
+        usage = getattr(resp, "usage_metadata", None)
+        output_tokens = getattr(usage, "candidates_token_count", None)
+        if usage is not None:
+            record_usage(
+                getattr(usage, "prompt_token_count", 0),
+                output_tokens,
+                getattr(usage, "total_token_count", None),
+                getattr(usage, "cached_content_token_count", None),
+            )
+        try:
+            reason = resp.candidates[0].finish_reason
+        except (AttributeError, IndexError, TypeError):
+            reason = None
+        self._profiles.observe(profile, output_tokens, getattr(reason, "name", reason) == "MAX_TOKENS")
+
+
+def _generation_config(profile: GenerationProfile) -> Dict[str, Any]:
+    config: Dict[str, Any] = {
+        "max_output_tokens": profile.max_tokens,
+        "temperature": profile.temperature,
+        "top_p": profile.top_p,
+    }
+    if profile.stop:
+        config["stop_sequences"] = list(profile.stop)
+    return config
+
+
+def _conversation_prompt(prompt: str, system_prompt: str, history: List[Dict[str, Any]]) -> str:
+    # Build conversation history with better formatting
+    conversation_text = ""
+    for i, msg in enumerate(history, 1):
+        role_label = "User" if msg["role"] == "user" else "Assistant"
+        conversation_text += f"{i}. {role_label}: {msg['content']}\n\n"
+
+    # Add current user prompt with clear separation
+    full_prompt = f"{system_prompt}\n\n"
+    if conversation_text:
+        full_prompt += f"## Previous Conversation\n{conversation_text}---\n\n"
+    full_prompt += f"## Current Request\nUser: {prompt}"
+    return full_prompt
+
+
+def _declaration(tool: ToolDefinition) -> Dict[str, Any]:
+    declaration: Dict[str, Any] = {"name": tool.name, "description": tool.description}
+    # Gemini rejects OBJECT schemas without properties
+    if tool.parameters.get("properties"):
+        declaration["parameters"] = tool.parameters
+    return declaration
+
+
+def _function_calls(resp: Any) -> List[ToolCall]:
+    calls = []
+    try:
+        parts = resp.candidates[0].content.parts
+    except (AttributeError, IndexError, TypeError):
+        return calls
+    for part in parts:
+        fc = getattr(part, "function_call", None)
+        if fc is not None and getattr(fc, "name", ""):
+            calls.append(ToolCall(f"call_{len(calls)}", fc.name, dict(getattr(fc, "args", None) or {})))
+    return calls
+
+
+def _text(resp: Any) -> str:
+    try:
+        text = resp.text or ""
+    except (AttributeError, ValueError):  # no text part, e.g. only function calls
+        text = ""
+    return text.strip() or "(empty)"
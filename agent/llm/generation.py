@@ -0,0 +1,122 @@
+"""Generation settings chosen per query: output cap, sampling and stop sequences."""
+
+import os
+import re
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Mapping, Optional, Tuple
+from ..core.metrics import Metrics, metrics as default_metrics
+from .routing import has_code
+from .usage import note_profile
+
+SHORT = "short"
+DEFAULT = "default"
+CODE = "code"
+LONG = "long"
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    name: str
+    max_tokens: int
+    temperature: float = 0.1
+    top_p: float = 0.9
+    stop: Tuple[str, ...] = ()
+
+
+# Conversations are sent to Gemini as a "User: ..." transcript; a model
+# that starts writing the user's next line has finished its answer.
+_TRANSCRIPT_STOP = ("\nUser:",)
+
+DEFAULT_PROFILES: Dict[str, GenerationProfile] = {
+    SHORT: GenerationProfile(SHORT, 256, stop=_TRANSCRIPT_STOP),
+    DEFAULT: GenerationProfile(DEFAULT, 2000, stop=_TRANSCRIPT_STOP),
+    CODE: GenerationProfile(CODE, 3000, temperature=0.0),
+    LONG: GenerationProfile(LONG, 4000, temperature=0.3, stop=_TRANSCRIPT_STOP),
+}
+
+_WRITE_CODE = re.compile(
+    r"\b(write|implement|fix|refactor|debug|generate)\b.{0,40}\b(code|function|script|class|program|query|regex|test)s?\b",
+    re.I | re.S,
+)
+_LONG_FORM = re.compile(
+    r"\b(in detail|in depth|detailed|essay|article|report|guide|tutorial|step by step|comprehensive|blog post|story)\b",
+    re.I,
+)
+_QUESTION = re.compile(
+    r"^\s*(what|who|when|where|which|is|are|was|were|does|do|did|can|how (many|much|old|far|long))\b", re.I
+)
+# Questions that ask for an explanation rather than a fact, however short.
+_EXPLANATORY = re.compile(
+    r"\b(explain|describe|why|how (to|do|does|can|should|would)|differences?|difference between|compare|"
+    r"can you|could you|do you know|walk me through|tell me about|pros and cons)\b",
+    re.I,
+)
+
+SHORT_QUESTION_CHARS = 120
+
+
+def classify(prompt: str) -> str:
+    """The profile for ``prompt``: code, long-form, a short factual question, or the default.
+
+    A short question that asks for an explanation (why, how to, the
+    difference between...) gets the default cap, not the short one.
+    """
+    if has_code(prompt) or _WRITE_CODE.search(prompt):
+        return CODE
+    if _LONG_FORM.search(prompt) or len(prompt) > 1000:
+        return LONG
+    if (
+        len(prompt) <= SHORT_QUESTION_CHARS
+        and _QUESTION.match(prompt)
+        and "\n" not in prompt.strip()
+        and not _EXPLANATORY.search(prompt)
+    ):
+        return SHORT
+    return DEFAULT
+
+
+class GenerationProfiles:
+    """Chooses a profile per prompt and tracks how long answers come out.
+
+    Output tokens are observed as ``llm.output_tokens.<profile>`` and
+    answers cut off by the cap are counted as ``llm.output_truncated.<profile>``,
+    so the caps can be tuned. With ``adaptive`` off every prompt gets the
+    default profile.
+    """
+
+    def __init__(
+        self,
+        profiles: Optional[Mapping[str, GenerationProfile]] = None,
+        adaptive: bool = True,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        self._profiles = dict(profiles or DEFAULT_PROFILES)
+        self._adaptive = adaptive
+        self._metrics = metrics or default_metrics
+
+    @classmethod
+    def from_env(cls) -> "GenerationProfiles":
+        """``LLM_PROFILES=0`` always uses the default profile; ``LLM_MAX_TOKENS=short=200,code=4000`` sets caps."""
+        adaptive = os.getenv("LLM_PROFILES", "1").strip().lower() not in ("0", "false", "off", "no")
+        profiles = dict(DEFAULT_PROFILES)
+        for item in os.getenv("LLM_MAX_TOKENS", "").split(","):
+            name, sep, value = item.partition("=")
+            name = name.strip().lower()
+            if not sep:
+                continue
+            if name not in profiles:
+                raise ValueError(f"LLM_MAX_TOKENS names unknown profile {name!r}; use one of {', '.join(profiles)}")
+            profiles[name] = replace(profiles[name], max_tokens=int(value))
+        return cls(profiles, adaptive)
+
+    def select(self, prompt: str) -> GenerationProfile:
+        """The profile for ``prompt``, also noted for the current turn's record."""
+        profile = self._profiles[classify(prompt) if self._adaptive else DEFAULT]
+        note_profile(profile.name)
+        return profile
+
+    def observe(self, profile: GenerationProfile, output_tokens: Any, truncated: bool) -> None:
+        if isinstance(output_tokens, int) and not isinstance(output_tokens, bool):
+            self._metrics.observe(f"llm.output_tokens.{profile.name}", output_tokens)
+        if truncated:
+            self._metrics.incr(f"llm.output_truncated.{profile.name}")
@@ -1,6 +1,7 @@
 """LLM client interfaces."""
 
-from typing import Protocol, List, Dict, Any
+from dataclasses import dataclass
+from typing import Protocol, List, Dict, Any, Awaitable, Callable, Sequence
 
 
 class LLMClient(Protocol):
@@ -14,3 +15,35 @@ class LLMClient(Protocol):
         history: List[Dict[str, Any]]
     ) -> str:
         ...
+
+
+@dataclass(frozen=True)
+class ToolDefinition:
+    """A function the model may call; ``parameters`` is a JSON Schema object."""
+    name: str
+    description: str
+    parameters: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class ToolCall:
+    id: str
+    name: str
+    arguments: Dict[str, Any]
+
+
+# Runs every call from one model response and returns their outputs in order.
+ToolRunner = Callable[[Sequence[ToolCall]], Awaitable[List[str]]]
+
+
+class ToolCallingClient(LLMClient, Protocol):
+    async def complete_with_tools(
+        self,
+        prompt: str,
+        system_prompt: str,
+        history: List[Dict[str, Any]],
+        tools: Sequence[ToolDefinition],
+        run_tools: ToolRunner,
+    ) -> str:
+        """Answer ``prompt``; if the model calls tools, run them all and ask once more."""
+        ...
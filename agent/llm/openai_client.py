@@ -1,9 +1,18 @@
 """OpenAI client implementation (test-friendly)."""
 
 import asyncio
+import json
 import os
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Sequence
 from importlib import import_module
+from .generation import GenerationProfile, GenerationProfiles
+from .interfaces import ToolCall, ToolDefinition, ToolRunner
+from .usage import record_usage
+
+
+# How long the SDK's pool keeps an idle connection (httpx defaults to 5 s),
+# long enough for ConnectionWarmer's refreshes to keep it open.
+_KEEPALIVE_EXPIRY = 120.0
 
 
 def OpenAI(*args, **kwargs):  # <-- patch target for tests
@@ -16,6 +25,7 @@ class OpenAIClient:
     def __init__(self, model: str, api_key: Optional[str]) -> None:
         self._model = model
         self._client = None
+        self._profiles = GenerationProfiles.from_env()
         try:
             if not api_key:
                 raise ImportError("missing key")
@@ -23,10 +33,19 @@ class OpenAIClient:
             # Call our patchable shim; tests can patch either:
             # - agent.llm.openai_client.OpenAI
             # - openai.OpenAI (picked up via import_module above)
-            self._client = OpenAI(api_key=api_key, base_url=base)
+            kwargs: Dict[str, Any] = {"api_key": api_key, "base_url": base}
+            http_client = _http_client()
+            if http_client is not None:
+                kwargs["http_client"] = http_client
+            self._client = OpenAI(**kwargs)
         except Exception:
             self._client = None  # complete() will return a stub
 
+    async def warm_up(self) -> None:
+        """Open (or keep open) the API connection with a cheap authenticated request."""
+        if self._client:
+            await asyncio.to_thread(self._client.models.retrieve, self._model)
+
     async def complete(
         self,
         prompt: str,
@@ -34,6 +53,7 @@ class OpenAIClient:
     ) -> str:
         if not self._client:
             return "(OpenAI unavailable)"
+        profile = self._profiles.select(prompt)
 
         def _call() -> str:
             messages: List[Dict[str, str]] = [
@@ -44,10 +64,9 @@ class OpenAIClient:
             resp = self._client.chat.completions.create(
                 model=self._model,
                 messages=messages,
-                temperature=0.1,  # Lower temperature for more consistent responses
-                max_tokens=2000,  # Reasonable limit
-                top_p=0.9,       # Focus on most likely tokens
+                **_generation_args(profile),
             )
+            self._record(resp, profile)
             content = getattr(resp.choices[0].message, "content", "") or ""
             return content.strip() or ""
 
@@ -61,6 +80,7 @@ class OpenAIClient:
     ) -> str:
         if not self._client:
             return "(OpenAI unavailable)"
+        profile = self._profiles.select(prompt)
 
         def _call() -> str:
             messages: List[Dict[str, str]] = [
@@ -80,11 +100,105 @@ class OpenAIClient:
             resp = self._client.chat.completions.create(
                 model=self._model,
                 messages=messages,
-                temperature=0.1,  # Lower temperature for more consistent responses
-                max_tokens=2000,  # Reasonable limit
-                top_p=0.9,       # Focus on most likely tokens
+                **_generation_args(profile),
             )
+            self._record(resp, profile)
             content = getattr(resp.choices[0].message, "content", "") or ""
             return content.strip() or ""
 
         return await asyncio.to_thread(_call)
+
+    async def complete_with_tools(
+        self,
+        prompt: str,
+        system_prompt: str,
+        history: List[Dict[str, Any]],
+        tools: Sequence[ToolDefinition],
+        run_tools: ToolRunner,
+    ) -> str:
+        if not self._client:
+            return "(OpenAI unavailable)"
+        if not tools:
+            return await self.complete_with_history(prompt, system_prompt, history)
+
+        profile = self._profiles.select(prompt)
+        messages: List[Dict[str, Any]] = [{"role": "system", "content": system_prompt}]
+        messages += [{"role": msg["role"], "content": msg["content"]} for msg in history]
+        messages.append({"role": "user", "content": prompt})
+        specs = [
+            {"type": "function", "function": {"name": t.name, "description": t.description, "parameters": t.parameters}}
+            for t in tools
+        ]
+
+        def _call(tool_choice: str) -> Any:
+            resp = self._client.chat.completions.create(
+                model=self._model,
+                messages=messages,
+                tools=specs,
+                tool_choice=tool_choice,
+                **_generation_args(profile),
+            )
+            self._record(resp, profile)
+            return resp.choices[0].message
+
+        message = await asyncio.to_thread(_call, "auto")
+        tool_calls = getattr(message, "tool_calls", None) or []
+        if not tool_calls:
+            return (getattr(message, "content", "") or "").strip()
+
+        # Run every call from this response at once, then ask for the answer in one more request
+        calls = [ToolCall(tc.id, tc.function.name, _parse_arguments(tc.function.arguments)) for tc in tool_calls]
+        results = await run_tools(calls)
+        messages.append({
+            "role": "assistant",
+            "content": getattr(message, "content", None),
+            "tool_calls": [
+                {"id": tc.id, "type": "function", "function": {"name": tc.function.name, "arguments": tc.function.arguments}}
+                for tc in tool_calls
+            ],
+        })
+        for call, result in zip(calls, results):
+            messages.append({"role": "tool", "tool_call_id": call.id, "content": result})
+
+        message = await asyncio.to_thread(_call, "none")
+        return (getattr(message, "content", "") or "").strip()
+
+
+    def _record(self, resp: Any, profile: GenerationProfile) -> None:
+        usage = getattr(resp, "usage", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        if usage is not None:
+            cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+            record_usage(getattr(usage, "prompt_tokens", 0), completion_tokens, getattr(usage, "total_tokens", None), cached)
+        try:
+            truncated = resp.choices[0].finish_reason == "length"
+        except (AttributeError, IndexError, TypeError):
+            truncated = False
+        self._profiles.observe(profile, completion_tokens, truncated)
+
+
+def _generation_args(profile: GenerationProfile) -> Dict[str, Any]:
+    args: Dict[str, Any] = {"temperature": profile.temperature, "max_tokens": profile.max_tokens, "top_p": profile.top_p}
+    if profile.stop:
+        args["stop"] = list(profile.stop)
+    return args
+
+
+def _http_client() -> Any:
+    """The SDK's default HTTP client with a longer keep-alive, or None without httpx."""
+    try:
+        import httpx
+        DefaultHttpxClient = getattr(import_module("openai"), "DefaultHttpxClient")
+    except (ImportError, AttributeError):
+        return None
+    return DefaultHttpxClient(
+        limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=_KEEPALIVE_EXPIRY)
+    )
+
+
+def _parse_arguments(raw: Optional[str]) -> Dict[str, Any]:
+    try:
+        args = json.loads(raw or "{}")
+    except ValueError:
+        return {}
+    return args if isinstance(args, dict) else {}
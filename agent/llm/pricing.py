@@ -0,0 +1,68 @@
+"""Token prices for estimating what a request cost."""
+
+import os
+from typing import Dict, Mapping, Optional, Tuple
+
+# USD per million (prompt, completion) tokens at list price. Check the
+# providers' pricing pages before relying on these; LLM_PRICES overrides them.
+DEFAULT_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.5-pro": (1.25, 10.00),
+}
+
+# Model name prefixes that tell which provider serves a model.
+_PROVIDER_PREFIXES = (("gpt-", "openai"), ("o1", "openai"), ("o3", "openai"), ("o4", "openai"), ("gemini-", "gemini"))
+
+
+def provider_for(model: str) -> Optional[str]:
+    """The provider whose models are named like ``model``, or None if unknown."""
+    name = model.strip().lower()
+    for prefix, provider in _PROVIDER_PREFIXES:
+        if name.startswith(prefix):
+            return provider
+    return None
+
+
+def parse_prices(spec: str) -> Dict[str, Tuple[float, float]]:
+    """Parse ``model=prompt/completion;...`` (USD per million tokens)."""
+    prices: Dict[str, Tuple[float, float]] = {}
+    for item in spec.split(";"):
+        if not item.strip():
+            continue
+        model, _, rates = item.partition("=")
+        prompt, _, completion = rates.partition("/")
+        try:
+            prices[model.strip().lower()] = (float(prompt), float(completion or prompt))
+        except ValueError:
+            raise ValueError(f"LLM_PRICES entries look like 'model=0.15/0.60', not {item.strip()!r}") from None
+    return prices
+
+
+def prices_from_env() -> Dict[str, Tuple[float, float]]:
+    return {**DEFAULT_PRICES, **parse_prices(os.getenv("LLM_PRICES", ""))}
+
+
+def cost(
+    model: str, usage: Optional[Mapping[str, int]], prices: Optional[Mapping[str, Tuple[float, float]]] = None
+) -> Optional[float]:
+    """Estimated USD cost of ``usage``; None without usage or a price for ``model``.
+
+    A dated model name (``gpt-4o-mini-2024-07-18``) uses the price of the
+    longest listed name it starts with.
+    """
+    if not usage:
+        return None
+    table = prices if prices is not None else prices_from_env()
+    name = model.strip().lower()
+    matches = [m for m in table if name == m or name.startswith(m + "-")]
+    if not matches:
+        return None
+    prompt_rate, completion_rate = table[max(matches, key=len)]
+    return (usage.get("prompt_tokens", 0) * prompt_rate + usage.get("completion_tokens", 0) * completion_rate) / 1e6
@@ -0,0 +1,227 @@
+"""Sending each prompt to a fast or a strong model by its complexity."""
+
+import asyncio
+import json
+import os
+import re
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from ..core.metrics import Metrics, metrics as default_metrics
+from .interfaces import ToolCall, ToolDefinition, ToolRunner
+from .usage import note_model
+
+FAST = "fast"
+STRONG = "strong"
+
+# Words that tend to ask for reasoning rather than a quick fact.
+DEFAULT_KEYWORDS = (
+    "analyze", "analyse", "architecture", "compare", "debug", "derive", "design", "explain",
+    "implement", "optimize", "optimise", "proof", "prove", "refactor", "step by step", "tradeoff",
+    "trade-off", "why",
+)
+
+_CODE = re.compile(r"```|^(?:    |\t)\S|\bTraceback \(most recent call last\)|\b(?:def|class|function|import)\s+\w", re.M)
+
+
+def has_code(text: str) -> bool:
+    """Whether ``text`` contains code: fenced or indented blocks, a traceback or definitions."""
+    return _CODE.search(text) is not None
+
+
+@dataclass(frozen=True)
+class RoutingRules:
+    """How prompts are scored; a score of ``threshold`` or more goes to the strong model.
+
+    A prompt scores 1 for being longer than ``long_prompt`` characters (2
+    for four times that), 2 for containing code, 1 per keyword (at most
+    2) and 1 when the conversation has ``deep_history`` messages or more.
+    """
+    fast_model: str
+    strong_model: str
+    threshold: int = 2
+    long_prompt: int = 400
+    deep_history: int = 8
+    keywords: Tuple[str, ...] = DEFAULT_KEYWORDS
+
+    @classmethod
+    def from_env(cls) -> Optional["RoutingRules"]:
+        """None unless both ``LLM_FAST_MODEL`` and ``LLM_STRONG_MODEL`` are set.
+
+        ``LLM_ROUTE_THRESHOLD``, ``LLM_ROUTE_LONG_PROMPT``, ``LLM_ROUTE_DEEP_HISTORY``
+        and ``LLM_ROUTE_KEYWORDS`` (comma-separated, replacing the defaults) tune the scoring.
+        """
+        fast, strong = os.getenv("LLM_FAST_MODEL"), os.getenv("LLM_STRONG_MODEL")
+        if not fast or not strong:
+            return None
+        keywords = os.getenv("LLM_ROUTE_KEYWORDS")
+        return cls(
+            fast.strip(),
+            strong.strip(),
+            threshold=int(os.getenv("LLM_ROUTE_THRESHOLD") or cls.threshold),
+            long_prompt=int(os.getenv("LLM_ROUTE_LONG_PROMPT") or cls.long_prompt),
+            deep_history=int(os.getenv("LLM_ROUTE_DEEP_HISTORY") or cls.deep_history),
+            keywords=tuple(k.strip().lower() for k in keywords.split(",") if k.strip()) if keywords else DEFAULT_KEYWORDS,
+        )
+
+    def describe(self) -> List[str]:
+        return [
+            f"fast model:   {self.fast_model}",
+            f"strong model: {self.strong_model} (score >= {self.threshold})",
+            f"+1 longer than {self.long_prompt} chars, +2 longer than {4 * self.long_prompt}",
+            "+2 contains code",
+            f"+1 per keyword, at most 2: {', '.join(self.keywords)}",
+            f"+1 history of {self.deep_history} messages or more",
+        ]
+
+
+@dataclass
+class RouteDecision:
+    tier: str  # FAST or STRONG
+    model: str
+    score: int
+    reasons: List[str] = field(default_factory=list)
+    time: float = 0.0
+    latency: Optional[float] = None  # seconds the routed request took
+    error: Optional[str] = None
+
+
+class ModelRouter:
+    """Scores prompts with cheap local features; see ``RoutingRules``."""
+
+    def __init__(self, rules: RoutingRules) -> None:
+        self.rules = rules
+        words = sorted(rules.keywords, key=len, reverse=True)
+        self._keywords = re.compile(r"\b(" + "|".join(re.escape(w) for w in words) + r")\b", re.I) if words else None
+
+    def route(self, prompt: str, history: int = 0) -> RouteDecision:
+        rules = self.rules
+        score = 0
+        reasons: List[str] = []
+        if len(prompt) > rules.long_prompt:
+            points = 2 if len(prompt) > 4 * rules.long_prompt else 1
+            score += points
+            reasons.append(f"{len(prompt)} chars (+{points})")
+        if has_code(prompt):
+            score += 2
+            reasons.append("code (+2)")
+        if self._keywords is not None:
+            found = sorted({m.lower() for m in self._keywords.findall(prompt)})
+            if found:
+                points = min(2, len(found))
+                score += points
+                reasons.append(f"keywords {', '.join(found)} (+{points})")
+        if history >= rules.deep_history:
+            score += 1
+            reasons.append(f"{history} history messages (+1)")
+        tier = STRONG if score >= rules.threshold else FAST
+        model = rules.strong_model if tier == STRONG else rules.fast_model
+        return RouteDecision(tier, model, score, reasons, time.time())
+
+
+class RoutingClient:
+    """Sends each request to the fast or the strong client as ``router`` decides.
+
+    The last ``history`` decisions, with the latency each routed request
+    took (model round trips only, not the tools it ran), are kept in ``decisions``, counted in ``metrics``
+    (``llm.route.fast`` / ``llm.route.strong`` and ``llm.route.<tier>_seconds``)
+    and, with ``log_path``, appended to a JSON-lines file for tuning.
+    """
+
+    def __init__(
+        self,
+        fast: Any,
+        strong: Any,
+        router: ModelRouter,
+        log_path: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+        history: int = 100,
+    ) -> None:
+        self._clients = {FAST: fast, STRONG: strong}
+        self.router = router
+        self._log_path = log_path
+        self._metrics = metrics or default_metrics
+        self._decisions: Deque[RouteDecision] = deque(maxlen=history)
+
+    @classmethod
+    def wrap(cls, fast: Any, strong: Any, router: ModelRouter, log_path: Optional[str] = None) -> "RoutingClient":
+        """A routing client that offers ``complete_with_tools`` only if both clients do."""
+        tools = hasattr(fast, "complete_with_tools") and hasattr(strong, "complete_with_tools")
+        return (RoutingToolClient if tools else cls)(fast, strong, router, log_path)
+
+    @property
+    def decisions(self) -> List[RouteDecision]:
+        return list(self._decisions)
+
+    async def warm_up(self) -> None:
+        warmers = [getattr(c, "warm_up", None) for c in self._clients.values()]
+        await asyncio.gather(*(w() for w in warmers if w is not None))
+
+    async def complete(self, prompt: str, system_prompt: str) -> str:
+        return await self._route(prompt, 0, lambda client: client.complete(prompt, system_prompt))
+
+    async def complete_with_history(self, prompt: str, system_prompt: str, history: List[Dict[str, Any]]) -> str:
+        return await self._route(
+            prompt, len(history), lambda client: client.complete_with_history(prompt, system_prompt, history)
+        )
+
+    async def _route(
+        self,
+        prompt: str,
+        history: int,
+        call: Callable[[Any], Awaitable[str]],
+        excluded: Callable[[], float] = lambda: 0.0,
+    ) -> str:
+        """Send the request to the routed client; ``excluded()`` is time not spent on the model."""
+        decision = self.router.route(prompt, history)
+        note_model(decision.model)
+        started = time.perf_counter()
+        try:
+            return await call(self._clients[decision.tier])
+        except Exception as ex:  # noqa: BLE001 - logged, then raised to the caller
+            decision.error = str(ex)
+            raise
+        finally:
+            decision.latency = max(0.0, time.perf_counter() - started - excluded())
+            self._record(decision)
+
+    def _record(self, decision: RouteDecision) -> None:
+        self._decisions.append(decision)
+        self._metrics.incr(f"llm.route.{decision.tier}")
+        self._metrics.observe(f"llm.route.{decision.tier}_seconds", decision.latency or 0.0)
+        if self._log_path:
+            try:
+                with open(self._log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(decision)) + "\n")
+            except OSError:
+                pass  # the log is best effort; never fail a request on it
+
+
+class RoutingToolClient(RoutingClient):
+    """Routes tool-calling requests too."""
+
+    async def complete_with_tools(
+        self,
+        prompt: str,
+        system_prompt: str,
+        history: List[Dict[str, Any]],
+        tools: Sequence[ToolDefinition],
+        run_tools: ToolRunner,
+    ) -> str:
+        tool_time = 0.0  # running tools, including any confirmation prompt
+
+        async def timed_tools(batch: Sequence[ToolCall]) -> List[str]:
+            nonlocal tool_time
+            started = time.perf_counter()
+            try:
+                return await run_tools(batch)
+            finally:
+                tool_time += time.perf_counter() - started
+
+        return await self._route(
+            prompt,
+            len(history),
+            lambda client: client.complete_with_tools(prompt, system_prompt, history, tools, timed_tools),
+            lambda: tool_time,
+        )
@@ -0,0 +1,100 @@
+"""Token usage reported by the providers, attributed to the current task."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+
+@dataclass
+class Usage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cached_tokens: int = 0  # prompt tokens the provider served from its prompt cache
+    requests: int = 0
+    model: str = ""  # set by clients that choose the model per request
+    profile: str = ""  # the generation profile of the last request
+
+    def add(
+        self, prompt_tokens: int, completion_tokens: int, total_tokens: Optional[int] = None, cached_tokens: int = 0
+    ) -> None:
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.total_tokens += total_tokens if total_tokens is not None else prompt_tokens + completion_tokens
+        self.cached_tokens += cached_tokens
+        self.requests += 1
+
+    def merge(self, counts: Mapping[str, int]) -> None:
+        """Add the totals of another ``as_dict()``."""
+        self.prompt_tokens += counts.get("prompt_tokens", 0)
+        self.completion_tokens += counts.get("completion_tokens", 0)
+        self.total_tokens += counts.get("total_tokens", 0)
+        self.cached_tokens += counts.get("cached_tokens", 0)
+        self.requests += counts.get("requests", 0)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "cached_tokens": self.cached_tokens,
+            "requests": self.requests,
+        }
+
+
+# Context variables follow asyncio tasks and asyncio.to_thread, so
+# concurrent questions sharing one client each see their own usage.
+_current: ContextVar[Optional[Usage]] = ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[Usage]:
+    """Collect the usage of every request made inside the block.
+
+    Usage collected by a nested block also counts towards the enclosing one.
+    """
+    usage = Usage()
+    token = _current.set(usage)
+    try:
+        yield usage
+    finally:
+        _current.reset(token)
+        merge_usage(usage.as_dict())
+        if usage.model:
+            note_model(usage.model)
+        if usage.profile:
+            note_profile(usage.profile)
+
+
+def record_usage(prompt_tokens: Any, completion_tokens: Any, total_tokens: Any = None, cached_tokens: Any = None) -> None:
+    """Called by clients after each request; a no-op outside ``track_usage``."""
+    usage = _current.get()
+    if usage is None:
+        return
+    usage.add(_count(prompt_tokens), _count(completion_tokens), _count(total_tokens) or None, _count(cached_tokens))
+
+
+def merge_usage(counts: Mapping[str, int]) -> None:
+    """Add whole ``Usage.as_dict()`` totals, e.g. replayed ones; a no-op outside ``track_usage``."""
+    usage = _current.get()
+    if usage is not None:
+        usage.merge(counts)
+
+
+def note_model(model: str) -> None:
+    """Record which model served the current request; a no-op outside ``track_usage``."""
+    usage = _current.get()
+    if usage is not None:
+        usage.model = model
+
+
+def note_profile(profile: str) -> None:
+    """Record the generation profile of the current request; a no-op outside ``track_usage``."""
+    usage = _current.get()
+    if usage is not None:
+        usage.profile = profile
+
+
+def _count(value: Any) -> int:
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
@@ -0,0 +1,148 @@
+"""Background connection warm-up for LLM clients."""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Optional
+from ..core.metrics import Metrics, metrics as default_metrics
+
+DEFAULT_REFRESH_AFTER = 30.0
+# Stop refreshing once the user has been away this long; the next
+# question then pays for one reconnect instead of us pinging all night.
+DEFAULT_GIVE_UP_AFTER = 600.0
+
+_TRACKED = ("complete", "complete_with_history", "complete_with_tools")
+
+
+class ConnectionWarmer:
+    """Warms a client's connection at start-up and keeps it open while idle.
+
+    ``start`` sends two ``warm_up`` requests in the background: the first
+    pays for DNS, TCP and TLS, the second measures a request on the open
+    connection, and the difference is the set-up cost a real request will
+    not pay. After ``refresh_after`` idle seconds the connection is
+    refreshed with another ``warm_up``. Requests made through ``client``
+    record that saving as ``llm.warmup.saved_seconds``.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        refresh_after: float = DEFAULT_REFRESH_AFTER,
+        give_up_after: float = DEFAULT_GIVE_UP_AFTER,
+        metrics: Optional[Metrics] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._warm_up = getattr(client, "warm_up", None)
+        self._refresh_after = refresh_after
+        self._give_up_after = give_up_after
+        self._metrics = metrics or default_metrics
+        self._clock = clock
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._last_active = clock()  # end of the last real request
+        self._last_ping = self._last_active
+        self._busy = 0
+        self._setup_cost: Optional[float] = None  # measured handshake cost
+        self._warm = False  # the connection is open and nobody has used it yet
+        self._failed = False
+        self.client = _TrackedClient(client, self)
+
+    @classmethod
+    def from_env(cls, client: Any) -> Optional["ConnectionWarmer"]:
+        """None when ``LLM_WARMUP=0``; ``LLM_KEEPALIVE_SECONDS`` sets the refresh interval."""
+        if os.getenv("LLM_WARMUP", "1").strip().lower() in ("0", "false", "off", "no"):
+            return None
+        return cls(client, refresh_after=float(os.getenv("LLM_KEEPALIVE_SECONDS", DEFAULT_REFRESH_AFTER)))
+
+    def start(self) -> bool:
+        """Begin warming in the background; False if the client cannot be warmed."""
+        if self._warm_up is None or self._failed:
+            return False
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return True
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):  # noqa: BLE001
+                pass
+            self._task = None
+
+    def request_started(self) -> None:
+        self._busy += 1
+        if self._warm and self._setup_cost is not None:
+            self._metrics.observe("llm.warmup.saved_seconds", self._setup_cost)
+        elif self._task is not None and not self._task.done() and self._setup_cost is None:
+            self._metrics.incr("llm.warmup.late")  # asked before the first warm-up finished
+        self._warm = False
+
+    def request_finished(self) -> None:
+        self._busy -= 1
+        self._last_active = self._clock()
+        self.start()  # resume refreshing if we had given up
+
+    async def _run(self) -> None:
+        if self._setup_cost is None and not await self._measure():
+            return
+        while True:
+            now = self._clock()
+            idle = now - self._last_active
+            quiet = now - max(self._last_active, self._last_ping)
+            if self._busy:
+                await asyncio.sleep(self._refresh_after)
+            elif idle >= self._give_up_after:
+                self._warm = False
+                return
+            elif quiet >= self._refresh_after:
+                if await self._ping("llm.warmup.refresh_seconds") is None:
+                    return
+                self._warm = True
+            else:
+                await asyncio.sleep(self._refresh_after - quiet)
+
+    async def _measure(self) -> bool:
+        cold = await self._ping("llm.warmup.cold_seconds")
+        warm = await self._ping("llm.warmup.warm_seconds") if cold is not None else None
+        if cold is None or warm is None:
+            self._failed = True  # e.g. no permission for the probe; do not keep retrying
+            return False
+        self._setup_cost = max(0.0, cold - warm)
+        self._warm = True
+        return True
+
+    async def _ping(self, metric: str) -> Optional[float]:
+        start = self._clock()
+        try:
+            await self._warm_up()
+        except Exception:  # noqa: BLE001 - best effort; the real request reports errors
+            self._metrics.incr("llm.warmup.failed")
+            return None
+        self._last_ping = self._clock()
+        elapsed = self._last_ping - start
+        self._metrics.observe(metric, elapsed)
+        return elapsed
+
+
+class _TrackedClient:
+    """Passes everything through to the client, telling the warmer when requests run."""
+
+    def __init__(self, inner: Any, warmer: ConnectionWarmer) -> None:
+        self._inner = inner
+        self._warmer = warmer
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._inner, name)
+        if name not in _TRACKED:
+            return attr
+
+        async def tracked(*args: Any, **kwargs: Any) -> Any:
+            self._warmer.request_started()
+            try:
+                return await attr(*args, **kwargs)
+            finally:
+                self._warmer.request_finished()
+
+        return tracked
@@ -0,0 +1,227 @@
+"""Minimal asyncio HTTP/1.1 client with a keep-alive connection pool."""
+
+import asyncio
+import json
+import ssl
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+_MAX_HEADER_BYTES = 64 * 1024
+
+PoolKey = Tuple[str, str, int]
+
+
+class HttpError(Exception):
+    """Raised for transport failures, timeouts, oversized or non-2xx responses."""
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+@dataclass
+class _Connection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    last_used: float = field(default_factory=time.monotonic)
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:  # noqa: BLE001
+            pass
+
+
+class HttpClient:
+    """GET-only HTTP client that reuses TLS connections across requests.
+
+    Idle connections are kept per ``(scheme, host, port)`` for
+    ``idle_timeout`` seconds. Every request is bounded by ``timeout``
+    (connect, send and receive together) and responses larger than
+    ``max_body`` bytes are rejected.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_body: int = 256 * 1024,
+        max_idle_per_host: int = 4,
+        idle_timeout: float = 30.0,
+        user_agent: str = "ai-assistant",
+    ) -> None:
+        self._timeout = timeout
+        self._max_body = max_body
+        self._max_idle = max_idle_per_host
+        self._idle_timeout = idle_timeout
+        self._user_agent = user_agent
+        self._idle: Dict[PoolKey, List[_Connection]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ssl: Optional[ssl.SSLContext] = None
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """Fetch ``url``; raise HttpError unless the status is 2xx."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise HttpError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        request = self._build_request(target, host, headers or {})
+
+        try:
+            response = await asyncio.wait_for(self._exchange(key, request), self._timeout)
+        except asyncio.TimeoutError:
+            raise HttpError(f"Timed out after {self._timeout:g}s: {url}") from None
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as ex:
+            raise HttpError(f"Request failed: {url}: {ex}") from ex
+        if not 200 <= response.status < 300:
+            raise HttpError(f"HTTP {response.status} from {url}")
+        return response
+
+    async def close(self) -> None:
+        for conns in self._idle.values():
+            for conn in conns:
+                conn.close()
+        self._idle.clear()
+
+    def idle_connections(self) -> int:
+        return sum(len(conns) for conns in self._idle.values())
+
+    def _build_request(self, target: str, host: str, headers: Dict[str, str]) -> bytes:
+        lines = [
+            f"GET {target} HTTP/1.1",
+            f"Host: {host}",
+            f"User-Agent: {self._user_agent}",
+            "Accept: */*",
+            "Accept-Encoding: identity",
+            "Connection: keep-alive",
+        ]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _exchange(self, key: PoolKey, request: bytes) -> HttpResponse:
+        conn = self._checkout(key)
+        if conn is not None:
+            try:
+                return await self._send(key, conn, request)
+            except (OSError, asyncio.IncompleteReadError):
+                conn.close()  # the server dropped the idle connection; retry on a fresh one
+        conn = await self._connect(key)
+        return await self._send(key, conn, request)
+
+    async def _send(self, key: PoolKey, conn: _Connection, request: bytes) -> HttpResponse:
+        try:
+            conn.writer.write(request)
+            await conn.writer.drain()
+            response, reusable = await self._read_response(conn.reader)
+        except BaseException:
+            conn.close()
+            raise
+        if reusable:
+            self._checkin(key, conn)
+        else:
+            conn.close()
+        return response
+
+    async def _read_response(self, reader: asyncio.StreamReader) -> Tuple[HttpResponse, bool]:
+        head = await reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        version, status, *_ = status_line.split(" ", 2)
+        headers: Dict[str, str] = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if int(status) in (204, 304):
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            self._check_size(length)
+            body = await reader.readexactly(length)
+        else:
+            body = bytearray()
+            while chunk := await reader.read(64 * 1024):
+                body += chunk
+                self._check_size(len(body))
+            body = bytes(body)
+            keep_alive = False
+        return HttpResponse(int(status), headers, body), keep_alive
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        chunks = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Skip trailers up to the terminating blank line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return bytes(chunks)
+            self._check_size(len(chunks) + size)
+            chunks += await reader.readexactly(size)
+            await reader.readexactly(2)
+
+    def _check_size(self, size: int) -> None:
+        if size > self._max_body:
+            raise ValueError(f"response larger than {self._max_body} bytes")
+
+    def _checkout(self, key: PoolKey) -> Optional[_Connection]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Streams are bound to the loop that opened them
+            self._idle.clear()
+            self._loop = loop
+        conns = self._idle.get(key, [])
+        now = time.monotonic()
+        while conns:
+            conn = conns.pop()
+            if now - conn.last_used < self._idle_timeout and not conn.reader.at_eof():
+                return conn
+            conn.close()
+        return None
+
+    def _checkin(self, key: PoolKey, conn: _Connection) -> None:
+        conns = self._idle.setdefault(key, [])
+        if len(conns) >= self._max_idle:
+            conn.close()
+            return
+        conn.last_used = time.monotonic()
+        conns.append(conn)
+
+    async def _connect(self, key: PoolKey) -> _Connection:
+        scheme, host, port = key
+        context = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=context, server_hostname=host if context else None, limit=_MAX_HEADER_BYTES
+        )
+        return _Connection(reader, writer)
+
+
+_shared: Optional[HttpClient] = None
+
+
+def shared_client() -> HttpClient:
+    """Return the process-wide client so intents share one connection pool."""
+    global _shared
+    if _shared is None:
+        _shared = HttpClient()
+    return _shared
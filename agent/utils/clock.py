@@ -0,0 +1,29 @@
+"""Clock utilities."""
+
+import os
+import warnings
+from datetime import datetime, tzinfo
+from typing import Optional
+
+
+def local_zone(name: Optional[str] = None) -> Optional[tzinfo]:
+    """Resolve an IANA zone name (or ``INTENT_TIMEZONE``); None means the system zone.
+
+    An unknown or malformed name falls back to the system zone with a warning.
+    """
+    name = name or os.getenv("INTENT_TIMEZONE")
+    if not name:
+        return None
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        warnings.warn(f"Unknown time zone {name!r} (INTENT_TIMEZONE); using the system zone", stacklevel=2)
+        return None
+
+
+def now(zone: Optional[tzinfo] = None) -> datetime:
+    """Return the current time as a timezone-aware datetime."""
+    if zone is not None:
+        return datetime.now(zone)
+    return datetime.now().astimezone()
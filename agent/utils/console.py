@@ -0,0 +1,98 @@
+"""Reading stdin lines without blocking the event loop."""
+
+import asyncio
+import builtins
+import queue
+import signal
+import sys
+import threading
+from typing import Any, Optional, Tuple
+
+
+class LineReader:
+    """Runs ``input()`` on a daemon thread and hands each line to the awaiting coroutine.
+
+    Other tasks keep running while the user types. Ctrl-C raises
+    KeyboardInterrupt from ``readline`` as it would from ``input()``; the
+    thread's read cannot be cancelled, so it stays pending and the next
+    ``readline`` call receives that line instead of starting a new read.
+    """
+
+    def __init__(self) -> None:
+        self._requests: "queue.SimpleQueue[Tuple[str, asyncio.AbstractEventLoop, asyncio.Future[str]]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Optional["asyncio.Future[str]"] = None
+
+    async def readline(self, prompt: str = "") -> str:
+        """Print ``prompt`` and return the next line; raise EOFError at end of input."""
+        loop = asyncio.get_running_loop()
+        if self._pending is not None and self._pending.get_loop() is loop and not self._pending.done():
+            sys.stdout.write(prompt)  # a read is already waiting for this line
+            sys.stdout.flush()
+        else:
+            self._pending = loop.create_future()
+            self._start()
+            self._requests.put((prompt, loop, self._pending))
+        pending = self._pending
+        interrupted = loop.create_future()
+        with _on_sigint(loop, lambda: interrupted.done() or interrupted.set_result(None)):
+            await asyncio.wait((pending, interrupted), return_when=asyncio.FIRST_COMPLETED)
+        if not pending.done():
+            raise KeyboardInterrupt
+        self._pending = None
+        return pending.result()
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._serve, name="stdin-reader", daemon=True)
+            self._thread.start()
+
+    def _serve(self) -> None:
+        while True:
+            prompt, loop, future = self._requests.get()
+            try:
+                result: Any = builtins.input(prompt)
+                deliver = future.set_result
+            except BaseException as exc:  # noqa: BLE001 - EOFError and Ctrl-C go to the reader
+                result, deliver = exc, future.set_exception
+            try:
+                loop.call_soon_threadsafe(_settle, future, deliver, result)
+            except RuntimeError:
+                pass  # the loop has closed; nobody is waiting any more
+
+
+class _on_sigint:
+    """Route SIGINT to ``callback`` on ``loop`` while in the block (where the loop allows it)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Any) -> None:
+        self._loop = loop
+        self._callback = callback
+        self._previous: Any = None
+        self._installed = False
+
+    def __enter__(self) -> None:
+        self._previous = signal.getsignal(signal.SIGINT)
+        try:
+            self._loop.add_signal_handler(signal.SIGINT, self._callback)
+            self._installed = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass  # Windows or not the main thread: Ctrl-C interrupts the loop itself
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._installed:
+            self._loop.remove_signal_handler(signal.SIGINT)
+            signal.signal(signal.SIGINT, self._previous)
+
+
+def _settle(future: "asyncio.Future[str]", deliver: Any, result: Any) -> None:
+    if not future.done():
+        deliver(result)
+
+
+# stdin is one stream, so the REPL and confirmations share one reader.
+stdin_reader = LineReader()
+
+
+async def ainput(prompt: str = "") -> str:
+    """Asyncio counterpart of ``input()``."""
+    return await stdin_reader.readline(prompt)
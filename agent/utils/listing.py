@@ -0,0 +1,124 @@
+"""Streaming directory listing built on os.scandir."""
+
+import fnmatch
+import heapq
+import os
+import stat
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class ListingOptions:
+    """What to list and how much of it to print."""
+    show_hidden: bool = False
+    pattern: Optional[str] = None  # glob, matched case-insensitively
+    sort: str = "name"  # "name", "size", "mtime" or "none" (directory order, streamed)
+    reverse: bool = False
+    page: int = 1
+    page_size: Optional[int] = 200  # cap on printed rows; None prints everything
+
+
+class DirectoryLister:
+    """List a directory as a stream of ``ls -l`` style rows.
+
+    Unsorted listings print rows as ``os.scandir`` yields them, and sorted
+    listings keep only the ``page * page_size`` best entries in a heap. The
+    remaining entries are counted, not stored, so memory stays bounded on
+    huge directories unless the page size is lifted.
+    """
+
+    def __init__(self, path: str = ".") -> None:
+        self._path = path
+
+    def iter_lines(self, options: ListingOptions) -> Iterator[str]:
+        """Yield one row per listed entry followed by a summary footer."""
+        total = 0
+        skipped = 0
+
+        def candidates() -> Iterator[os.DirEntry]:
+            nonlocal total, skipped
+            with os.scandir(self._path) as it:
+                for entry in it:
+                    if not options.show_hidden and entry.name.startswith("."):
+                        skipped += 1
+                        continue
+                    if options.pattern and not fnmatch.fnmatch(entry.name.lower(), options.pattern.lower()):
+                        skipped += 1
+                        continue
+                    total += 1
+                    yield entry
+
+        start = (max(options.page, 1) - 1) * (options.page_size or 0)
+        stop = None if options.page_size is None else start + options.page_size
+
+        if options.sort == "none":
+            rows: Iterable[os.DirEntry] = candidates()
+        else:
+            rows = self._best(candidates(), options, stop)
+
+        shown = 0
+        for i, entry in enumerate(rows):
+            if stop is not None and i >= stop:
+                continue  # keep draining so the footer count is complete
+            if i >= start:
+                shown += 1
+                yield self._format(entry)
+
+        yield self._footer(options, start, shown, total, skipped)
+
+    @staticmethod
+    def _best(entries: Iterator[os.DirEntry], options: ListingOptions, stop: Optional[int]) -> List[os.DirEntry]:
+        def key(entry: os.DirEntry) -> Tuple:
+            if options.sort in ("size", "mtime"):
+                try:
+                    st = _lstat(entry)
+                except OSError:  # vanished since scandir listed it
+                    return (0, entry.name)
+                return (st.st_size if options.sort == "size" else st.st_mtime, entry.name)
+            return (entry.name.lower(), entry.name)
+
+        if stop is None:
+            return sorted(entries, key=key, reverse=options.reverse)
+        pick = heapq.nlargest if options.reverse else heapq.nsmallest
+        return pick(stop, entries, key=key)
+
+    @staticmethod
+    def _format(entry: os.DirEntry) -> str:
+        try:
+            st = _lstat(entry)
+        except OSError:
+            return f"{'?' * 10} {'?':>12} {'?':<16} {entry.name}"
+        mtime = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")
+        name = entry.name
+        if stat.S_ISDIR(st.st_mode):
+            name += "/"
+        elif stat.S_ISLNK(st.st_mode):
+            try:
+                name += f" -> {os.readlink(entry.path)}"
+            except OSError:
+                pass
+        return f"{stat.filemode(st.st_mode)} {st.st_size:>12} {mtime} {name}"
+
+    @staticmethod
+    def _footer(options: ListingOptions, start: int, shown: int, total: int, skipped: int) -> str:
+        page = max(options.page, 1)  # as iter_lines reads it
+        if shown:
+            summary = f"-- entries {start + 1}-{start + shown} of {total}"
+        else:
+            summary = f"-- no entries on page {page} ({total} total)"
+        details = []
+        if options.pattern:
+            details.append(f"matching '{options.pattern}'")
+        if skipped:
+            details.append(f"{skipped} hidden or filtered")
+        if details:
+            summary += f" ({', '.join(details)})"
+        if start + shown < total:
+            summary += f"; ask for page {page + 1} to see more"
+        return summary
+
+
+def _lstat(entry: os.DirEntry) -> os.stat_result:
+    """Stat without following symlinks; DirEntry caches the result."""
+    return entry.stat(follow_symlinks=False)
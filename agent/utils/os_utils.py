@@ -1,7 +1,19 @@
 """Operating system utilities."""
 
 import platform
+import re
 import shlex
+from typing import List, Optional
+
+# Anything the shell would expand or interpret: pipes, redirects, lists,
+# subshells, variables, command substitution, escapes, globs, ~, comments.
+_SHELL_SYNTAX = re.compile(r"[|&;<>()$`\\*?\[\]{}~#!\n\r]")
+# Words that only mean something inside a shell (or change its state).
+_SHELL_ONLY = frozenset({
+    ".", ":", "alias", "bg", "break", "cd", "command", "continue", "eval", "exec", "exit", "export",
+    "fg", "getopts", "hash", "jobs", "local", "read", "readonly", "return", "set", "shift", "source",
+    "times", "trap", "type", "ulimit", "umask", "unalias", "unset", "wait",
+})
 
 
 class OS:
@@ -32,3 +44,27 @@ class OS:
             # On Unix-like systems, use sh
             return ["sh", "-c", command]
 
+    @staticmethod
+    def direct_args(command: str) -> Optional[List[str]]:
+        """Return argv for running ``command`` without a shell, or None if it needs one.
+
+        Only plain POSIX commands qualify: words and quoted strings with no
+        shell syntax, no leading ``VAR=value`` assignment and no shell
+        builtin as the program.
+        """
+        if OS.is_windows():
+            return None
+        argv = simple_argv(command)
+        if not argv or "=" in argv[0] or argv[0] in _SHELL_ONLY:
+            return None
+        return argv
+
+
+def simple_argv(command: str) -> Optional[List[str]]:
+    """Split ``command`` into words, or return None if it uses any shell syntax."""
+    if _SHELL_SYNTAX.search(command):
+        return None
+    try:
+        return shlex.split(command)
+    except ValueError:
+        return None
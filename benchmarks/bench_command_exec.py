@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Commands/sec: `sh -c` per command vs. direct exec vs. a pool of persistent shells.
+
+Usage:
+    python benchmarks/bench_command_exec.py [--runs 200] [--concurrency 1]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.commands.runner import SubprocessRunner  # noqa: E402
+from agent.commands.shell_pool import ShellPoolRunner  # noqa: E402
+from agent.core.metrics import Metrics  # noqa: E402
+
+COMMANDS = ["date '+%Y-%m-%d'", "date '+%T'", "ls -l", "uname -s"]
+
+
+async def measure(runner, runs, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            code, _, _ = await runner.run(COMMANDS[i % len(COMMANDS)])
+            assert code == 0
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    return runs / (time.perf_counter() - start)
+
+
+async def main_async(args) -> None:
+    shell = SubprocessRunner(direct=False, metrics=Metrics())
+    direct = SubprocessRunner(direct=True, metrics=Metrics())
+    pool = ShellPoolRunner(size=max(2, args.concurrency), metrics=Metrics())
+    await measure(direct, 10, 1)  # warm up page cache
+    print(f"{args.runs} runs of {COMMANDS}, concurrency {args.concurrency}")
+    before = await measure(shell, args.runs, args.concurrency)
+    after = await measure(direct, args.runs, args.concurrency)
+    pooled = await measure(pool, args.runs, args.concurrency)
+    await pool.close()
+    print(f"  sh -c      : {before:8.1f} commands/s")
+    print(f"  direct exec: {after:8.1f} commands/s  ({after / before:.2f}x)")
+    print(f"  shell pool : {pooled:8.1f} commands/s  ({pooled / before:.2f}x)")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=1)
+    args = ap.parse_args()
+    if sys.platform == "win32":
+        print("The direct exec path and the shell pool are POSIX-only.")
+        return 1
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
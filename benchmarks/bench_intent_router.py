@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: sequential intent scan vs. the single-pass router and the chain.
+
+"chain" is IntentChain matching as the assistant runs it on every prompt,
+including compound-prompt splitting; "typical" rows use a short question
+with no intent, the common case.
+
+Usage:
+    python benchmarks/bench_intent_router.py [--length 4000] [--rounds 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.intents.chain import IntentChain  # noqa: E402
+from agent.intents.router import IntentRouter  # noqa: E402
+from agent.intents.weather import WeatherHandler  # noqa: E402
+from agent.intents.public_ip import PublicIpHandler  # noqa: E402
+from agent.intents.date_time import DateTimeHandler  # noqa: E402
+from agent.intents.time_only import TimeHandler  # noqa: E402
+from agent.intents.date_only import DateHandler  # noqa: E402
+from agent.intents.list_files import ListFilesHandler  # noqa: E402
+
+
+def sequential(handlers, text):
+    for h in handlers:
+        if h.matches(text):
+            return h
+    return None
+
+
+def measure(fn, prompts, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for p in prompts:
+            fn(p)
+    elapsed = time.perf_counter() - start
+    return rounds * len(prompts) / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--length", type=int, default=4000, help="approximate prompt length in chars")
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    handlers = [WeatherHandler(), PublicIpHandler(), DateTimeHandler(), TimeHandler(), DateHandler(), ListFilesHandler()]
+    sentence = "Please explain how a compiler turns source code into machine instructions. "
+    filler = (sentence * (args.length // len(sentence) + 1))[: args.length]
+    prompts = [
+        filler,                                 # no intent: the common case
+        filler + " what's the weather in Paris",  # intent past the scan cap
+        "what's the weather in Paris " + filler,  # intent up front
+    ]
+
+    typical = ["How do I make my Python tests run faster when the suite has grown to a few thousand slow cases?"]
+
+    capped = IntentRouter(handlers)
+    uncapped = IntentRouter(handlers, max_scan_chars=None)
+    chain = IntentChain(handlers)
+
+    print(f"{len(prompts)} prompts of ~{args.length} chars, {args.rounds} rounds")
+    for name, fn in (
+        ("sequential matches()", lambda p: sequential(handlers, p)),
+        ("router (no cap)", uncapped.route),
+        ("router (capped)", capped.route),
+        ("chain", chain.match),
+    ):
+        print(f"  {name:<22} {measure(fn, prompts, args.rounds):>12,.0f} prompts/s")
+    rounds = args.rounds * 20
+    print(f"typical prompt ({len(typical[0])} chars), {rounds} rounds")
+    for name, fn in (
+        ("sequential matches()", lambda p: sequential(handlers, p)),
+        ("router", capped.route),
+        ("chain", chain.match),
+    ):
+        rate = measure(fn, typical, rounds)
+        print(f"  {name:<22} {rate:>12,.0f} prompts/s  {1e6 / rate:8.1f} us/prompt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Latency/CPU per lookup: `sh -c curl` subprocess vs. the pooled HttpClient.
+
+Runs against a local stand-in server so no traffic leaves the machine; TLS
+handshakes, which pooling also saves against real hosts, are not included.
+
+Usage:
+    python benchmarks/bench_network_intents.py [--requests 200]
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.net.http_client import HttpClient  # noqa: E402
+
+BODY = b"Paris|Partly cloudy|+12\xc2\xb0C|+10\xc2\xb0C|\xe2\x86\x9715km/h|70%|0.0mm"
+
+
+async def serve(reader, writer):
+    try:
+        while True:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(BODY), BODY))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def cpu_seconds():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + kids.ru_utime + kids.ru_stime
+
+
+async def run_curl(url):
+    proc = await asyncio.create_subprocess_exec(
+        "sh", "-c", f"curl -s {url}", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    await proc.communicate()
+
+
+async def bench(name, fetch, n):
+    cpu0, t0 = cpu_seconds(), time.perf_counter()
+    for _ in range(n):
+        await fetch()
+    wall, cpu = time.perf_counter() - t0, cpu_seconds() - cpu0
+    print(f"  {name:<18} {wall / n * 1e3:8.3f} ms/lookup  {cpu / n * 1e3:8.3f} ms CPU/lookup")
+
+
+async def main_async(n):
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/Paris"
+    client = HttpClient()
+    print(f"{n} sequential lookups against {url}")
+    await bench("sh -c curl", lambda: run_curl(url), n)
+    await bench("pooled HttpClient", lambda: client.get(url), n)
+    await client.close()
+    await asyncio.sleep(0.05)  # let the server see EOF before the loop closes
+    server.close()
+    await server.wait_closed()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.requests))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
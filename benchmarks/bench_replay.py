@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Replay recorded sessions through AssistantService at a given concurrency.
+
+Record a cassette by running the assistant with LLM_RECORD=path, then
+replay it here: every recorded session runs its prompts in order against
+a ReplayClient, with sessions running side by side. Latency is each
+turn's total; overhead is that total minus the recorded (scaled) model
+time, i.e. what the assistant itself added.
+
+Usage:
+    python benchmarks/bench_replay.py CASSETTE [--concurrency 8] [--scale 1.0] [--repeat 1]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.config.params import AiParameters  # noqa: E402
+from agent.core.assistant import AssistantService  # noqa: E402
+from agent.core.history import HistoryManager  # noqa: E402
+from agent.llm.cassette import ReplayClient, load  # noqa: E402
+
+
+def sessions_of(interactions):
+    sessions = defaultdict(list)
+    for interaction in interactions:
+        sessions[interaction.session].append(interaction)
+    return [sorted(turns, key=lambda i: i.turn) for turns in sessions.values()]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def replay(session, commands, scale, results):
+    model = session[0].model or "replay"
+    params = AiParameters(agent="replay", model=model, provider="replay")
+    service = commands.fork(commands.confirmation, lambda _: None)
+    use_tools = any(i.method == "complete_with_tools" for i in session)
+    assistant = AssistantService(params, ReplayClient(session, scale), HistoryManager(), use_tools, service)
+    for interaction in session:
+        try:
+            await assistant.answer(interaction.prompt)
+        except Exception as ex:  # noqa: BLE001 - counted, the session goes on
+            assistant.last_turn.error = str(ex)
+        turn = assistant.last_turn
+        model_time = sum(interaction.latencies) * scale
+        results.append((turn.timings.get("total", 0.0), model_time, turn.usage, turn.error))
+
+
+async def main_async(args) -> None:
+    sessions = sessions_of(load(args.cassette)) * args.repeat
+    commands = AssistantService.create_command_service(interactive=False)
+    slots = asyncio.Semaphore(args.concurrency)
+    results = []
+
+    async def run(session):
+        async with slots:
+            await replay(session, commands, args.scale, results)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(session) for session in sessions))
+    elapsed = time.perf_counter() - start
+
+    latencies = [total for total, _, _, _ in results]
+    overheads = [max(0.0, total - model) for total, model, _, _ in results]
+    tokens = sum(usage["total_tokens"] for _, _, usage, _ in results if usage)
+    errors = sum(1 for *_, error in results if error)
+    print(f"{len(sessions)} sessions, {len(results)} turns, concurrency {args.concurrency}, scale {args.scale}")
+    print(f"  wall time : {elapsed:8.3f} s  ({len(results) / elapsed:.1f} turns/s)")
+    print(
+        f"  latency   : mean {sum(latencies) / max(1, len(latencies)) * 1000:8.1f} ms"
+        f"  p50 {percentile(latencies, 0.5) * 1000:8.1f}  p95 {percentile(latencies, 0.95) * 1000:8.1f}"
+        f"  max {max(latencies, default=0.0) * 1000:8.1f}"
+    )
+    print(
+        f"  overhead  : mean {sum(overheads) / max(1, len(overheads)) * 1000:8.1f} ms"
+        f"  p95 {percentile(overheads, 0.95) * 1000:8.1f}"
+    )
+    print(f"  tokens    : {tokens}")
+    print(f"  errors    : {errors}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("cassette")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--scale", type=float, default=1.0, help="multiply recorded latencies (0: no waiting)")
+    ap.add_argument("--repeat", type=int, default=1, help="replay every session this many times")
+    args = ap.parse_args()
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
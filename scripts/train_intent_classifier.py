@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Train the intent classifier from the labelled corpus and report its accuracy.
+
+Runs stratified k-fold cross-validation, prints per-intent precision and
+recall at the confidence threshold, how many prompts the regexes miss that
+the classifier recovers (LLM round trips saved) and the per-prompt latency,
+then trains on the whole corpus and writes the model JSON.
+
+Usage:
+    python scripts/train_intent_classifier.py [--folds 5] [--threshold 0.7] [--no-write]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.intents.classifier import MODEL_PATH, NO_INTENT, IntentClassifier, features, load_corpus  # noqa: E402
+from agent.intents.registry import BUILTIN_SPECS, IntentRegistry  # noqa: E402
+
+
+def train(rows, epochs=1000, lr=2.0, l2=1e-4, threshold=0.7, max_words=16, min_df=2):
+    """Fit a class-balanced softmax regression on TF-IDF features."""
+    labels = sorted({label for label, _ in rows})
+    docs = [Counter(features(text)) for _, text in rows]
+    df = Counter(f for doc in docs for f in doc)
+    # Keep every word/bigram feature; character trigrams only if they recur
+    vocab = sorted(f for f, n in df.items() if n >= min_df or not f.startswith("c:"))
+    index = {f: i for i, f in enumerate(vocab)}
+    idf = np.array([math.log((1 + len(docs)) / (1 + df[f])) + 1.0 for f in vocab])
+
+    x = np.zeros((len(docs), len(vocab)))
+    for row, doc in enumerate(docs):
+        for f, count in doc.items():
+            if f in index:
+                x[row, index[f]] = (1.0 + math.log(count)) * idf[index[f]]
+    x /= np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+
+    y = np.array([labels.index(label) for label, _ in rows])
+    onehot = np.eye(len(labels))[y]
+    class_weight = len(rows) / (len(labels) * np.bincount(y, minlength=len(labels)))
+    sample_weight = class_weight[y][:, None] / len(rows)
+
+    w = np.zeros((len(labels), len(vocab)))
+    b = np.zeros(len(labels))
+    m_w, v_w, m_b, v_b = (np.zeros_like(w), np.zeros_like(w), np.zeros_like(b), np.zeros_like(b))
+    for step in range(1, epochs + 1):
+        logits = x @ w.T + b
+        probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs /= probs.sum(axis=1, keepdims=True)
+        grad = (probs - onehot) * sample_weight
+        g_w = grad.T @ x + l2 * w
+        g_b = grad.sum(axis=0)
+        # Adam
+        for param, g, m, v in ((w, g_w, m_w, v_w), (b, g_b, m_b, v_b)):
+            m *= 0.9
+            m += 0.1 * g
+            v *= 0.999
+            v += 0.001 * g * g
+            param -= lr * 0.01 * (m / (1 - 0.9 ** step)) / (np.sqrt(v / (1 - 0.999 ** step)) + 1e-8)
+
+    return {
+        "labels": labels,
+        "threshold": threshold,
+        "max_words": max_words,
+        "features": vocab,
+        "idf": [round(float(v), 5) for v in idf],
+        "weights": [[round(float(v), 4) for v in row] for row in w],
+        "bias": [round(float(v), 4) for v in b],
+    }
+
+
+def folds(rows, k, seed=0):
+    """Yield (train, test) splits that keep each label's share roughly equal."""
+    rng = np.random.default_rng(seed)
+    by_label = defaultdict(list)
+    for i, (label, _) in enumerate(rows):
+        by_label[label].append(i)
+    assignment = {}
+    for ids in by_label.values():
+        for pos, i in enumerate(rng.permutation(ids)):
+            assignment[int(i)] = pos % k
+    for fold in range(k):
+        yield ([r for i, r in enumerate(rows) if assignment[i] != fold],
+               [r for i, r in enumerate(rows) if assignment[i] == fold])
+
+
+def report(rows, predictions, routed):
+    labels = sorted({label for label, _ in rows} - {NO_INTENT})
+    print(f"{'intent':<12} {'precision':>9} {'recall':>7} {'support':>8}")
+    for label in labels:
+        tp = sum(1 for (gold, _), p in zip(rows, predictions) if gold == label and p == label)
+        predicted = sum(1 for p in predictions if p == label)
+        support = sum(1 for gold, _ in rows if gold == label)
+        precision = tp / predicted if predicted else 0.0
+        print(f"{label:<12} {precision:>9.3f} {tp / support:>7.3f} {support:>8}")
+
+    intent_rows = [(gold, p) for (gold, _), p in zip(rows, predictions) if gold != NO_INTENT]
+    tp = sum(1 for gold, p in intent_rows if p == gold)
+    predicted = sum(1 for p in predictions if p is not None)
+    print(f"{'overall':<12} {tp / max(predicted, 1):>9.3f} {tp / len(intent_rows):>7.3f} {len(intent_rows):>8}")
+
+    missed = [(gold, p) for (gold, _), p, r in zip(rows, predictions, routed) if gold != NO_INTENT and r is None]
+    recovered = sum(1 for gold, p in missed if p == gold)
+    hijacked = sum(1 for (gold, _), p, r in zip(rows, predictions, routed) if gold == NO_INTENT and r is None and p)
+    none_total = sum(1 for gold, _ in rows if gold == NO_INTENT)
+    print(f"\nregexes miss {len(missed)} intent prompts; classifier recovers {recovered} "
+          f"({recovered / max(len(missed), 1):.0%}) -> LLM calls avoided")
+    print(f"LLM prompts wrongly claimed by the classifier: {hijacked}/{none_total}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--folds", type=int, default=5)
+    ap.add_argument("--threshold", type=float, default=0.7)
+    ap.add_argument("--epochs", type=int, default=1000)
+    ap.add_argument("--output", default=str(MODEL_PATH))
+    ap.add_argument("--no-write", action="store_true", help="evaluate only")
+    args = ap.parse_args()
+
+    rows = load_corpus()
+    router = IntentRegistry(BUILTIN_SPECS).chain()._router
+    routed = [router.route(text) for _, text in rows]
+
+    predictions = [None] * len(rows)
+    position = {id(r): i for i, r in enumerate(rows)}
+    for train_rows, test_rows in folds(rows, args.folds):
+        clf = IntentClassifier(train(train_rows, epochs=args.epochs, threshold=args.threshold))
+        for row in test_rows:
+            predictions[position[id(row)]] = clf.classify(row[1])
+    print(f"{args.folds}-fold cross-validation, {len(rows)} prompts, threshold {args.threshold}\n")
+    report(rows, predictions, routed)
+
+    model = train(rows, epochs=args.epochs, threshold=args.threshold)
+    clf = IntentClassifier(model)
+    start = time.perf_counter()
+    for _ in range(20):
+        for _, text in rows:
+            clf.classify(text)
+    per_prompt = (time.perf_counter() - start) / (20 * len(rows))
+    print(f"latency: {per_prompt * 1e6:.0f} us/prompt, {len(model['features'])} features")
+
+    if not args.no_write:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(model, f, separators=(",", ":"))
+        print(f"wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
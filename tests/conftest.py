@@ -87,3 +87,76 @@ def mock_history_manager():
     manager.get_conversation_history = Mock(return_value=[])
     manager.clear_current_conversation = Mock()
     return manager
+
+
+class LocalHttpServer:
+    """Stand-in HTTP/1.1 server for network tests.
+
+    ``routes`` maps a path to ``(status, body)`` or to a dict with ``status``,
+    ``body``, and optionally ``chunked``, ``close`` or ``delay`` (seconds).
+    Connections are kept alive between requests unless ``close`` is set.
+    """
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.connections = 0
+        self.requests = []
+        self._writers = set()
+        self._server = None
+        self.port = None
+
+    async def __aenter__(self):
+        import asyncio
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        for writer in list(self._writers):
+            writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    async def _serve(self, reader, writer):
+        import asyncio
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                target = head.split(b" ")[1].decode()
+                self.requests.append(target)
+                route = self.routes.get(target.split("?")[0], (404, b"not found"))
+                if isinstance(route, tuple):
+                    route = {"status": route[0], "body": route[1]}
+                if route.get("delay"):
+                    await asyncio.sleep(route["delay"])
+                body = route["body"]
+                headers = [f"HTTP/1.1 {route['status']} X"]
+                if route.get("close"):
+                    headers.append("Connection: close")
+                if route.get("chunked"):
+                    headers.append("Transfer-Encoding: chunked")
+                    payload = b"".join(b"%x\r\n%s\r\n" % (len(body[i:i + 4]), body[i:i + 4]) for i in range(0, len(body), 4))
+                    payload += b"0\r\n\r\n"
+                else:
+                    headers.append(f"Content-Length: {len(body)}")
+                    payload = body
+                writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + payload)
+                await writer.drain()
+                if route.get("close"):
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+@pytest.fixture
+def local_http_server():
+    """Return the LocalHttpServer class; use it as an async context manager."""
+    return LocalHttpServer
@@ -1,5 +1,6 @@
 """Unit tests for CLI Application class."""
 
+import json
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from agent.cli.application import Application
@@ -7,6 +8,7 @@ from agent.cli.args import ArgParser
 from agent.config.provider import EnvConfigProvider
 from agent.core.assistant import AssistantService
 from agent.core.history import HistoryManager
+from agent.core.turn import TurnInfo
 
 
 class TestApplication:
@@ -72,6 +74,22 @@ class TestApplication:
             
             mock_print.assert_called_with("No answer.")
 
+    @pytest.mark.asyncio
+    async def test_process_query_jsonl(self):
+        """Test that JSON output prints one record per turn, errors included."""
+        mock_assistant = Mock(spec=AssistantService)
+        mock_assistant.last_turn = TurnInfo("Test question", "stub", "m")
+        mock_assistant.answer = AsyncMock(side_effect=Exception("boom"))
+
+        with patch('builtins.print') as mock_print:
+            await self.app.process_query("Test question", mock_assistant, "jsonl")
+
+        (line,), _ = mock_print.call_args
+        record = json.loads(line)
+        assert "\n" not in line
+        assert record["prompt"] == "Test question"
+        assert record["error"] == "boom"
+
 
     def test_handle_history_command_clear(self):
         """Test history command handling for clear."""
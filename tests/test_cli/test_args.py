@@ -32,6 +32,17 @@ class TestArgParser:
         assert agent == "openai"
         assert model is None
 
+    def test_extract_option(self):
+        """Test removing a --name value option from argv."""
+        assert ArgParser.extract_option(["--jobs", "8", "-"], "jobs") == ("8", ["-"])
+        assert ArgParser.extract_option(["--JOBS=2", "--agent=x", "-"], "jobs") == ("2", ["--agent=x", "-"])
+        assert ArgParser.extract_option(["hello"], "jobs") == (None, ["hello"])
+
+    def test_extract_flag(self):
+        """Test removing a --name flag from argv."""
+        assert ArgParser.extract_flag(["--profile", "hi"], "profile") == (True, ["hi"])
+        assert ArgParser.extract_flag(["hi"], "profile") == (False, ["hi"])
+
     def test_parse_with_model_override(self):
         """Test parsing with model override."""
         question, agent, model = self.parser.parse(["--model=gpt-4", "Help me"])
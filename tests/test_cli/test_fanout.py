@@ -0,0 +1,44 @@
+"""Tests for asking several agents and models at once."""
+
+import asyncio
+import pytest
+from agent.cli.fanout import combinations, fan_out, format_row
+from agent.core.turn import TurnInfo
+
+
+class TestFanOut:
+    """Test cases for fan-out helpers."""
+
+    def test_combinations_skip_other_providers_models(self):
+        providers = {"openai": "openai", "gemini": "gemini", "other": "stub"}.get
+        pairs = combinations(["openai", "gemini"], ["gpt-4o-mini", "gemini-2.5-flash", "custom"], providers)
+        assert pairs == [
+            ("openai", "gpt-4o-mini"),
+            ("openai", "custom"),
+            ("gemini", "gemini-2.5-flash"),
+            ("gemini", "custom"),
+        ]
+        assert combinations(["other"], ["gpt-4o"], providers) == [("other", "gpt-4o")]
+        assert combinations(["openai"], [None], providers) == [("openai", None)]
+
+    @pytest.mark.asyncio
+    async def test_results_are_written_as_they_finish(self):
+        def run(name, delay):
+            async def go():
+                await asyncio.sleep(delay)
+                return TurnInfo("q", model=name)
+            return go
+
+        written = []
+        turns = await fan_out([run("slow", 0.05), run("fast", 0)], lambda t: written.append(t.model))
+        assert written == ["fast", "slow"]
+        assert [t.model for t in turns] == written
+
+    def test_format_row(self):
+        turn = TurnInfo("q", "openai", "gpt-4o-mini", "line 1\nline 2", usage={"total_tokens": 42}, cost=0.0000123)
+        turn.timings["total"] = 1.5
+        header, *body = format_row(turn).splitlines()
+        assert header.split() == ["openai/gpt-4o-mini", "1.50s", "42", "$0.000012"]
+        assert body == ["    line 1", "    line 2"]
+        failed = TurnInfo("q", "gemini", "m", error="quota")
+        assert format_row(failed).splitlines()[1] == "    error: quota"
@@ -58,6 +58,7 @@ class TestCLIIntegration:
                 with patch('agent.cli.application.AssistantService') as mock_assistant_class:
                     mock_assistant = Mock()
                     mock_assistant_class.return_value = mock_assistant
+                    mock_assistant.close = AsyncMock()
                     mock_assistant.answer = AsyncMock(return_value="Test answer")
                     
                     with patch('builtins.print') as mock_print:
@@ -68,6 +69,7 @@ class TestCLIIntegration:
                         self.mock_arg_parser.parse.assert_called_once_with(["Test question"])
                         mock_factory.create.assert_called_once_with(mock_params)
                         mock_assistant.answer.assert_called_once_with("Test question")
+                        mock_assistant.close.assert_awaited_once()
                         
                         # Verify output
                         mock_print.assert_any_call("Agent: test-agent | Provider: stub | Model: test-model")
@@ -102,6 +104,7 @@ class TestCLIIntegration:
                     with patch('agent.cli.application.AssistantService') as mock_assistant_class:
                         mock_assistant = Mock()
                         mock_assistant_class.return_value = mock_assistant
+                        mock_assistant.close = AsyncMock()
                         mock_assistant.answer = AsyncMock(return_value="Test answer")
                         
                         with patch('builtins.print') as mock_print:
@@ -137,6 +140,7 @@ class TestCLIIntegration:
                 with patch('agent.cli.application.AssistantService') as mock_assistant_class:
                     mock_assistant = Mock()
                     mock_assistant_class.return_value = mock_assistant
+                    mock_assistant.close = AsyncMock()
                     mock_assistant.answer = AsyncMock(return_value="Test answer")
                     
                     with patch('builtins.print') as mock_print:
@@ -181,6 +185,7 @@ class TestCLIIntegration:
                 with patch('agent.cli.application.AssistantService') as mock_assistant_class:
                     mock_assistant = Mock()
                     mock_assistant_class.return_value = mock_assistant
+                    mock_assistant.close = AsyncMock()
                     
                     with patch('builtins.print') as mock_print:
                         with patch('builtins.input', side_effect=EOFError):
@@ -215,6 +220,7 @@ class TestCLIIntegration:
                 with patch('agent.cli.application.AssistantService') as mock_assistant_class:
                     mock_assistant = Mock()
                     mock_assistant_class.return_value = mock_assistant
+                    mock_assistant.close = AsyncMock()
                     
                     with patch('builtins.print') as mock_print:
                         with patch('builtins.input', return_value="exit"):
@@ -250,6 +256,7 @@ class TestCLIIntegration:
                 with patch('agent.cli.application.AssistantService') as mock_assistant_class:
                     mock_assistant = Mock()
                     mock_assistant_class.return_value = mock_assistant
+                    mock_assistant.close = AsyncMock()
                     
                     with patch('builtins.print') as mock_print:
                         with patch('builtins.input', side_effect=["history help", EOFError]):
@@ -284,6 +291,7 @@ class TestCLIIntegration:
                 with patch('agent.cli.application.AssistantService') as mock_assistant_class:
                     mock_assistant = Mock()
                     mock_assistant_class.return_value = mock_assistant
+                    mock_assistant.close = AsyncMock()
                     mock_assistant.answer = AsyncMock(return_value="Test answer")
                     
                     with patch('builtins.print') as mock_print:
@@ -320,6 +328,7 @@ class TestCLIIntegration:
                 with patch('agent.cli.application.AssistantService') as mock_assistant_class:
                     mock_assistant = Mock()
                     mock_assistant_class.return_value = mock_assistant
+                    mock_assistant.close = AsyncMock()
                     mock_assistant.answer = AsyncMock(side_effect=Exception("Test error"))
                     
                     with patch('builtins.print') as mock_print:
@@ -354,6 +363,7 @@ class TestCLIIntegration:
                 with patch('agent.cli.application.AssistantService') as mock_assistant_class:
                     mock_assistant = Mock()
                     mock_assistant_class.return_value = mock_assistant
+                    mock_assistant.close = AsyncMock()
                     mock_assistant.answer = AsyncMock(side_effect=KeyboardInterrupt())
                     
                     with patch('builtins.print') as mock_print:
@@ -0,0 +1,110 @@
+"""Tests for concurrent, order-preserving pipe mode."""
+
+import asyncio
+import gc
+import weakref
+import pytest
+from agent.cli.pipe import PipeMode, parse_line
+
+
+def reader(lines):
+    it = iter(lines)
+
+    async def read():
+        try:
+            return next(it)
+        except StopIteration:
+            raise EOFError
+    return read
+
+
+class TestPipeMode:
+    """Test cases for PipeMode."""
+
+    def test_parse_line(self):
+        assert parse_line("what time is it") == (None, "what time is it")
+        assert parse_line("s1\tand now?") == ("s1", "and now?")
+        assert parse_line("\tno session") == (None, "no session")
+
+    @pytest.mark.asyncio
+    async def test_answers_concurrently_in_input_order(self):
+        written, running, peak = [], [0], [0]
+
+        async def answer(session, prompt, output, waited):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.05 if prompt == "slow" else 0.01)
+            output(f"ran {prompt}")
+            running[0] -= 1
+            return f"answer {prompt}"
+
+        count = await PipeMode(answer, jobs=3, write=written.append, read=reader(["slow", "a", "", "b", "c"])).run()
+
+        assert count == 4
+        assert written == [f"ran {p}\nanswer {p}\n" for p in ("slow", "a", "b", "c")]
+        assert peak[0] == 3
+
+    @pytest.mark.asyncio
+    async def test_session_prompts_run_in_order(self):
+        log = []
+
+        async def answer(session, prompt, output, waited):
+            log.append(f"start {prompt}")
+            await asyncio.sleep(0.03 if prompt == "s-1" else 0.0)
+            log.append(f"end {prompt}")
+            return prompt
+
+        await PipeMode(answer, jobs=4, write=lambda _: None, read=reader(["s\ts-1", "s\ts-2", "other"])).run()
+        assert log.index("end s-1") < log.index("start s-2")
+        assert log.index("start other") < log.index("end s-1")  # independent prompt did not wait
+
+    @pytest.mark.asyncio
+    async def test_reorder_buffer_is_bounded(self):
+        release = asyncio.Event()
+        started = []
+
+        async def answer(session, prompt, output, waited):
+            started.append(prompt)
+            if prompt == "0":
+                await release.wait()
+            return prompt
+
+        mode = PipeMode(answer, jobs=2, window=3, write=lambda _: None, read=reader([str(i) for i in range(10)]))
+        task = asyncio.ensure_future(mode.run())
+        await asyncio.sleep(0.02)
+        assert started == ["0", "1", "2"]  # blocked behind the unfinished first prompt
+        release.set()
+        assert await task == 10
+
+    @pytest.mark.asyncio
+    async def test_errors_are_reported_in_place(self):
+        written = []
+
+        async def answer(session, prompt, output, waited):
+            if prompt == "bad":
+                raise RuntimeError("boom")
+            return prompt
+
+        await PipeMode(answer, write=written.append, read=reader(["ok", "bad", "fine"])).run()
+        assert written == ["ok\n", "LLM error: boom\n", "fine\n"]
+
+    @pytest.mark.asyncio
+    async def test_finished_prompts_are_released(self):
+        tasks, alive_at_eof = [], []
+        lines = iter(str(i) for i in range(100))
+
+        async def answer(session, prompt, output, waited):
+            tasks.append(weakref.ref(asyncio.current_task()))
+            return prompt
+
+        async def read():
+            await asyncio.sleep(0)
+            try:
+                return next(lines)
+            except StopIteration:
+                gc.collect()
+                alive_at_eof.append(sum(ref() is not None for ref in tasks))
+                raise EOFError
+
+        assert await PipeMode(answer, jobs=2, write=lambda _: None, read=read).run() == 100
+        assert alive_at_eof[0] <= 8  # the window, not the whole input
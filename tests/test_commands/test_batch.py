@@ -0,0 +1,68 @@
+"""Tests for concurrent command batches."""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from agent.commands.batch import CommandBatch
+from agent.commands.service import CommandService
+
+
+class TestCommandBatch:
+    """Test cases for CommandBatch."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.output = []
+        self.confirmation = Mock()
+        self.confirmation.confirm = AsyncMock(return_value=True)
+        self.runner = Mock()
+        self.service = CommandService(self.runner, self.confirmation, self.output.append)
+
+    @pytest.mark.asyncio
+    async def test_output_in_slot_order(self):
+        batch = CommandBatch(self.service, 2)
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            await batch.slots[0].run_native("slow", lambda: "first")
+            batch.finish(0)
+
+        async def fast():
+            await batch.slots[1].run_native("fast", lambda: "second")
+            batch.finish(1)
+            assert "second" not in self.output  # held until slot 0 is done
+
+        await asyncio.gather(slow(), fast())
+        assert self.output.index("first") < self.output.index("second")
+
+    @pytest.mark.asyncio
+    async def test_single_confirmation_for_all_slots(self):
+        self.runner.run = AsyncMock(return_value=(0, "ok", ""))
+        batch = CommandBatch(self.service, 3)
+
+        async def run(slot, command):
+            try:
+                if command:
+                    await batch.slots[slot].maybe_run(command)
+            finally:
+                batch.finish(slot)
+
+        with patch("builtins.print"):
+            await asyncio.gather(run(0, "curl a"), run(1, None), run(2, "curl b"))
+        self.confirmation.confirm.assert_called_once_with("curl a\ncurl b")
+        assert self.runner.run.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_collected_text_is_unframed(self):
+        self.runner.run = AsyncMock(side_effect=[(0, "ok", ""), (2, "", "denied")])
+        batch = CommandBatch(self.service, 2, echo=False)
+
+        async def run(slot, command):
+            await batch.slots[slot].maybe_run(command)
+            batch.finish(slot)
+
+        await asyncio.gather(run(0, "true"), run(1, "false"))
+        assert batch.text(0) == "ok"
+        assert "Command output" not in batch.text(1)
+        assert "denied" in batch.text(1) and "(exit 2)" in batch.text(1)
+        assert self.output == []
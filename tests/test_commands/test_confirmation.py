@@ -1,8 +1,9 @@
 """Tests for user confirmation components."""
 
+import asyncio
 import pytest
-from unittest.mock import patch, Mock
-from agent.commands.confirm import StdInConfirmation
+from unittest.mock import patch, Mock, AsyncMock
+from agent.commands.confirm import BatchConfirmation, StdInConfirmation
 
 
 class TestStdInConfirmation:
@@ -103,3 +104,31 @@ class TestStdInConfirmation:
                 print_calls = [call[0][0] for call in mock_print.call_args_list]
                 assert any("echo hello world" in call for call in print_calls)
 
+
+
+class TestBatchConfirmation:
+    """Test cases for BatchConfirmation."""
+
+    @pytest.mark.asyncio
+    async def test_asks_once_when_all_slots_wait(self):
+        inner = Mock()
+        inner.confirm = AsyncMock(return_value=True)
+        batch = BatchConfirmation(inner, 3)
+
+        first = asyncio.ensure_future(batch.confirm("curl a"))
+        second = asyncio.ensure_future(batch.confirm("curl b"))
+        await asyncio.sleep(0)
+        inner.confirm.assert_not_called()
+
+        batch.slot_done()  # the third slot needed no confirmation
+        assert await first is True
+        assert await second is True
+        inner.confirm.assert_called_once_with("curl a\ncurl b")
+
+    @pytest.mark.asyncio
+    async def test_refusal_and_errors_apply_to_all(self):
+        inner = Mock()
+        inner.confirm = AsyncMock(side_effect=RuntimeError("no tty"))
+        batch = BatchConfirmation(inner, 2)
+        results = await asyncio.gather(batch.confirm("a"), batch.confirm("b"))
+        assert results == [False, False]
@@ -0,0 +1,99 @@
+"""Tests for policy-based command approval."""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import Mock, AsyncMock
+from agent.commands.confirm import BatchConfirmation
+from agent.commands.policy import CommandPolicy, PolicyConfirmation, DEFAULT_ALLOW
+from agent.core.metrics import Metrics
+
+
+class TestCommandPolicy:
+    """Test cases for CommandPolicy."""
+
+    @pytest.mark.parametrize("command", [
+        "date '+%Y-%m-%d %H:%M:%S'",
+        "date '+%T'",
+        "ls -la",
+        "curl -s https://wttr.in/New_York",
+        'powershell -Command "Get-Date -Format HH:mm:ss"',
+        "GET https://wttr.in/Paris",
+    ])
+    def test_default_rules_allow_intent_commands(self, command):
+        assert CommandPolicy(DEFAULT_ALLOW).match(command) is not None
+
+    @pytest.mark.parametrize("command", [
+        "date -s 10:00",
+        "date --set=10:00",
+        "ls -l; rm -rf x",
+        "ls -l $(rm x)",
+        "ls -l /etc",
+        "curl -s https://wttr.in/x -o file",
+        "rm -rf /",
+        "",
+    ])
+    def test_default_rules_refuse_everything_else(self, command):
+        assert CommandPolicy(DEFAULT_ALLOW).match(command) is None
+
+    def test_from_env(self, monkeypatch, tmp_path):
+        rules = tmp_path / "allow"
+        rules.write_text("# comment\ngit status\n")
+        monkeypatch.setenv("COMMAND_ALLOW", "uname -*;whoami")
+        monkeypatch.setenv("COMMAND_ALLOW_FILE", str(rules))
+        policy = CommandPolicy.from_env()
+        assert policy.match("uname -a") == "uname -*"
+        assert policy.match("git status") == "git status"
+        assert policy.match("date") == "date"
+
+
+class TestPolicyConfirmation:
+    """Test cases for PolicyConfirmation."""
+
+    def setup_method(self):
+        self.inner = Mock()
+        self.inner.confirm = AsyncMock(return_value=True)
+        self.metrics = Metrics()
+
+    @pytest.mark.asyncio
+    async def test_allowlisted_commands_skip_the_prompt(self, tmp_path):
+        log = tmp_path / "decisions.jsonl"
+        confirmation = PolicyConfirmation(self.inner, CommandPolicy(["ls -l"]), log_path=str(log), metrics=self.metrics)
+
+        assert await confirmation.confirm("ls -l") is True
+        assert await confirmation.confirm("rm x") is True
+        self.inner.confirm.assert_called_once_with("rm x")
+
+        assert [(d.command, d.reason, d.rule) for d in confirmation.decisions] == [
+            ("ls -l", "allowlist", "ls -l"), ("rm x", "prompt", None)
+        ]
+        assert [json.loads(line)["reason"] for line in log.read_text().splitlines()] == ["allowlist", "prompt"]
+        assert self.metrics.counter("confirm.prompted") == 1
+        assert self.metrics.counter("confirm.approved") == 2
+
+    @pytest.mark.asyncio
+    async def test_non_interactive_denies_by_default(self):
+        confirmation = PolicyConfirmation(self.inner, CommandPolicy(["date"]), interactive=False, metrics=self.metrics)
+        assert await confirmation.confirm("date") is True
+        assert await confirmation.confirm("rm x") is False
+        self.inner.confirm.assert_not_called()
+        assert confirmation.decisions[-1].reason == "non-interactive"
+
+    def test_from_env_rejects_unknown_mode(self, monkeypatch):
+        monkeypatch.setenv("COMMAND_APPROVAL", "yolo")
+        with pytest.raises(ValueError):
+            PolicyConfirmation.from_env(self.inner)
+        monkeypatch.setenv("COMMAND_APPROVAL", "deny")
+        assert PolicyConfirmation.from_env(self.inner).interactive is False
+
+    @pytest.mark.asyncio
+    async def test_batch_answers_allowlisted_commands_at_once(self):
+        confirmation = PolicyConfirmation(self.inner, CommandPolicy(["date"]), metrics=self.metrics)
+        batch = BatchConfirmation(confirmation, 3)
+
+        assert await batch.confirm("date") is True  # does not wait for the other slots
+        first = asyncio.ensure_future(batch.confirm("rm a"))
+        second = asyncio.ensure_future(batch.confirm("rm b"))
+        batch.slot_done()  # the "date" slot
+        assert await asyncio.gather(first, second) == [True, True]
+        self.inner.confirm.assert_called_once_with("rm a\nrm b")
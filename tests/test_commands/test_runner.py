@@ -1,8 +1,11 @@
 """Tests for command runner components."""
 
+import asyncio
+import sys
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from agent.commands.runner import SubprocessRunner
+from agent.core.metrics import Metrics
 
 
 class TestSubprocessRunner:
@@ -33,7 +36,8 @@ class TestSubprocessRunner:
     @pytest.mark.asyncio
     async def test_run_regular_command(self):
         """Test running a regular command."""
-        with patch('agent.commands.runner.OS.shell_and_args', return_value=["cmd", "/c", "echo hello"]):
+        with patch('agent.commands.runner.OS.shell_and_args', return_value=["cmd", "/c", "echo hello"]), \
+                patch('agent.commands.runner.OS.direct_args', return_value=None):
             with patch('asyncio.create_subprocess_exec') as mock_create:
                 mock_proc = Mock()
                 mock_proc.communicate = AsyncMock(return_value=(b"hello", b""))
@@ -49,6 +53,22 @@ class TestSubprocessRunner:
                 call_args = mock_create.call_args
                 assert call_args[0] == ("cmd", "/c", "echo hello")
 
+    @pytest.mark.asyncio
+    async def test_run_simple_command_without_shell(self):
+        """Test that a command with no shell syntax is exec'd directly."""
+        with patch('agent.commands.runner.OS.is_windows', return_value=False):
+            with patch('asyncio.create_subprocess_exec') as mock_create:
+                mock_proc = Mock()
+                mock_proc.communicate = AsyncMock(return_value=(b"2024-01-01", b""))
+                mock_proc.returncode = 0
+                mock_create.return_value = mock_proc
+
+                await self.runner.run("date '+%Y-%m-%d'")
+                assert mock_create.call_args[0] == ("date", "+%Y-%m-%d")
+
+                await self.runner.run("ls -l | head")
+                assert mock_create.call_args[0] == ("sh", "-c", "ls -l | head")
+
     @pytest.mark.asyncio
     async def test_run_command_with_error(self):
         """Test running a command that returns an error."""
@@ -94,3 +114,103 @@ class TestSubprocessRunner:
             mock_create.assert_called_once()
             call_args = mock_create.call_args
             assert call_args[0] == ("powershell", "-Command", "Get-Date")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses sh")
+class TestSubprocessRunnerStreaming:
+    """Test cases for SubprocessRunner.run_streaming against real processes."""
+
+    @pytest.mark.asyncio
+    async def test_lines_arrive_before_exit(self):
+        seen = []
+        loop = asyncio.get_running_loop()
+
+        def on_line(stream, line):
+            seen.append((stream, line, loop.time()))
+
+        start = loop.time()
+        code, stdout, stderr = await SubprocessRunner().run_streaming(
+            "echo first; echo oops >&2; sleep 0.3; echo second", on_line
+        )
+        assert code == 0
+        assert [(s, l) for s, l, _ in seen if s == "stdout"] == [("stdout", "first"), ("stdout", "second")]
+        assert ("stderr", "oops") in [(s, l) for s, l, _ in seen]
+        assert seen[0][2] - start < 0.25  # printed before the command finished
+        assert (stdout, stderr) == ("first\nsecond", "oops")
+
+    @pytest.mark.asyncio
+    async def test_missing_program_reported_by_shell(self):
+        code, _, stderr = await SubprocessRunner().run("no-such-program-xyz --flag")
+        assert code == 127
+        assert "not found" in stderr
+
+    @pytest.mark.asyncio
+    async def test_keeps_only_the_tail(self):
+        lines = []
+        code, stdout, _ = await SubprocessRunner().run_streaming(
+            "seq 1 1000; printf 'no newline'", lambda s, l: lines.append(l), tail_lines=3
+        )
+        assert code == 0
+        assert len(lines) == 1001
+        assert stdout == "999\n1000\nno newline"
+
+    @pytest.mark.asyncio
+    async def test_splits_overlong_lines(self):
+        lines = []
+        await SubprocessRunner().run_streaming("printf '%0100d\\n' 0", lambda s, l: lines.append(l), max_line_bytes=40)
+        assert [len(l) for l in lines] == [40, 40, 20]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX process groups and rlimits")
+class TestSubprocessRunnerLimits:
+    """Test cases for deadlines, rlimits and resource accounting."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process_group(self, tmp_path):
+        marker = tmp_path / "survived"
+        metrics = Metrics()
+        runner = SubprocessRunner(timeout=0.3, metrics=metrics)
+
+        result = await runner.run(f"(sleep 1; touch {marker}) & sleep 5")
+        code, stdout, stderr = result
+
+        assert code < 0
+        assert "timed out after 0.3s" in stderr
+        assert result.stats.timed_out
+        assert result.stats.wall_time < 1
+        await asyncio.sleep(1.0)
+        assert not marker.exists()  # the background child was killed too
+        assert metrics.counter("commands.timed_out") == 1
+
+    @pytest.mark.asyncio
+    async def test_streaming_timeout_keeps_partial_output(self):
+        lines = []
+        code, stdout, stderr = await SubprocessRunner(timeout=0.3).run_streaming(
+            "echo started; sleep 5", lambda s, l: lines.append(l)
+        )
+        assert stdout == "started"
+        assert "timed out" in stderr
+
+    @pytest.mark.asyncio
+    async def test_memory_limit(self):
+        runner = SubprocessRunner(memory_bytes=100 * 1024 * 1024)
+        code, _, stderr = await runner.run(f"{sys.executable} -c 'bytearray(300 * 1024 * 1024)'")
+        assert code != 0
+        assert "MemoryError" in stderr
+
+    @pytest.mark.asyncio
+    async def test_stats_recorded(self):
+        metrics = Metrics()
+        result = await SubprocessRunner(metrics=metrics).run("echo hi")
+        assert tuple(result) == (0, "hi\n", "")
+        assert result.stats.wall_time > 0
+        assert result.stats.cpu_time is not None
+        assert metrics.counter("commands.run") == 1
+        assert metrics.summary("commands.wall_seconds").count == 1
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("COMMAND_TIMEOUT", "0")
+        monkeypatch.setenv("COMMAND_MAX_MEMORY_MB", "64")
+        runner = SubprocessRunner.from_env()
+        assert runner._timeout is None
+        assert runner._memory_bytes == 64 * 1024 * 1024
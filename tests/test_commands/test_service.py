@@ -1,8 +1,13 @@
 """Tests for command service."""
 
+import asyncio
+import time
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
+from agent.commands.policy import CommandPolicy
+from agent.commands.runner import CommandResult, CommandStats
 from agent.commands.service import CommandService
+from agent.core.metrics import Metrics
 
 
 class TestCommandService:
@@ -91,3 +96,246 @@ class TestCommandService:
             assert any("(exit 0)" in call for call in print_calls)
             # Should not print whitespace-only content
             assert not any("   " in call for call in print_calls)
+
+    @pytest.mark.asyncio
+    async def test_run_native_prints_output_without_confirmation(self):
+        """Test that in-process actions run without prompting by default."""
+        self.mock_confirmation.confirm = AsyncMock(return_value=False)
+
+        with patch('builtins.print') as mock_print:
+            await self.service.run_native("current date", lambda: "2024-01-02")
+
+            self.mock_confirmation.confirm.assert_not_called()
+            self.mock_runner.run.assert_not_called()
+            print_calls = [call[0][0] for call in mock_print.call_args_list]
+            assert "2024-01-02" in print_calls
+            assert not any("(exit" in call for call in print_calls)
+
+    @pytest.mark.asyncio
+    async def test_run_native_with_confirmation_declined(self):
+        """Test that confirmed in-process actions can be declined."""
+        self.mock_confirmation.confirm = AsyncMock(return_value=False)
+        action = Mock(return_value="data")
+
+        with patch('builtins.print') as mock_print:
+            await self.service.run_native("fetch data", action, confirm=True)
+
+            self.mock_confirmation.confirm.assert_called_once_with("fetch data")
+            action.assert_not_called()
+            mock_print.assert_any_call("Skipping execution.")
+
+    @pytest.mark.asyncio
+    async def test_run_native_reports_errors(self):
+        """Test that a failing in-process action is shown as stderr."""
+        def boom():
+            raise RuntimeError("clock unavailable")
+
+        with patch('builtins.print') as mock_print:
+            await self.service.run_native("current time", boom)
+
+            print_calls = [call[0][0] for call in mock_print.call_args_list]
+            assert any("clock unavailable" in call for call in print_calls)
+            assert any("(exit 1)" in call for call in print_calls)
+
+    @pytest.mark.asyncio
+    async def test_run_native_streams_lines(self):
+        """Test that line iterables are printed as they are produced."""
+        def rows():
+            yield "first"
+            yield "second"
+            raise OSError("permission denied")
+
+        with patch('builtins.print') as mock_print:
+            await self.service.run_native("list files", rows)
+
+            print_calls = [call[0][0] for call in mock_print.call_args_list]
+            assert print_calls.count("\n---------------- Command output ----------------") == 1
+            assert print_calls.index("first") < print_calls.index("second")
+            assert any("permission denied" in call for call in print_calls)
+
+    @pytest.mark.asyncio
+    async def test_run_native_lines_do_not_block_the_event_loop(self):
+        """Test that lines are produced off the event loop, so other tasks keep running."""
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.005)
+
+        def rows():
+            for i in range(3):
+                time.sleep(0.03)  # a slow directory scan
+                yield str(i)
+
+        task = asyncio.ensure_future(ticker())
+        with patch('builtins.print') as mock_print:
+            await self.service.run_native("list files", rows)
+        task.cancel()
+        assert len(ticks) >= 5
+        assert [c[0][0] for c in mock_print.call_args_list][-3:] == ["0", "1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_maybe_run_returns_result(self):
+        """Test that maybe_run returns the result, or None when skipped."""
+        self.mock_runner.run = AsyncMock(return_value=(0, "output", ""))
+        self.mock_confirmation.confirm = AsyncMock(return_value=True)
+
+        with patch('builtins.print'):
+            assert await self.service.maybe_run("test command") == (0, "output", "")
+            self.mock_confirmation.confirm = AsyncMock(return_value=False)
+            assert await self.service.maybe_run("test command") is None
+
+    def test_show_cached(self):
+        """Test printing a cached result."""
+        with patch('builtins.print') as mock_print:
+            self.service.show_cached("cached output", 125)
+
+            print_calls = [call[0][0] for call in mock_print.call_args_list]
+            assert any("cached result from 2 min ago" in call for call in print_calls)
+            assert "cached output" in print_calls
+
+    def test_output_sink_and_fork(self):
+        """Test that a forked service prints to its own sink and keeps the runner."""
+        output = []
+        other_confirmation = Mock()
+        forked = self.service.fork(other_confirmation, output.append)
+
+        forked.show_cached("cached output", 5)
+
+        assert "cached output" in output
+        assert forked.confirmation is other_confirmation
+        assert forked._runner is self.mock_runner
+
+    @pytest.mark.asyncio
+    async def test_maybe_run_streams_when_enabled(self):
+        """Test that a streaming service prints lines from run_streaming as they come."""
+        output = []
+
+        async def run_streaming(command, on_line, tail_lines):
+            on_line("stdout", "line 1")
+            on_line("stderr", "warning")
+            on_line("stdout", "line 2")
+            return 0, "line 2", "warning"
+
+        self.mock_runner.run_streaming = run_streaming
+        self.mock_confirmation.confirm = AsyncMock(return_value=True)
+        service = CommandService(self.mock_runner, self.mock_confirmation, output.append, stream=True, tail_lines=1)
+
+        assert await service.maybe_run("chatty") == (0, "line 2", "warning")
+        assert output[-4:] == ["line 1", "[stderr] warning", "line 2", "(exit 0)"]
+        self.mock_runner.run.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_maybe_run_prints_stats(self):
+        """Test that resource use reported by the runner is printed with the exit code."""
+        self.mock_runner.run = AsyncMock(return_value=CommandResult(0, "ok", "", CommandStats(1.5, 0.25, 2048)))
+        self.mock_confirmation.confirm = AsyncMock(return_value=True)
+
+        with patch('builtins.print') as mock_print:
+            result = await self.service.maybe_run("work")
+
+        assert result.stats.cpu_time == 0.25
+        print_calls = [call[0][0] for call in mock_print.call_args_list]
+        assert "(exit 0; 1.50s wall, 0.25s CPU, 2.0 MB max RSS)" in print_calls
+
+
+class TestSpeculativeExecution:
+    """Test cases for running read-only commands while confirmation is pending."""
+
+    def setup_method(self):
+        self.output = []
+        self.metrics = Metrics()
+        self.answer = asyncio.Event()
+        self.approved = True
+        self.events = []
+
+        async def confirm(command):
+            self.events.append("asked")
+            await self.answer.wait()
+            return self.approved
+
+        self.confirmation = Mock()
+        self.confirmation.confirm = confirm
+        self.runner = Mock(spec=["run", "run_streaming"])
+
+    def service(self, stream=False):
+        return CommandService(
+            self.runner, self.confirmation, self.output.append, stream=stream,
+            speculate=CommandPolicy(["date +*", "GET https://example.org/*"]), metrics=self.metrics,
+        )
+
+    @pytest.mark.asyncio
+    async def test_read_only_command_runs_before_approval(self):
+        async def run(command):
+            self.events.append("ran")
+            return (0, "12:00", "")
+
+        self.runner.run = run
+        task = asyncio.ensure_future(self.service().maybe_run("date +%T"))
+        await asyncio.sleep(0.01)
+        assert self.events == ["asked", "ran"]
+        assert "12:00" not in self.output  # held back until approved
+
+        self.answer.set()
+        assert await task == (0, "12:00", "")
+        assert "12:00" in self.output
+        assert self.metrics.counter("commands.speculative.used") == 1
+
+    @pytest.mark.asyncio
+    async def test_refusal_cancels_and_discards(self):
+        cancelled = asyncio.Event()
+
+        async def run_streaming(command, on_line, tail_lines):
+            on_line("stdout", "secret")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        self.runner.run_streaming = run_streaming
+        self.approved = False
+        task = asyncio.ensure_future(self.service(stream=True).maybe_run("date +%s"))
+        await asyncio.sleep(0.01)
+        self.answer.set()
+
+        assert await task is None
+        assert cancelled.is_set()
+        assert "secret" not in self.output
+        assert self.output[-1] == "Skipping execution."
+        assert self.metrics.counter("commands.speculative.discarded") == 1
+
+    @pytest.mark.asyncio
+    async def test_streams_held_lines_then_live_ones(self):
+        more = asyncio.Event()
+
+        async def run_streaming(command, on_line, tail_lines):
+            on_line("stdout", "early")
+            await more.wait()
+            on_line("stdout", "late")
+            return 0, "early\nlate", ""
+
+        self.runner.run_streaming = run_streaming
+        task = asyncio.ensure_future(self.service(stream=True).maybe_run("date +%s"))
+        await asyncio.sleep(0.01)
+        self.answer.set()
+        await asyncio.sleep(0.01)
+        assert self.output[-1] == "early"
+        more.set()
+        await task
+        assert self.output[-3:] == ["early", "late", "(exit 0)"]
+
+    @pytest.mark.asyncio
+    async def test_other_commands_wait_for_approval(self):
+        async def run(command):
+            self.events.append("ran")
+            return (0, "", "")
+
+        self.runner.run = run
+        self.answer.set()
+        await self.service().maybe_run("rm -rf build")
+        await self.service().run_native("GET https://example.org/x", AsyncMock(return_value="body"), confirm=True)
+        assert self.events == ["asked", "ran", "asked"]
+        assert "body" in self.output
+        assert self.metrics.counter("commands.speculative.started") == 1
@@ -0,0 +1,90 @@
+"""Tests for ShellPoolRunner."""
+
+import sys
+import pytest
+from agent.commands.shell_pool import ShellPoolRunner
+from agent.core.metrics import Metrics
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="drives a POSIX sh")
+
+
+class TestShellPoolRunner:
+    """Test cases for ShellPoolRunner against real shells."""
+
+    def setup_method(self):
+        self.metrics = Metrics()
+        self.runner = ShellPoolRunner(size=2, timeout=2, metrics=self.metrics)
+
+    @pytest.mark.asyncio
+    async def test_output_and_exit_codes(self):
+        assert tuple(await self.runner.run("echo hi; echo oops >&2")) == (0, "hi\n", "oops\n")
+        assert tuple(await self.runner.run("printf 'no newline'")) == (0, "no newline", "")
+        assert (await self.runner.run("exit 3"))[0] == 3
+        assert (await self.runner.run("echo 'unterminated"))[0] != 0
+        await self.runner.close()
+        assert self.metrics.counter("shell_pool.spawned") == 1  # all on one reused shell
+
+    @pytest.mark.asyncio
+    async def test_commands_are_isolated(self, tmp_path):
+        runner = ShellPoolRunner(size=1, cwd=str(tmp_path), metrics=self.metrics)
+        await runner.run("cd /; export POOL_VAR=1; LOCAL=2")
+        code, stdout, _ = await runner.run('pwd; echo "${POOL_VAR:-unset} ${LOCAL:-unset}"')
+        await runner.close()
+        assert stdout == f"{tmp_path}\nunset unset\n"
+
+    @pytest.mark.asyncio
+    async def test_does_not_read_framing_from_stdin(self):
+        assert tuple(await self.runner.run("cat; echo done")) == (0, "done\n", "")
+        await self.runner.close()
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_and_respawns(self):
+        result = await ShellPoolRunner(size=1, timeout=0.3, metrics=self.metrics).run("sleep 5")
+        assert result.stats.timed_out
+        assert "timed out after 0.3s" in result[2]
+
+        runner = ShellPoolRunner(size=1, timeout=0.3, metrics=self.metrics)
+        await runner.run("sleep 5")
+        assert tuple(await runner.run("echo back")) == (0, "back\n", "")
+        await runner.close()
+        assert self.metrics.counter("commands.timed_out") == 2
+
+    @pytest.mark.asyncio
+    async def test_dead_shell_is_replaced(self):
+        code, _, stderr = await self.runner.run("kill -9 $$")
+        assert code == -1
+        assert "Shell exited unexpectedly" in stderr
+        assert tuple(await self.runner.run("echo alive")) == (0, "alive\n", "")
+        await self.runner.close()
+        assert self.metrics.counter("shell_pool.died") == 1
+
+    @pytest.mark.asyncio
+    async def test_check_replaces_unhealthy_shells(self):
+        await self.runner.run("true")
+        assert await self.runner.check() == 1
+        self.runner._idle[0].proc.kill()
+        await self.runner._idle[0].proc.wait()
+        assert await self.runner.check() == 0
+        assert self.runner._idle == []
+        assert self.metrics.counter("shell_pool.unhealthy") == 1
+
+    @pytest.mark.asyncio
+    async def test_idle_shell_is_pinged_before_reuse(self):
+        runner = ShellPoolRunner(size=1, check_after=0, metrics=self.metrics)
+        await runner.run("true")
+        shell = runner._idle[0]
+        assert tuple(await runner.run("echo again")) == (0, "again\n", "")
+        assert shell.commands == 3  # command, ping, command
+        await runner.close()
+        assert runner._idle == [] and not shell.alive
+
+    @pytest.mark.asyncio
+    async def test_streaming(self):
+        lines = []
+        code, stdout, stderr = await self.runner.run_streaming(
+            "seq 1 100; printf tail; echo err >&2", lambda s, l: lines.append((s, l)), tail_lines=2
+        )
+        await self.runner.close()
+        assert code == 0
+        assert [l for s, l in lines if s == "stdout"] == [str(i) for i in range(1, 101)] + ["tail"]
+        assert (stdout, stderr) == ("100\ntail", "err")
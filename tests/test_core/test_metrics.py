@@ -0,0 +1,52 @@
+"""Tests for in-process metrics."""
+
+import json
+
+from agent.core.metrics import Histogram, Metrics, labeled
+
+
+class TestMetrics:
+    """Test cases for Metrics."""
+
+    def test_counters(self):
+        m = Metrics()
+        m.incr("a")
+        m.incr("a", 2)
+        assert m.counter("a") == 3
+        assert m.counter("missing") == 0
+
+    def test_summaries(self):
+        m = Metrics()
+        for v in (1.0, 3.0, 2.0):
+            m.observe("t", v)
+        s = m.summary("t")
+        assert (s.count, s.min, s.max, s.mean) == (3, 1.0, 3.0, 2.0)
+        m.reset()
+        assert m.summary("t").count == 0
+
+    def test_histogram_percentiles(self):
+        h = Histogram()
+        for v in range(1, 1001):
+            h.add(v / 1000)
+        assert abs(h.percentile(0.5) - 0.5) < 0.01
+        assert abs(h.percentile(0.99) - 0.99) < 0.02
+        assert h.percentile(1.0) <= h.max == 1.0
+        assert Histogram().percentile(0.5) == 0.0
+
+    def test_labeled_names(self):
+        assert labeled("llm.seconds", provider="openai", model="gpt-4o") == "llm.seconds{provider=openai,model=gpt-4o}"
+        assert labeled("turns", intent=None) == "turns"
+
+    def test_snapshot_and_dump(self, tmp_path):
+        m = Metrics()
+        m.incr("requests")
+        for v in (0.1, 0.2, 0.3):
+            m.observe("latency", v)
+        snap = m.snapshot()
+        assert snap["counters"] == {"requests": 1}
+        assert snap["observed"]["latency"]["count"] == 3
+        assert abs(snap["observed"]["latency"]["p50"] - 0.2) < 0.01
+        path = tmp_path / "stats.json"
+        m.dump(str(path), {"session": "s1"})
+        data = json.loads(path.read_text())
+        assert data["session"] == "s1" and data["counters"] == {"requests": 1}
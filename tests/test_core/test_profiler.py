@@ -0,0 +1,35 @@
+"""Tests for per-turn profiling."""
+
+import os
+import pstats
+import tracemalloc
+from agent.core.profiler import TurnProfiler
+
+
+class TestTurnProfiler:
+    """Test cases for TurnProfiler."""
+
+    def test_disabled_writes_nothing(self, tmp_path):
+        profiler = TurnProfiler(str(tmp_path))
+        with profiler.turn("q") as paths:
+            sum(range(100))
+        assert paths == [] and os.listdir(tmp_path) == []
+
+    def test_turns_write_pstats_and_reports(self, tmp_path):
+        profiler = TurnProfiler(str(tmp_path), top=5)
+        profiler.start()
+        try:
+            with profiler.turn("first") as first:
+                kept = [str(i) * 10 for i in range(2000)]
+            with profiler.turn("second") as second:
+                kept += [str(i) * 10 for i in range(2000)]
+        finally:
+            profiler.stop()
+        assert not tracemalloc.is_tracing()
+        assert [os.path.splitext(p)[1] for p in first + second] == [".pstats", ".txt"] * 2
+        assert pstats.Stats(second[0]).total_calls > 0
+        with open(second[1], encoding="utf-8") as f:
+            report = f.read()
+        assert report.startswith("Turn 2: second")
+        growth = report.split("growth since the previous turn ==")[1]
+        assert "test_profiler.py" in growth
@@ -0,0 +1,64 @@
+"""Tests for per-turn statistics."""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from agent.config.params import AiParameters
+from agent.core.assistant import AssistantService
+from agent.core.history import HistoryManager
+from agent.core.metrics import Metrics
+from agent.core.stats import record_turn, report, totals
+from agent.core.turn import TurnInfo
+from agent.llm.usage import record_usage
+
+
+class TestStats:
+    """Test cases for record_turn, totals and report."""
+
+    def test_llm_turn_is_counted_per_model(self):
+        m = Metrics()
+        usage = {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120, "cached_tokens": 60, "requests": 1}
+        turn = TurnInfo("q", "openai", "gpt-4o", "a", usage=usage, timings={"first_token": 0.5, "total": 0.6}, cost=0.001)
+        record_turn(turn, m)
+        record_turn(turn, m)
+        labels = "{provider=openai,model=gpt-4o}"
+        assert m.counter("turns") == 2
+        assert m.counter("tokens.input" + labels) == 200
+        assert m.counter("tokens.cached" + labels) == 120
+        assert m.histogram("llm.seconds" + labels).count == 2
+        assert m.histogram("turn.seconds" + labels).count == 2
+        t = totals(m)
+        assert (t["input_tokens"], t["output_tokens"], t["cached_tokens"]) == (200, 40, 120)
+        assert t["cost_usd"] == pytest.approx(0.002)
+
+    def test_intent_turn_is_counted_per_intent(self):
+        m = Metrics()
+        record_turn(TurnInfo("time", "openai", "gpt-4o", intents=["time"], timings={"intent": 0.01, "total": 0.02}), m)
+        assert m.series() == ["intent.seconds{intent=time}", "turn.seconds{intent=time}"]
+        assert totals(m)["input_tokens"] == 0
+
+    def test_report(self):
+        m = Metrics()
+        record_turn(TurnInfo("q", "openai", "gpt-4o", error="boom", timings={"total": 1.0}), m)
+        m.incr("intent_cache.hit", 3)
+        m.incr("intent_cache.miss")
+        m.incr("llm.route.fast")
+        lines = report(m)
+        assert lines[0] == "Turns: 1 (1 failed)"
+        assert "Intent cache: 75% hit rate (4 lookups)" in lines
+        assert any(line.startswith("turn.seconds{provider=openai,model=gpt-4o}") for line in lines)
+        assert "  llm.route.fast 1" in lines
+
+    @pytest.mark.asyncio
+    async def test_assistant_records_each_turn(self):
+        async def complete(prompt, system):
+            record_usage(10, 2)
+            return "answer"
+
+        m = Metrics()
+        params = AiParameters(agent="a", model="test-model", provider="test", api_key="k", system_prompt="sys")
+        client = SimpleNamespace(complete=complete, complete_with_history=AsyncMock())
+        assistant = AssistantService(params, client, HistoryManager(), command_service=Mock(), metrics=m)
+        await assistant.answer("tell me a joke")
+        assert m.counter("turns") == 1
+        assert m.counter("tokens.output{provider=test,model=test-model}") == 2
@@ -0,0 +1,56 @@
+"""Tests for per-turn records."""
+
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from agent.config.params import AiParameters
+from agent.core.assistant import AssistantService
+from agent.core.history import HistoryManager
+from agent.core.turn import TurnInfo
+from agent.llm.usage import record_usage
+
+
+class TestTurnInfo:
+    """Test cases for TurnInfo and the records AssistantService keeps."""
+
+    def setup_method(self):
+        self.params = AiParameters(
+            agent="test-agent", model="test-model", provider="test", api_key="k", system_prompt="sys"
+        )
+
+    def test_to_json(self):
+        turn = TurnInfo("hi", "openai", "gpt", "hello", ["time"], timings={"total": 0.1234567})
+        record = json.loads(turn.to_json())
+        assert list(record)[:5] == ["prompt", "provider", "model", "answer", "intent"]
+        assert record["intent"] == ["time"]
+        assert record["timings"] == {"total": 0.123457}
+        assert json.loads(TurnInfo("x").to_json())["intent"] is None
+
+    @pytest.mark.asyncio
+    async def test_llm_turn_records_usage_and_timings(self):
+        async def complete(prompt, system):
+            record_usage(12, 5)
+            return "answer"
+
+        client = SimpleNamespace(complete=complete, complete_with_history=AsyncMock())
+        assistant = AssistantService(self.params, client, HistoryManager(), command_service=Mock())
+        await assistant.answer("tell me a joke")
+        turn = assistant.last_turn
+        assert (turn.provider, turn.model, turn.answer) == ("test", "test-model", "answer")
+        assert turn.intents == [] and not turn.cache_hit
+        assert turn.usage == {"prompt_tokens": 12, "completion_tokens": 5, "total_tokens": 17, "cached_tokens": 0, "requests": 1}
+        assert {"intent_match", "intent", "prompt_build", "first_token", "total"} <= set(turn.timings)
+        assert turn.timings["total"] >= turn.timings["first_token"]
+
+    @pytest.mark.asyncio
+    async def test_intent_turn_names_the_intent(self):
+        commands = Mock()
+        commands.maybe_run = AsyncMock(return_value=None)
+        commands.run_native = AsyncMock(return_value=None)
+        client = Mock()
+        assistant = AssistantService(self.params, client, HistoryManager(), command_service=commands)
+        await assistant.answer("what time is it")
+        turn = assistant.last_turn
+        assert turn.intents == ["time"]
+        assert turn.usage is None and "first_token" not in turn.timings
@@ -0,0 +1,68 @@
+"""Tests for date-time intent handler."""
+
+import re
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, AsyncMock
+from agent.intents.date_time import DateTimeHandler
+from agent.intents.base import IntentContext
+
+
+class TestDateTimeHandler:
+    """Test cases for DateTimeHandler."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.handler = DateTimeHandler()
+        self.mock_context = Mock(spec=IntentContext)
+        self.mock_context.commands = Mock()
+        self.mock_context.commands.maybe_run = AsyncMock()
+        self.mock_context.commands.run_native = AsyncMock()
+
+    def test_matches_date_time_queries(self):
+        """Test that date-time queries are matched correctly."""
+        queries = [
+            "datetime",
+            "date time",
+            "time and date",
+            "current date and time",
+            "What's the date and time?",
+        ]
+
+        for query in queries:
+            assert self.handler.matches(query), f"Should match: {query}"
+
+    @pytest.mark.asyncio
+    async def test_handle_unix_command(self):
+        """Test shell handling on Unix-like systems."""
+        self.handler = DateTimeHandler(use_shell=True)
+        with pytest.MonkeyPatch().context() as m:
+            m.setattr("agent.intents.date_time.OS.is_windows", lambda: False)
+
+            await self.handler.handle("current date and time", self.mock_context)
+
+            self.mock_context.commands.maybe_run.assert_called_once_with(
+                "date '+%Y-%m-%d %H:%M:%S'"
+            )
+
+    @pytest.mark.asyncio
+    async def test_handle_in_process_by_default(self):
+        """Test that the date and time are read in-process."""
+        await self.handler.handle("current date and time", self.mock_context)
+
+        self.mock_context.commands.maybe_run.assert_not_called()
+        action = self.mock_context.commands.run_native.call_args[0][1]
+        assert re.match(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$", action())
+
+    @pytest.mark.asyncio
+    async def test_handle_uses_configured_timezone(self, monkeypatch):
+        """Test that INTENT_TIMEZONE selects the zone used for formatting."""
+        monkeypatch.setenv("INTENT_TIMEZONE", "UTC")
+        handler = DateTimeHandler()
+
+        await handler.handle("current date and time", self.mock_context)
+
+        action = self.mock_context.commands.run_native.call_args[0][1]
+        utc_now = datetime.utcnow()
+        shown = datetime.strptime(action(), "%Y-%m-%d %H:%M:%S")
+        assert abs((shown - utc_now).total_seconds()) < 5
@@ -1,7 +1,10 @@
 """Tests for intent chain integration."""
 
+import asyncio
+import time
 import pytest
 from unittest.mock import Mock, AsyncMock
+from agent.commands.service import CommandService
 from agent.intents.chain import IntentChain
 from agent.intents.base import IntentContext
 
@@ -105,3 +108,47 @@ class TestIntentChain:
         handler1.matches.assert_called_once_with("test input")
         handler1.handle.assert_called_once_with("test input", self.mock_context)
 
+
+    @pytest.mark.asyncio
+    async def test_try_handle_uses_fallback_when_nothing_matches(self):
+        """Test that the fallback picks a handler only when no pattern matches."""
+        handler1 = Mock()
+        handler1.matches.return_value = False
+        handler1.handle = AsyncMock(return_value=True)
+        fallback = Mock(return_value=handler1)
+
+        chain = IntentChain([handler1], fallback=fallback)
+
+        assert await chain.try_handle("got the clock?", self.mock_context) is True
+        fallback.assert_called_once_with("got the clock?")
+        handler1.handle.assert_called_once_with("got the clock?", self.mock_context)
+
+        fallback.return_value = None
+        assert await chain.try_handle("hello", self.mock_context) is False
+
+    @pytest.mark.asyncio
+    async def test_try_handle_runs_compound_prompt_concurrently(self):
+        """Test that each clause's handler runs at once and output keeps clause order."""
+        output = []
+        confirmation = Mock()
+        confirmation.confirm = AsyncMock(return_value=True)
+        ctx = IntentContext(CommandService(Mock(), confirmation, output.append))
+
+        def make_handler(word, delay):
+            async def handle(user_input, ctx):
+                await asyncio.sleep(delay)
+                await ctx.commands.run_native(f"fetch {word}", lambda: f"{word} result", confirm=True)
+                return True
+            handler = Mock()
+            handler._KEYWORDS = (word,)
+            handler.matches.side_effect = lambda text: word in text
+            handler.handle = handle
+            return handler
+
+        chain = IntentChain([make_handler("weather", 0.2), make_handler("time", 0.2)])
+
+        start = time.perf_counter()
+        assert await chain.try_handle("the weather in Paris and the time", ctx) is True
+        assert time.perf_counter() - start < 0.35
+        confirmation.confirm.assert_called_once_with("fetch weather\nfetch time")
+        assert output.index("weather result") < output.index("time result")
@@ -0,0 +1,61 @@
+"""Tests for the bundled intent classifier."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agent.intents.classifier import IntentClassifier, features, load_corpus  # noqa: E402
+from agent.intents.registry import BUILTIN_SPECS, load_classifier  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return IntentClassifier.load()
+
+
+class TestIntentClassifier:
+    """Test cases for IntentClassifier."""
+
+    def test_features(self):
+        feats = features("Got the clock?")
+        assert "w:clock" in feats
+        assert "b:the clock" in feats
+        assert "c: cl" in feats
+
+    @pytest.mark.parametrize("prompt, expected", [
+        ("got the clock?", "time"),
+        ("what's outside like in Berlin", "weather"),
+        ("do I need an umbrella", "weather"),
+        ("what address am I connecting from", "public_ip"),
+        ("what's in this folder", "list_files"),
+    ])
+    def test_classifies_paraphrases(self, classifier, prompt, expected):
+        assert classifier.classify(prompt) == expected
+
+    @pytest.mark.parametrize("prompt", [
+        "Hello, how are you?",
+        "how do I parse a datetime string in python",
+        "write a python function to list files in a directory recursively",
+    ])
+    def test_leaves_llm_prompts_alone(self, classifier, prompt):
+        assert classifier.classify(prompt) is None
+
+    def test_long_prompts_and_threshold(self, classifier):
+        assert classifier.classify("what time is it " * 10) is None
+        strict = IntentClassifier.load(threshold=1.01)
+        assert strict.classify("got the clock?") is None
+
+    def test_unknown_words_fall_through(self, classifier):
+        assert classifier.classify("zzzz qqqq") is None
+
+    def test_model_labels_are_registered_intents(self, classifier):
+        names = {spec.name for spec in BUILTIN_SPECS} | {"none"}
+        assert set(classifier.labels) == names
+        assert {label for label, _ in load_corpus()} == names
+
+    def test_load_classifier_respects_env(self, monkeypatch):
+        monkeypatch.setenv("INTENT_CLASSIFIER", "0")
+        assert load_classifier() is None
+        monkeypatch.setenv("INTENT_CLASSIFIER", "1")
+        monkeypatch.setenv("INTENT_CLASSIFIER_THRESHOLD", "0.9")
+        assert load_classifier().threshold == 0.9
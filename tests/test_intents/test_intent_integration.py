@@ -1,10 +1,11 @@
 """Integration tests for intent system."""
 
+import re
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from agent.core.assistant import AssistantService
 from agent.config.params import AiParameters
-from agent.llm.interfaces import LLMClient
+from agent.llm.interfaces import LLMClient, ToolCall
 from agent.core.history import HistoryManager
 
 
@@ -35,6 +36,7 @@ class TestIntentIntegration:
         # Mock the command service to avoid stdin interaction
         mock_command_service = Mock()
         mock_command_service.maybe_run = AsyncMock()
+        mock_command_service.run_native = AsyncMock()
         assistant._command_service = mock_command_service
         
         with patch('agent.core.assistant.IntentChain') as mock_chain_class:
@@ -150,3 +152,18 @@ class TestIntentIntegration:
         # Should not call LLM or intents
         self.mock_client.complete.assert_not_called()
         self.mock_client.complete_with_history.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_assistant_offers_intents_as_tools(self):
+        """Test that unmatched prompts go to complete_with_tools when tools are enabled."""
+        async def complete_with_tools(prompt, system, history, tools, run_tools):
+            results = await run_tools([ToolCall("c1", "get_current_date", {})])
+            return f"Today is {results[0].splitlines()[-1]}"
+
+        self.mock_client.complete_with_tools = complete_with_tools
+        assistant = AssistantService(self.params, self.mock_client, self.history_manager, use_tools=True)
+
+        result = await assistant.answer("Is it a holiday?")
+
+        assert re.fullmatch(r"Today is \d{4}-\d{2}-\d{2}", result)
+        self.mock_client.complete.assert_not_called()
@@ -0,0 +1,144 @@
+"""Tests for the lazy intent registry."""
+
+import sys
+import types
+import pytest
+from unittest.mock import Mock
+from agent.intents.base import IntentContext
+from agent.intents.registry import BUILTIN_SPECS, IntentRegistry, IntentSpec, LazyHandler, default_registry
+
+
+class _EchoHandler:
+    built = 0
+
+    def __init__(self):
+        type(self).built += 1
+
+    def matches(self, user_input):
+        return "echo" in user_input
+
+    async def handle(self, user_input, ctx):
+        return True
+
+
+@pytest.fixture
+def plugin_module(monkeypatch):
+    """Install a fake handler module and count how often its class is built."""
+    module = types.ModuleType("fake_intent_plugin")
+    _EchoHandler.built = 0
+    module.EchoHandler = _EchoHandler
+    module.SPEC = IntentSpec("echo", "fake_intent_plugin:EchoHandler", 5, ("echo",))
+    monkeypatch.setitem(sys.modules, "fake_intent_plugin", module)
+    return module
+
+
+class TestIntentRegistry:
+    """Test cases for IntentRegistry."""
+
+    def test_specs_sorted_by_priority(self):
+        registry = IntentRegistry([
+            IntentSpec("b", "m:B", 20),
+            IntentSpec("a", "m:A", 10),
+            IntentSpec("c", "m:C", 20),
+        ])
+        assert [s.name for s in registry.specs()] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_handler_built_on_first_keyword_match_and_shared(self, plugin_module):
+        registry = IntentRegistry([plugin_module.SPEC])
+        chain = registry.chain()
+        ctx = Mock(spec=IntentContext)
+
+        assert await chain.try_handle("hello there", ctx) is False
+        assert _EchoHandler.built == 0
+
+        assert await chain.try_handle("echo hi", ctx) is True
+        assert await registry.chain().try_handle("echo again", ctx) is True
+        assert _EchoHandler.built == 1
+        assert registry.chain() is chain
+
+    def test_register_replaces_and_resets_chain(self, plugin_module):
+        registry = IntentRegistry([plugin_module.SPEC])
+        chain = registry.chain()
+        registry.register(IntentSpec("echo", "fake_intent_plugin:EchoHandler", 50))
+        assert registry.chain() is not chain
+        assert registry.specs()[0].priority == 50
+
+    def test_load_config(self, plugin_module):
+        registry = IntentRegistry()
+        registry.load_config("fake_intent_plugin:EchoHandler@7, ")
+        spec, = registry.specs()
+        assert (spec.name, spec.priority, spec.keywords) == ("echohandler", 7, None)
+        assert registry.handler("echohandler").matches("echo")
+
+    def test_bad_config_entries_are_skipped(self, plugin_module):
+        registry = IntentRegistry()
+        with pytest.warns(UserWarning) as caught:
+            registry.load_config("nosuch_intent_mod:Foo, fake_intent_plugin:EchoHandler@abc, fake_intent_plugin:Missing, nocolon")
+        assert registry.specs() == []
+        assert len(caught) == 4
+
+    @pytest.mark.asyncio
+    async def test_handler_that_fails_to_build_is_dropped(self, plugin_module):
+        class Broken:
+            def __init__(self):
+                raise RuntimeError("needs a config file")
+
+        plugin_module.Broken = Broken
+        registry = IntentRegistry([IntentSpec("broken", "fake_intent_plugin:Broken", 1), plugin_module.SPEC])
+        chain = registry.chain()
+        ctx = Mock(spec=IntentContext)
+        with pytest.warns(UserWarning, match="needs a config file"):
+            assert await chain.try_handle("echo hi", ctx) is True
+        assert await chain.try_handle("echo again", ctx) is True
+        assert [s.name for s in registry.specs()] == ["echo"]
+
+    def test_load_entry_points(self, plugin_module, monkeypatch):
+        ep = Mock()
+        ep.name = "echo"
+        ep.load.return_value = plugin_module.SPEC
+        monkeypatch.setattr("importlib.metadata.entry_points", lambda group: [ep])
+        registry = IntentRegistry()
+        registry.load_entry_points()
+        assert registry.specs() == [plugin_module.SPEC]
+        assert _EchoHandler.built == 0
+
+    def test_invalid_entry_points_are_skipped(self, plugin_module, monkeypatch):
+        wrong, broken, good = Mock(), Mock(), Mock()
+        wrong.name, broken.name, good.name = "wrong", "broken", "echo"
+        wrong.load.return_value = _EchoHandler
+        broken.load.side_effect = ImportError("no module named echo_dep")
+        good.load.return_value = plugin_module.SPEC
+        monkeypatch.setattr("importlib.metadata.entry_points", lambda group: [wrong, broken, good])
+        registry = IntentRegistry()
+        with pytest.warns(UserWarning) as caught:
+            registry.load_entry_points()
+        assert registry.specs() == [plugin_module.SPEC]
+        assert ["'wrong'" in str(w.message) for w in caught] == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_classifier_fallback_routes_by_name(self, plugin_module):
+        classifier = Mock()
+        classifier.classify.side_effect = lambda text: "echo" if "repeat" in text else None
+        factory = Mock(return_value=classifier)
+        registry = IntentRegistry([plugin_module.SPEC], classifier=factory)
+        chain = registry.chain()
+        ctx = Mock(spec=IntentContext)
+
+        assert await chain.try_handle("repeat after me", ctx) is True
+        assert await chain.try_handle("hello", ctx) is False
+        factory.assert_called_once_with()
+
+        registry.register(IntentSpec("other", "fake_intent_plugin:EchoHandler", 50, ("zzz",)))
+        assert await registry.chain().try_handle("repeat it", ctx) is True
+        factory.assert_called_once_with()
+
+    def test_builtin_keywords_match_handler_classes(self):
+        registry = IntentRegistry(BUILTIN_SPECS)
+        for spec in BUILTIN_SPECS:
+            assert spec.keywords == registry.handler(spec.name)._KEYWORDS
+
+    def test_default_registry_is_shared(self):
+        registry = default_registry()
+        assert registry is default_registry()
+        assert all(isinstance(h, LazyHandler) for h in registry.chain()._handlers)
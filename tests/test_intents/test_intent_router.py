@@ -0,0 +1,153 @@
+"""Tests for the keyword-prefiltered intent router."""
+
+from unittest.mock import Mock
+from agent.intents.router import IntentRouter
+from agent.intents.weather import WeatherHandler
+from agent.intents.public_ip import PublicIpHandler
+from agent.intents.date_time import DateTimeHandler
+from agent.intents.time_only import TimeHandler
+from agent.intents.date_only import DateHandler
+from agent.intents.list_files import ListFilesHandler
+
+
+def _builtin_handlers():
+    return [
+        WeatherHandler(),
+        PublicIpHandler(),
+        DateTimeHandler(),
+        TimeHandler(),
+        DateHandler(),
+        ListFilesHandler(),
+    ]
+
+
+def _sequential(handlers, text):
+    for h in handlers:
+        if h.matches(text):
+            return h
+    return None
+
+
+PROMPTS = [
+    "What's the date?",
+    "what's the date and time",
+    "current date and time",
+    "datetime please",
+    "What's the time?",
+    "time now",
+    "local time in here",
+    "Today's date",
+    "weather in London",
+    "list the weather files",
+    "show me all files in this directory",
+    "ls",
+    "dir",
+    "current files",
+    "What's my IP?",
+    "ip",
+    "IP configuration",
+    "Explain quantum computing",
+    "Hello, how are you?",
+    "My files are important",
+    "Date of birth",
+    "show the ip and the date time",
+    "",
+]
+
+
+class TestIntentRouter:
+    """Test cases for IntentRouter."""
+
+    def test_matches_sequential_scan(self):
+        """Test that routing gives the same handler as the sequential scan."""
+        handlers = _builtin_handlers()
+        router = IntentRouter(handlers)
+
+        for prompt in PROMPTS:
+            expected = _sequential(handlers, prompt)
+            assert router.route(prompt) is expected, f"Mismatch for: {prompt!r}"
+
+    def test_matches_sequential_scan_with_unicode_case_folding(self):
+        """Test that characters re.I folds to ASCII do not defeat the prefilter."""
+        handlers = _builtin_handlers()
+        router = IntentRouter(handlers)
+
+        for prompt in ["WHAT'S MY İP", "my ıp", "ſhow files"]:
+            expected = _sequential(handlers, prompt)
+            assert router.route(prompt) is expected, f"Mismatch for: {prompt!r}"
+
+    def test_priority_wins_over_earlier_position(self):
+        """Test that a later match of a higher-priority handler still wins."""
+        router = IntentRouter(_builtin_handlers())
+
+        # ListFiles matches from position 0, Weather only further in
+        assert isinstance(router.route("list the weather files"), WeatherHandler)
+
+    def test_keywords_skip_matches(self):
+        """Test that handlers whose keywords are absent are not asked."""
+        handler = Mock()
+        handler._KEYWORDS = ("weather",)
+        router = IntentRouter([handler])
+
+        assert router.route("Hello world") is None
+        handler.matches.assert_not_called()
+
+        handler.matches.return_value = True
+        assert router.route("Weather today") is handler
+        handler.matches.assert_called_once_with("Weather today")
+
+    def test_handlers_without_keywords_use_matches(self):
+        """Test that handlers without keywords are always asked."""
+        plain = Mock()
+        plain.matches.return_value = True
+        router = IntentRouter([WeatherHandler(), plain])
+
+        assert router.route("hello") is plain
+        plain.matches.assert_called_once_with("hello")
+
+    def test_scan_is_capped(self):
+        """Test that only the first max_scan_chars characters are scanned."""
+        router = IntentRouter(_builtin_handlers(), max_scan_chars=32)
+
+        assert router.route("x " * 100 + "weather") is None
+        assert isinstance(router.route("weather " + "x " * 100), WeatherHandler)
+
+    def test_no_cap(self):
+        """Test that the cap can be disabled."""
+        router = IntentRouter(_builtin_handlers(), max_scan_chars=None)
+
+        assert isinstance(router.route("x " * 5000 + "weather"), WeatherHandler)
+
+    def test_route_all_splits_compound_prompts(self):
+        handlers = _builtin_handlers()
+        router = IntentRouter(handlers)
+        routed = router.route_all("what's the time and the weather in Paris")
+        assert [(type(h).__name__, clause) for h, clause in routed] == [
+            ("TimeHandler", "what's the time"),
+            ("WeatherHandler", "the weather in Paris"),
+        ]
+        routed = router.route_all("what is my ip, and list files")
+        assert [type(h).__name__ for h, _ in routed] == ["PublicIpHandler", "ListFilesHandler"]
+
+    def test_route_all_leaves_single_intents_whole(self):
+        router = IntentRouter(_builtin_handlers())
+        for prompt in ("what's the date and time", "current date and time", "weather in London", "", "list files and folders"):
+            assert router.route_all(prompt) == [], prompt
+
+    def test_match_splits_only_with_two_handlers_keywords(self):
+        weather = Mock(_KEYWORDS=("weather",))
+        weather.matches.return_value = True
+        other = Mock(_KEYWORDS=("zzz",))
+        router = IntentRouter([weather, other])
+
+        assert router.match("the weather in Paris and then tomorrow") == [(weather, "the weather in Paris and then tomorrow")]
+        weather.matches.assert_called_once_with("the weather in Paris and then tomorrow")
+        other.matches.assert_not_called()
+
+    def test_match_agrees_with_route_for_single_intents(self):
+        handlers = _builtin_handlers()
+        router = IntentRouter(handlers)
+        for prompt in PROMPTS:
+            routed = router.match(prompt)
+            if len(routed) < 2:
+                assert [h for h, _ in routed] == [h for h in (router.route(prompt),) if h is not None], prompt
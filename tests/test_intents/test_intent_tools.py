@@ -0,0 +1,105 @@
+"""Tests for intents exposed as LLM tools."""
+
+import asyncio
+import re
+import pytest
+from unittest.mock import Mock, AsyncMock
+from agent.commands.service import CommandService
+from agent.intents.base import IntentContext
+from agent.intents.list_files import ListFilesHandler
+from agent.intents.registry import BUILTIN_SPECS, IntentRegistry, IntentSpec
+from agent.intents.tools import BUILTIN_TOOLS, IntentToolbox, _list_files_prompt
+from agent.llm.interfaces import ToolCall
+
+
+class TestIntentToolbox:
+    """Test cases for IntentToolbox."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.output = []
+        self.confirmation = Mock()
+        self.confirmation.confirm = AsyncMock(return_value=True)
+        self.ctx = IntentContext(CommandService(Mock(), self.confirmation, self.output.append))
+
+    def test_definitions_only_for_registered_intents(self):
+        toolbox = IntentToolbox(IntentRegistry(BUILTIN_SPECS))
+        assert [d.name for d in toolbox.definitions] == [t.definition.name for t in BUILTIN_TOOLS]
+
+        toolbox = IntentToolbox(IntentRegistry([s for s in BUILTIN_SPECS if s.name == "time"]))
+        assert [d.name for d in toolbox.definitions] == ["get_current_time"]
+
+    def test_list_files_prompt_uses_handler_phrasing(self):
+        assert _list_files_prompt({}) == "list files"
+        assert _list_files_prompt({"pattern": "*.py", "sort": "size", "show_hidden": True, "page": 2}) == (
+            "list files *.py all by size page 2"
+        )
+        assert _list_files_prompt({"pattern": "test"}) == "list files *test*"
+        assert _list_files_prompt({"pattern": ".py"}) == "list files *.py"
+        assert ListFilesHandler().parse_options(_list_files_prompt({"pattern": "py"})).pattern == "*py*"
+
+    @pytest.mark.asyncio
+    async def test_run_returns_captured_output_in_call_order(self):
+        toolbox = IntentToolbox(IntentRegistry(BUILTIN_SPECS))
+        results = await toolbox.run(
+            [ToolCall("1", "get_current_time", {}), ToolCall("2", "get_current_date", {}), ToolCall("3", "nope", {})],
+            self.ctx,
+        )
+        assert re.search(r"\d{2}:\d{2}:\d{2}", results[0])
+        assert re.search(r"\d{4}-\d{2}-\d{2}", results[1])
+        assert results[2] == "Unknown tool: nope"
+        assert self.output == []  # results go to the model, not the terminal
+
+    @pytest.mark.asyncio
+    async def test_run_is_concurrent_with_one_confirmation(self, monkeypatch):
+        class SlowHandler:
+            async def handle(self, user_input, ctx):
+                await asyncio.sleep(0.2)
+                await ctx.commands.run_native(f"GET {user_input}", lambda: f"{user_input}: sunny", confirm=True)
+                return True
+
+        registry = IntentRegistry([IntentSpec("weather", "unused:Handler")])
+        monkeypatch.setattr(registry, "handler", lambda name: SlowHandler())
+        toolbox = IntentToolbox(registry)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await toolbox.run(
+            [ToolCall("a", "get_weather", {"city": "Paris"}), ToolCall("b", "get_weather", {"city": "Oslo"})], self.ctx
+        )
+        assert loop.time() - start < 0.35
+        assert "weather in Paris: sunny" in results[0]
+        assert "weather in Oslo: sunny" in results[1]
+        self.confirmation.confirm.assert_called_once_with("GET weather in Paris\nGET weather in Oslo")
+
+    @pytest.mark.asyncio
+    async def test_list_files_is_confirmed_and_unframed(self, tmp_path, monkeypatch):
+        (tmp_path / "notes.txt").write_text("x")
+        monkeypatch.chdir(tmp_path)
+        registry = IntentRegistry([s for s in BUILTIN_SPECS if s.name == "list_files"])
+        monkeypatch.setattr(registry, "handler", lambda name: ListFilesHandler(use_shell=False))
+        results = await IntentToolbox(registry).run([ToolCall("a", "list_files", {})], self.ctx)
+
+        self.confirmation.confirm.assert_called_once_with(f"list files in {tmp_path}")
+        assert "notes.txt" in results[0]
+        assert "Command output" not in results[0]
+        assert "(exit" not in results[0]
+
+    @pytest.mark.asyncio
+    async def test_declined_list_files_sends_nothing(self, tmp_path, monkeypatch):
+        (tmp_path / "notes.txt").write_text("x")
+        monkeypatch.chdir(tmp_path)
+        self.confirmation.confirm.return_value = False
+        registry = IntentRegistry([s for s in BUILTIN_SPECS if s.name == "list_files"])
+        monkeypatch.setattr(registry, "handler", lambda name: ListFilesHandler(use_shell=False))
+        results = await IntentToolbox(registry).run([ToolCall("a", "list_files", {})], self.ctx)
+        assert "notes.txt" not in results[0]
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_become_results(self, monkeypatch):
+        registry = IntentRegistry([IntentSpec("public_ip", "unused:Handler")])
+        handler = Mock()
+        handler.handle = AsyncMock(side_effect=RuntimeError("boom"))
+        monkeypatch.setattr(registry, "handler", lambda name: handler)
+        results = await IntentToolbox(registry).run([ToolCall("a", "get_public_ip", {})], self.ctx)
+        assert results == ["Error: boom"]
@@ -1,5 +1,6 @@
 """Tests for list files intent handler."""
 
+import os
 import pytest
 from unittest.mock import Mock, AsyncMock
 from agent.intents.list_files import ListFilesHandler
@@ -15,6 +16,7 @@ class TestListFilesHandler:
         self.mock_context = Mock(spec=IntentContext)
         self.mock_context.commands = Mock()
         self.mock_context.commands.maybe_run = AsyncMock()
+        self.mock_context.commands.run_native = AsyncMock()
 
     def test_matches_list_files_queries(self):
         """Test that list files queries are matched correctly."""
@@ -53,7 +55,8 @@ class TestListFilesHandler:
 
     @pytest.mark.asyncio
     async def test_handle_windows_command_basic(self):
-        """Test basic handling on Windows."""
+        """Test basic shell handling on Windows."""
+        self.handler = ListFilesHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.list_files.OS.is_windows", lambda: True)
             
@@ -65,7 +68,8 @@ class TestListFilesHandler:
 
     @pytest.mark.asyncio
     async def test_handle_windows_command_with_hidden(self):
-        """Test handling with hidden files on Windows."""
+        """Test shell handling with hidden files on Windows."""
+        self.handler = ListFilesHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.list_files.OS.is_windows", lambda: True)
             
@@ -77,7 +81,8 @@ class TestListFilesHandler:
 
     @pytest.mark.asyncio
     async def test_handle_unix_command_basic(self):
-        """Test basic handling on Unix-like systems."""
+        """Test basic shell handling on Unix-like systems."""
+        self.handler = ListFilesHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.list_files.OS.is_windows", lambda: False)
             
@@ -89,7 +94,8 @@ class TestListFilesHandler:
 
     @pytest.mark.asyncio
     async def test_handle_unix_command_with_hidden(self):
-        """Test handling with hidden files on Unix-like systems."""
+        """Test shell handling with hidden files on Unix-like systems."""
+        self.handler = ListFilesHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.list_files.OS.is_windows", lambda: False)
             
@@ -105,3 +111,35 @@ class TestListFilesHandler:
         result = await self.handler.handle("list files", self.mock_context)
         assert result is True
 
+    @pytest.mark.asyncio
+    async def test_handle_lists_in_process_by_default(self):
+        """Test that listing streams rows from the native lister."""
+        await self.handler.handle("list files", self.mock_context)
+
+        self.mock_context.commands.maybe_run.assert_not_called()
+        description, action = self.mock_context.commands.run_native.call_args[0]
+        assert description == f"list files in {os.getcwd()}"
+        assert self.mock_context.commands.run_native.call_args.kwargs == {"confirm": True}
+        lines = list(action())
+        assert lines[-1].startswith("-- ")
+
+    def test_parse_options(self):
+        """Test that listing hints are read from the request."""
+        options = self.handler.parse_options("list all *.py files by size, page 2, first 50")
+
+        assert options.show_hidden is True
+        assert options.pattern == "*.py"
+        assert options.sort == "size"
+        assert options.reverse is True
+        assert options.page == 2
+        assert options.page_size == 50
+
+    def test_parse_options_defaults(self):
+        """Test default listing options for a plain request."""
+        options = self.handler.parse_options("can you list files?")
+
+        assert options.show_hidden is False
+        assert options.pattern is None
+        assert options.sort == "name"
+        assert options.page == 1
+        assert options.page_size == 200
@@ -1,9 +1,11 @@
 """Tests for public IP intent handler."""
 
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch
 from agent.intents.public_ip import PublicIpHandler
 from agent.intents.base import IntentContext
+from agent.commands.service import CommandService
+from agent.net.http_client import HttpClient
 
 
 class TestPublicIpHandler:
@@ -15,6 +17,7 @@ class TestPublicIpHandler:
         self.mock_context = Mock(spec=IntentContext)
         self.mock_context.commands = Mock()
         self.mock_context.commands.maybe_run = AsyncMock()
+        self.mock_context.commands.run_native = AsyncMock()
 
     def test_matches_ip_queries(self):
         """Test that IP queries are matched correctly."""
@@ -51,7 +54,8 @@ class TestPublicIpHandler:
 
     @pytest.mark.asyncio
     async def test_handle_windows_command(self):
-        """Test handling on Windows."""
+        """Test shell handling on Windows."""
+        self.handler = PublicIpHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.public_ip.OS.is_windows", lambda: True)
             
@@ -63,7 +67,8 @@ class TestPublicIpHandler:
 
     @pytest.mark.asyncio
     async def test_handle_unix_command(self):
-        """Test handling on Unix-like systems."""
+        """Test shell handling on Unix-like systems."""
+        self.handler = PublicIpHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.public_ip.OS.is_windows", lambda: False)
             
@@ -78,3 +83,22 @@ class TestPublicIpHandler:
         """Test that handle returns True."""
         result = await self.handler.handle("What's my IP?", self.mock_context)
         assert result is True
+
+    @pytest.mark.asyncio
+    async def test_handle_fetches_ip_in_process(self, local_http_server):
+        """Test the in-process lookup against a stand-in ifconfig.me."""
+        async with local_http_server({"/ip": (200, b"203.0.113.7\n"), "/bad": (200, b"<html>")}) as server:
+            confirmation = Mock()
+            confirmation.confirm = AsyncMock(return_value=True)
+            ctx = IntentContext(CommandService(Mock(), confirmation))
+            http = HttpClient()
+
+            with patch('builtins.print') as mock_print:
+                await PublicIpHandler(use_shell=False, url=server.url("/ip"), http=http).handle("my ip", ctx)
+                await PublicIpHandler(use_shell=False, url=server.url("/bad"), http=http).handle("my ip", ctx)
+            await http.close()
+
+        print_calls = [call[0][0] for call in mock_print.call_args_list]
+        assert "203.0.113.7" in print_calls
+        assert any("Unexpected response" in call for call in print_calls)
+        assert server.connections == 1
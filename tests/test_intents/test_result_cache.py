@@ -0,0 +1,148 @@
+"""Tests for the intent result cache."""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock
+from agent.core.metrics import Metrics
+from agent.intents.cache import ResultCache, run_cached_command
+from agent.intents.base import IntentContext
+from agent.intents.weather import WeatherHandler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+
+    @pytest.mark.asyncio
+    async def test_miss_then_fresh_hit(self):
+        """Test that a loaded value is served from memory within its TTL."""
+        metrics = Metrics()
+        cache = ResultCache(clock=self.clock, metrics=metrics)
+        load = AsyncMock(return_value="sunny")
+
+        value, entry = await cache.fetch("weather", "paris", 600, load)
+        assert (value, entry) == ("sunny", None)
+
+        self.clock.now += 599
+        value, entry = await cache.fetch("weather", "paris", 600, load)
+        assert value == "sunny"
+        assert entry is not None
+        load.assert_called_once()
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert metrics.counters("intent_cache.") == {"intent_cache.hit": 1, "intent_cache.miss": 1}
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_and_revalidated(self):
+        """Test stale-while-revalidate refresh in the background."""
+        cache = ResultCache(clock=self.clock)
+        await cache.fetch("weather", "paris", 600, AsyncMock(return_value="sunny"), stale_ttl=3600)
+
+        self.clock.now += 700
+        refresh = AsyncMock(return_value="rainy")
+        value, entry = await cache.fetch("weather", "paris", 600, AsyncMock(), refresh, stale_ttl=3600)
+        assert value == "sunny"
+        assert cache.stale_hits == 1
+
+        await asyncio.sleep(0)
+        refresh.assert_called_once()
+        assert cache.get("weather", "paris").value == "rainy"
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_reloaded(self):
+        """Test that entries past the stale window are loaded again."""
+        cache = ResultCache(clock=self.clock)
+        await cache.fetch("public_ip", "", 60, AsyncMock(return_value="1.2.3.4"), stale_ttl=120)
+
+        self.clock.now += 121
+        load = AsyncMock(return_value="5.6.7.8")
+        value, entry = await cache.fetch("public_ip", "", 60, load, stale_ttl=120)
+
+        assert (value, entry) == ("5.6.7.8", None)
+        load.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_not_cached(self):
+        """Test that a None result is not stored."""
+        cache = ResultCache(clock=self.clock)
+        await cache.fetch("weather", "x", 600, AsyncMock(return_value=None))
+
+        assert cache.get("weather", "x") is None
+
+    def test_disk_tier_is_shared_between_instances(self, temp_dir):
+        """Test that a second cache instance reads entries from disk."""
+        ResultCache(temp_dir, clock=self.clock).put("weather", "paris", "sunny", 600)
+
+        other = ResultCache(temp_dir, clock=self.clock)
+        assert other.get("weather", "paris").value == "sunny"
+
+        self.clock.now += 601
+        assert other.get("weather", "paris") is None
+
+    def test_from_env(self, monkeypatch, temp_dir):
+        """Test cache configuration from the environment."""
+        monkeypatch.setenv("INTENT_CACHE", "0")
+        assert ResultCache.from_env() is None
+
+        monkeypatch.setenv("INTENT_CACHE", "1")
+        monkeypatch.setenv("INTENT_CACHE_DIR", temp_dir)
+        assert ResultCache.from_env()._dir is not None
+
+
+class TestCachedIntents:
+    """Test cases for intents served through the cache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.commands = Mock()
+        self.commands.maybe_run = AsyncMock(return_value=(0, "Paris: +12C", ""))
+        self.commands.run_quiet = AsyncMock(return_value=(0, "Paris: +13C", ""))
+        self.ctx = IntentContext(self.commands, ResultCache())
+
+    @pytest.mark.asyncio
+    async def test_second_weather_request_hits_cache(self):
+        """Test that repeating a city query does not run the command again."""
+        handler = WeatherHandler(use_shell=True)
+
+        await handler.handle("weather in Paris", self.ctx)
+        await handler.handle("Weather in  paris!", self.ctx)
+
+        self.commands.maybe_run.assert_called_once()
+        self.commands.show_cached.assert_called_once()
+        assert self.commands.show_cached.call_args[0][0] == "Paris: +12C"
+
+    @pytest.mark.asyncio
+    async def test_declined_command_is_not_cached(self):
+        """Test that a skipped command leaves nothing in the cache."""
+        self.commands.maybe_run = AsyncMock(return_value=None)
+
+        await run_cached_command(self.ctx, "public_ip", "", "curl -s https://ifconfig.me", 60, 60)
+
+        assert self.ctx.cache.get("public_ip", "") is None
+        self.commands.show_cached.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stale_refresh_reruns_only_the_approved_command(self):
+        """Test that a differently spelt command sharing the key is never run unconfirmed."""
+        clock = FakeClock()
+        self.ctx = IntentContext(self.commands, ResultCache(clock=clock))
+        handler = WeatherHandler(use_shell=True)
+
+        await handler.handle("weather in Paris", self.ctx)
+        clock.now += handler._CACHE_TTL + 1
+        await handler.handle("weather in paris", self.ctx)
+        await asyncio.gather(*self.ctx.cache._tasks)
+
+        self.commands.maybe_run.assert_called_once_with("curl -s https://wttr.in/Paris")
+        self.commands.run_quiet.assert_called_once_with("curl -s https://wttr.in/Paris")
+        assert self.ctx.cache.get("weather_shell", "paris").source == "curl -s https://wttr.in/Paris"
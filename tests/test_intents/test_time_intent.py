@@ -1,5 +1,6 @@
 """Tests for time intent handler."""
 
+import re
 import pytest
 from unittest.mock import Mock, AsyncMock
 from agent.intents.time_only import TimeHandler
@@ -15,6 +16,7 @@ class TestTimeHandler:
         self.mock_context = Mock(spec=IntentContext)
         self.mock_context.commands = Mock()
         self.mock_context.commands.maybe_run = AsyncMock()
+        self.mock_context.commands.run_native = AsyncMock()
 
     def test_matches_time_queries(self):
         """Test that time queries are matched correctly."""
@@ -50,7 +52,8 @@ class TestTimeHandler:
 
     @pytest.mark.asyncio
     async def test_handle_windows_command(self):
-        """Test handling on Windows."""
+        """Test shell handling on Windows."""
+        self.handler = TimeHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.time_only.OS.is_windows", lambda: True)
             
@@ -62,7 +65,8 @@ class TestTimeHandler:
 
     @pytest.mark.asyncio
     async def test_handle_unix_command(self):
-        """Test handling on Unix-like systems."""
+        """Test shell handling on Unix-like systems."""
+        self.handler = TimeHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.time_only.OS.is_windows", lambda: False)
             
@@ -77,3 +81,20 @@ class TestTimeHandler:
         """Test that handle returns True."""
         result = await self.handler.handle("What's the time?", self.mock_context)
         assert result is True
+
+    @pytest.mark.asyncio
+    async def test_handle_in_process_by_default(self):
+        """Test that the time is read in-process without a shell command."""
+        await self.handler.handle("What's the time?", self.mock_context)
+
+        self.mock_context.commands.maybe_run.assert_not_called()
+        self.mock_context.commands.run_native.assert_called_once()
+        action = self.mock_context.commands.run_native.call_args[0][1]
+        assert re.match(r"^\d{2}:\d{2}:\d{2}$", action())
+
+    def test_shell_mode_from_environment(self, monkeypatch):
+        """Test that INTENT_EXEC=shell selects the shell command path."""
+        monkeypatch.setenv("INTENT_EXEC", "shell")
+        assert TimeHandler()._use_shell is True
+        monkeypatch.setenv("INTENT_EXEC", "native")
+        assert TimeHandler()._use_shell is False
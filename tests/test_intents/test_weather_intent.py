@@ -1,9 +1,11 @@
 """Tests for weather intent handler."""
 
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch
 from agent.intents.weather import WeatherHandler
 from agent.intents.base import IntentContext
+from agent.commands.service import CommandService
+from agent.net.http_client import HttpClient
 
 
 class TestWeatherHandler:
@@ -15,6 +17,7 @@ class TestWeatherHandler:
         self.mock_context = Mock(spec=IntentContext)
         self.mock_context.commands = Mock()
         self.mock_context.commands.maybe_run = AsyncMock()
+        self.mock_context.commands.run_native = AsyncMock()
 
     def test_matches_weather_queries(self):
         """Test that weather queries are matched correctly."""
@@ -47,7 +50,8 @@ class TestWeatherHandler:
 
     @pytest.mark.asyncio
     async def test_handle_windows_command_with_city(self):
-        """Test handling with city on Windows."""
+        """Test shell handling with city on Windows."""
+        self.handler = WeatherHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.weather.OS.is_windows", lambda: True)
             
@@ -59,7 +63,8 @@ class TestWeatherHandler:
 
     @pytest.mark.asyncio
     async def test_handle_windows_command_without_city(self):
-        """Test handling without city on Windows."""
+        """Test shell handling without city on Windows."""
+        self.handler = WeatherHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.weather.OS.is_windows", lambda: True)
             
@@ -71,7 +76,8 @@ class TestWeatherHandler:
 
     @pytest.mark.asyncio
     async def test_handle_unix_command_with_city(self):
-        """Test handling with city on Unix-like systems."""
+        """Test shell handling with city on Unix-like systems."""
+        self.handler = WeatherHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.weather.OS.is_windows", lambda: False)
             
@@ -83,7 +89,8 @@ class TestWeatherHandler:
 
     @pytest.mark.asyncio
     async def test_handle_unix_command_without_city(self):
-        """Test handling without city on Unix-like systems."""
+        """Test shell handling without city on Unix-like systems."""
+        self.handler = WeatherHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.weather.OS.is_windows", lambda: False)
             
@@ -95,7 +102,8 @@ class TestWeatherHandler:
 
     @pytest.mark.asyncio
     async def test_handle_city_name_processing(self):
-        """Test that city names are processed correctly."""
+        """Test that city names are processed correctly in shell commands."""
+        self.handler = WeatherHandler(use_shell=True)
         with pytest.MonkeyPatch().context() as m:
             m.setattr("agent.intents.weather.OS.is_windows", lambda: False)
             
@@ -111,8 +119,48 @@ class TestWeatherHandler:
                 "curl -s https://wttr.in/St._Petersburg"
             )
 
+    @pytest.mark.asyncio
+    async def test_handle_city_from_paraphrase(self):
+        """Test city extraction for prompts routed here without the word weather."""
+        self.handler = WeatherHandler(use_shell=True)
+        with pytest.MonkeyPatch().context() as m:
+            m.setattr("agent.intents.weather.OS.is_windows", lambda: False)
+
+            await self.handler.handle("what's outside like in Berlin", self.mock_context)
+            self.mock_context.commands.maybe_run.assert_called_with("curl -s https://wttr.in/Berlin")
+
+            await self.handler.handle("is it raining in Buenos Aires today?", self.mock_context)
+            self.mock_context.commands.maybe_run.assert_called_with("curl -s https://wttr.in/Buenos_Aires")
+
+            await self.handler.handle("give me the forecast for tomorrow", self.mock_context)
+            self.mock_context.commands.maybe_run.assert_called_with("curl -s https://wttr.in")
+
     @pytest.mark.asyncio
     async def test_handle_returns_true(self):
         """Test that handle returns True."""
         result = await self.handler.handle("weather", self.mock_context)
         assert result is True
+
+    @pytest.mark.asyncio
+    async def test_handle_fetches_compact_report_in_process(self, local_http_server):
+        """Test the in-process fetch against a stand-in wttr.in."""
+        line = b"New York|Sunny|+20\xc2\xb0C|+19\xc2\xb0C|\xe2\x86\x9215km/h|40%|0.0mm"
+        async with local_http_server({"/New_York": (200, line)}) as server:
+            confirmation = Mock()
+            confirmation.confirm = AsyncMock(return_value=True)
+            ctx = IntentContext(CommandService(Mock(), confirmation))
+            http = HttpClient()
+            handler = WeatherHandler(use_shell=False, base_url=server.url(""), http=http)
+
+            with patch('builtins.print') as mock_print:
+                await handler.handle("weather in New York", ctx)
+            await http.close()
+
+        confirmation.confirm.assert_called_once_with(f"GET {server.url('')}/New_York")
+        assert server.requests[0].startswith("/New_York?format=")
+        print_calls = [call[0][0] for call in mock_print.call_args_list]
+        assert "New York: Sunny, +20°C (feels like +19°C), wind →15km/h, humidity 40%, precipitation 0.0mm" in print_calls
+
+    def test_render_passes_through_unexpected_text(self):
+        """Test that non-report responses are shown unchanged."""
+        assert WeatherHandler.render("Unknown location\n") == "Unknown location"
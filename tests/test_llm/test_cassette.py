@@ -0,0 +1,116 @@
+"""Tests for cassette recording and replay."""
+
+import asyncio
+import pytest
+from agent.llm.cassette import RecordingClient, RecordingToolClient, ReplayClient, conversation, load
+from agent.llm.interfaces import ToolCall
+from agent.llm.usage import note_model, record_usage, track_usage
+
+
+class FakeClient:
+    async def complete(self, prompt, system_prompt):
+        record_usage(10, 2)
+        if prompt == "fail":
+            raise ValueError("quota")
+        return f"re: {prompt}"
+
+    async def complete_with_history(self, prompt, system_prompt, history):
+        return f"re: {prompt} after {len(history)}"
+
+    async def complete_with_tools(self, prompt, system_prompt, history, tools, run_tools):
+        results = await run_tools([ToolCall("c1", "get_time", {})])
+        return f"it is {results[0]}"
+
+
+class TestCassette:
+    """Test cases for RecordingClient and ReplayClient."""
+
+    @pytest.mark.asyncio
+    async def test_record_and_replay(self, tmp_path):
+        path = str(tmp_path / "cassette.jsonl.gz")
+        recorder = RecordingClient.wrap(FakeClient(), path, session="s1", model="m")
+        assert isinstance(recorder, RecordingToolClient)
+        assert await recorder.complete("hi", "sys") == "re: hi"
+        history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "re: hi"}]
+        assert await recorder.complete_with_history("and?", "sys", history) == "re: and? after 2"
+        with pytest.raises(ValueError):
+            await recorder.complete("fail", "sys")
+
+        recorded = load(path)
+        assert [(i.session, i.turn, i.method) for i in recorded] == [
+            ("s1", 1, "complete"),
+            ("s1", 2, "complete_with_history"),
+            ("s1", 3, "complete"),
+        ]
+        assert recorded[0].usage == {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12, "cached_tokens": 0, "requests": 1}
+        assert recorded[2].error == "quota"
+
+        replay = ReplayClient(recorded, scale=0)
+        with track_usage() as usage:
+            assert await replay.complete("hi", "other system prompt") == "re: hi"
+        assert usage.total_tokens == 12
+        # A different history still finds the prompt
+        assert await replay.complete_with_history("and?", "sys", []) == "re: and? after 2"
+        with pytest.raises(RuntimeError, match="quota"):
+            await replay.complete("fail", "sys")
+        with pytest.raises(LookupError):
+            await replay.complete("never asked", "sys")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_conversations_get_their_own_sessions(self, tmp_path):
+        class RoutedClient(FakeClient):
+            async def complete(self, prompt, system_prompt):
+                note_model("strong-model" if "hard" in prompt else "fast-model")
+                return await super().complete(prompt, system_prompt)
+
+        path = str(tmp_path / "cassette.jsonl")
+        recorder = RecordingClient.wrap(RoutedClient(), path, session="run", model="configured")
+
+        async def talk(session, prompts):
+            with conversation(session):
+                for prompt in prompts:
+                    await recorder.complete(prompt, "sys")
+                    await asyncio.sleep(0)
+
+        await asyncio.gather(talk("a", ["a1", "hard a2"]), talk("b", ["b1", "b2", "b3"]))
+        await recorder.complete("outside", "sys")
+
+        recorded = load(path)
+        assert sorted((i.session, i.turn, i.prompt) for i in recorded) == [
+            ("a", 1, "a1"), ("a", 2, "hard a2"),
+            ("b", 1, "b1"), ("b", 2, "b2"), ("b", 3, "b3"),
+            ("run", 1, "outside"),
+        ]
+        assert {i.prompt: i.model for i in recorded}["hard a2"] == "strong-model"
+        assert {i.prompt: i.model for i in recorded}["a1"] == "fast-model"
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_are_replayed(self, tmp_path):
+        path = str(tmp_path / "cassette.jsonl")
+        recorder = RecordingClient.wrap(FakeClient(), path)
+
+        async def run_tools(calls):
+            return ["noon"]
+
+        assert await recorder.complete_with_tools("time?", "sys", [], [], run_tools) == "it is noon"
+        (interaction,) = load(path)
+        assert interaction.tool_calls == [{"id": "c1", "name": "get_time", "arguments": {}}]
+        assert len(interaction.latencies) == 2
+
+        seen = []
+
+        async def replay_tools(calls):
+            seen.extend(calls)
+            return ["ignored"]
+
+        reply = await ReplayClient([interaction], scale=0).complete_with_tools("time?", "sys", [], [], replay_tools)
+        assert reply == "it is noon"
+        assert seen == [ToolCall("c1", "get_time", {})]
+
+    def test_tool_method_only_when_inner_has_it(self, tmp_path):
+        class Plain:
+            async def complete(self, prompt, system_prompt):
+                return ""
+
+        recorder = RecordingClient.wrap(Plain(), str(tmp_path / "c.jsonl"))
+        assert not hasattr(recorder, "complete_with_tools")
@@ -0,0 +1,71 @@
+"""Tests for per-query generation profiles."""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from agent.core.metrics import Metrics
+from agent.llm.gemini_client import GeminiClient
+from agent.llm.generation import CODE, DEFAULT, LONG, SHORT, GenerationProfiles, classify
+from agent.llm.openai_client import OpenAIClient
+from agent.llm.usage import track_usage
+
+
+class TestGenerationProfiles:
+    """Test cases for profile selection and output tracking."""
+
+    def test_classify(self):
+        assert classify("What is the capital of France?") == SHORT
+        assert classify("Write a Python function that reverses a list") == CODE
+        assert classify("why does this fail?\n```\nx = [1\n```") == CODE
+        assert classify("Give me a detailed guide to sourdough baking") == LONG
+        assert classify("Tell me about the Roman empire") == DEFAULT
+        assert classify("What " + "very " * 40 + "long question is this?") == DEFAULT
+
+    def test_explanatory_questions_are_not_short(self):
+        assert classify("Can you explain how TLS handshakes work?") == DEFAULT
+        assert classify("What are the main differences between processes and threads?") == DEFAULT
+        assert classify("Do you know how to set up a Kubernetes cluster?") == DEFAULT
+        assert classify("How many moons does Mars have?") == SHORT
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("LLM_MAX_TOKENS", "short=100, code=5000")
+        profiles = GenerationProfiles.from_env()
+        assert profiles.select("Who wrote Hamlet?").max_tokens == 100
+        monkeypatch.setenv("LLM_PROFILES", "0")
+        assert GenerationProfiles.from_env().select("Who wrote Hamlet?").name == DEFAULT
+        monkeypatch.setenv("LLM_MAX_TOKENS", "tiny=1")
+        with pytest.raises(ValueError):
+            GenerationProfiles.from_env()
+
+    @pytest.mark.asyncio
+    async def test_openai_request_uses_the_profile(self):
+        sdk = Mock()
+        sdk.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="Paris"), finish_reason="length")],
+            usage=SimpleNamespace(prompt_tokens=20, completion_tokens=256, total_tokens=276),
+        )
+        with patch("agent.llm.openai_client.OpenAI", return_value=sdk):
+            client = OpenAIClient("gpt-test", "key")
+        metrics = Metrics()
+        client._profiles = GenerationProfiles(metrics=metrics)
+
+        with track_usage() as usage:
+            assert await client.complete("What is the capital of France?", "sys") == "Paris"
+        kwargs = sdk.chat.completions.create.call_args.kwargs
+        assert kwargs["max_tokens"] == 256 and kwargs["stop"] == ["\nUser:"]
+        assert usage.profile == SHORT
+        assert metrics.summary("llm.output_tokens.short").max == 256
+        assert metrics.counter("llm.output_truncated.short") == 1
+
+    @pytest.mark.asyncio
+    async def test_gemini_request_uses_the_profile(self):
+        model = Mock()
+        model.generate_content.return_value = SimpleNamespace(text="def f(): pass")
+        g = Mock()
+        g.GenerativeModel.return_value = model
+        with patch("agent.llm.gemini_client.genai", return_value=g):
+            client = GeminiClient("gemini-test", "key")
+
+        await client.complete_with_history("Write a function that adds two numbers", "sys", [])
+        config = model.generate_content.call_args.kwargs["generation_config"]
+        assert config["max_output_tokens"] == 3000 and "stop_sequences" not in config
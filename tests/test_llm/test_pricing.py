@@ -0,0 +1,26 @@
+"""Tests for token pricing."""
+
+import pytest
+from agent.llm.pricing import cost, parse_prices, provider_for
+
+
+class TestPricing:
+    """Test cases for cost estimates."""
+
+    def test_cost_uses_longest_matching_name(self):
+        prices = {"gpt-4o": (2.0, 8.0), "gpt-4o-mini": (0.1, 0.4)}
+        usage = {"prompt_tokens": 1_000_000, "completion_tokens": 500_000}
+        assert cost("gpt-4o-mini-2024-07-18", usage, prices) == pytest.approx(0.3)
+        assert cost("GPT-4o", usage, prices) == pytest.approx(6.0)
+        assert cost("gpt-4", usage, prices) is None
+        assert cost("gpt-4o", None, prices) is None
+
+    def test_parse_prices(self):
+        assert parse_prices("a=1/2; b=0.5;") == {"a": (1.0, 2.0), "b": (0.5, 0.5)}
+        with pytest.raises(ValueError):
+            parse_prices("a=cheap")
+
+    def test_provider_for(self):
+        assert provider_for("gpt-4o-mini") == "openai"
+        assert provider_for("gemini-2.5-flash") == "gemini"
+        assert provider_for("llama3") is None
@@ -0,0 +1,87 @@
+"""Tests for fast/strong model routing."""
+
+import asyncio
+import json
+import pytest
+from agent.config.params import AiParameters
+from agent.core.metrics import Metrics
+from agent.llm.factory import LLMClientFactory
+from agent.llm.routing import FAST, STRONG, ModelRouter, RoutingClient, RoutingRules, RoutingToolClient
+from agent.llm.stub_client import StubClient
+from agent.llm.usage import track_usage
+
+
+class TestModelRouter:
+    """Test cases for prompt scoring."""
+
+    def setup_method(self):
+        self.router = ModelRouter(RoutingRules("small", "big", long_prompt=50, deep_history=4))
+
+    def test_short_plain_prompt_goes_fast(self):
+        decision = self.router.route("what is the capital of France?")
+        assert (decision.tier, decision.model, decision.score) == (FAST, "small", 0)
+
+    def test_code_and_keywords_go_strong(self):
+        decision = self.router.route("Explain this:\n```\nx = 1\n```")
+        assert decision.tier == STRONG and decision.score == 3
+        assert decision.reasons == ["code (+2)", "keywords explain (+1)"]
+
+    def test_length_and_history_add_up(self):
+        assert self.router.route("a" * 60, history=4).score == 2
+        assert self.router.route("a" * 201).score == 2
+        assert self.router.route("a" * 60).tier == FAST
+
+
+class TestRoutingClient:
+    """Test cases for RoutingClient."""
+
+    @pytest.mark.asyncio
+    async def test_requests_go_to_the_chosen_client(self, tmp_path):
+        log = tmp_path / "routes.jsonl"
+        metrics = Metrics()
+        router = ModelRouter(RoutingRules("small", "big"))
+        client = RoutingClient(StubClient("small"), StubClient("big"), router, str(log), metrics)
+        with track_usage() as usage:
+            assert (await client.complete("hi", "sys")).startswith("[stub:small]")
+        assert usage.model == "small"
+        assert (await client.complete_with_history("why? compare them", "sys", [])).startswith("[stub:big]")
+        assert [d.tier for d in client.decisions] == [FAST, STRONG]
+        assert all(d.latency is not None for d in client.decisions)
+        assert metrics.counter("llm.route.fast") == 1 and metrics.counter("llm.route.strong") == 1
+        assert [json.loads(line)["model"] for line in log.read_text().splitlines()] == ["small", "big"]
+
+    @pytest.mark.asyncio
+    async def test_latency_leaves_out_tool_execution(self):
+        class Tools(StubClient):
+            async def complete_with_tools(self, prompt, system_prompt, history, tools, run_tools):
+                return str(await run_tools([]))
+
+        async def slow_tools(batch):
+            await asyncio.sleep(0.2)  # e.g. the user confirming a command
+            return []
+
+        router = ModelRouter(RoutingRules("a", "b"))
+        client = RoutingClient.wrap(Tools("a"), Tools("b"), router)
+        await client.complete_with_tools("hi", "sys", [], [], slow_tools)
+        assert client.decisions[0].latency < 0.1
+
+    def test_tool_method_only_when_both_clients_have_it(self):
+        class Tools(StubClient):
+            async def complete_with_tools(self, *args):
+                return ""
+
+        router = ModelRouter(RoutingRules("a", "b"))
+        assert isinstance(RoutingClient.wrap(Tools("a"), Tools("b"), router), RoutingToolClient)
+        assert not hasattr(RoutingClient.wrap(Tools("a"), StubClient("b"), router), "complete_with_tools")
+
+    def test_factory_routes_when_both_models_are_set(self, monkeypatch):
+        params = AiParameters(agent="a", model="m", provider="stub")
+        monkeypatch.delenv("LLM_RECORD", raising=False)
+        monkeypatch.delenv("LLM_REPLAY", raising=False)
+        monkeypatch.setenv("LLM_FAST_MODEL", "small")
+        monkeypatch.delenv("LLM_STRONG_MODEL", raising=False)
+        assert isinstance(LLMClientFactory.create(params), StubClient)
+        monkeypatch.setenv("LLM_STRONG_MODEL", "big")
+        client = LLMClientFactory.create(params)
+        assert isinstance(client, RoutingClient)
+        assert client.router.rules.strong_model == "big"
@@ -0,0 +1,106 @@
+"""Tests for the OpenAI and Gemini tool-call loops."""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, AsyncMock, patch
+from agent.llm.gemini_client import GeminiClient
+from agent.llm.interfaces import ToolCall, ToolDefinition
+from agent.llm.openai_client import OpenAIClient
+
+TOOLS = [
+    ToolDefinition("get_current_time", "Local time.", {"type": "object", "properties": {}}),
+    ToolDefinition("get_weather", "Weather.", {"type": "object", "properties": {"city": {"type": "string"}}}),
+]
+
+
+def _openai_message(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+
+def _openai_call(call_id, name, arguments):
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+class TestOpenAIToolCalling:
+    """Test cases for OpenAIClient.complete_with_tools."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.sdk = Mock()
+        with patch("agent.llm.openai_client.OpenAI", return_value=self.sdk):
+            self.client = OpenAIClient("gpt-test", "key")
+
+    @pytest.mark.asyncio
+    async def test_runs_all_calls_then_asks_once(self):
+        self.sdk.chat.completions.create.side_effect = [
+            _openai_message(tool_calls=[
+                _openai_call("c1", "get_current_time", "{}"),
+                _openai_call("c2", "get_weather", '{"city": "Paris"}'),
+            ]),
+            _openai_message(content="It is 10:00 and sunny in Paris."),
+        ]
+        run_tools = AsyncMock(return_value=["10:00:00", "Paris: Sunny"])
+
+        reply = await self.client.complete_with_tools("time and weather in Paris?", "sys", [], TOOLS, run_tools)
+
+        assert reply == "It is 10:00 and sunny in Paris."
+        run_tools.assert_awaited_once_with([
+            ToolCall("c1", "get_current_time", {}),
+            ToolCall("c2", "get_weather", {"city": "Paris"}),
+        ])
+        assert self.sdk.chat.completions.create.call_count == 2
+        first, second = self.sdk.chat.completions.create.call_args_list
+        assert first.kwargs["tools"][1]["function"]["name"] == "get_weather"
+        assert second.kwargs["tool_choice"] == "none"
+        messages = second.kwargs["messages"]
+        assert [m["role"] for m in messages[-3:]] == ["assistant", "tool", "tool"]
+        assert messages[-1] == {"role": "tool", "tool_call_id": "c2", "content": "Paris: Sunny"}
+
+    @pytest.mark.asyncio
+    async def test_plain_answer_skips_tools(self):
+        self.sdk.chat.completions.create.return_value = _openai_message(content=" Hello ")
+        run_tools = AsyncMock()
+        assert await self.client.complete_with_tools("hi", "sys", [], TOOLS, run_tools) == "Hello"
+        run_tools.assert_not_called()
+
+
+class TestGeminiToolCalling:
+    """Test cases for GeminiClient.complete_with_tools."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.model = Mock()
+        g = Mock()
+        g.GenerativeModel.return_value = self.model
+        with patch("agent.llm.gemini_client.genai", return_value=g):
+            self.client = GeminiClient("gemini-test", "key")
+
+    @pytest.mark.asyncio
+    async def test_runs_all_calls_then_asks_once(self):
+        content = SimpleNamespace(parts=[
+            SimpleNamespace(function_call=SimpleNamespace(name="get_current_time", args={})),
+            SimpleNamespace(function_call=SimpleNamespace(name="get_weather", args={"city": "Oslo"})),
+        ])
+        first = SimpleNamespace(candidates=[SimpleNamespace(content=content)])
+        self.model.generate_content.side_effect = [first, SimpleNamespace(text="Cold in Oslo.")]
+        run_tools = AsyncMock(return_value=["09:00:00", "Oslo: Snow"])
+
+        reply = await self.client.complete_with_tools("time and weather in Oslo", "sys", [], TOOLS, run_tools)
+
+        assert reply == "Cold in Oslo."
+        run_tools.assert_awaited_once_with([
+            ToolCall("call_0", "get_current_time", {}),
+            ToolCall("call_1", "get_weather", {"city": "Oslo"}),
+        ])
+        first_call, second_call = self.model.generate_content.call_args_list
+        declarations = first_call.kwargs["tools"][0]["function_declarations"]
+        assert "parameters" not in declarations[0]
+        assert declarations[1]["parameters"]["properties"]["city"] == {"type": "string"}
+        assert second_call.kwargs["tool_config"] == {"function_calling_config": {"mode": "NONE"}}
+        responses = second_call.args[0][-1]["parts"]
+        assert responses[1] == {"function_response": {"name": "get_weather", "response": {"result": "Oslo: Snow"}}}
+
+    @pytest.mark.asyncio
+    async def test_unavailable_model(self):
+        client = GeminiClient("gemini-test", None)
+        assert await client.complete_with_tools("hi", "sys", [], TOOLS, AsyncMock()) == "(Gemini unavailable)"
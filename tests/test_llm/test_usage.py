@@ -0,0 +1,37 @@
+"""Tests for per-task token usage."""
+
+import asyncio
+import pytest
+from agent.llm.usage import record_usage, track_usage
+
+
+class TestUsage:
+    """Test cases for track_usage / record_usage."""
+
+    def test_outside_tracking_is_a_no_op(self):
+        record_usage(1, 2)  # must not raise
+
+    def test_non_integer_counts_are_ignored(self):
+        with track_usage() as usage:
+            record_usage(3, object(), 10)
+        assert usage.as_dict() == {"prompt_tokens": 3, "completion_tokens": 0, "total_tokens": 10, "cached_tokens": 0, "requests": 1}
+
+    def test_nested_blocks_count_towards_the_outer_one(self):
+        with track_usage() as outer:
+            record_usage(1, 1)
+            with track_usage() as inner:
+                record_usage(2, 2)
+        assert inner.total_tokens == 4
+        assert outer.as_dict() == {"prompt_tokens": 3, "completion_tokens": 3, "total_tokens": 6, "cached_tokens": 0, "requests": 2}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_are_kept_apart(self):
+        async def ask(tokens):
+            with track_usage() as usage:
+                await asyncio.sleep(0)
+                record_usage(tokens, 1)
+                await asyncio.sleep(0)
+                record_usage(tokens, 1)
+            return usage.total_tokens
+
+        assert await asyncio.gather(ask(1), ask(10)) == [4, 22]
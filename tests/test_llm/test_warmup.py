@@ -0,0 +1,82 @@
+"""Tests for background connection warm-up."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from agent.core.metrics import Metrics
+from agent.llm.warmup import ConnectionWarmer
+
+
+class FakeClient:
+    """Warm-up takes 50 ms on a cold connection and 10 ms on an open one."""
+
+    def __init__(self):
+        self.pings = 0
+
+    async def warm_up(self):
+        self.pings += 1
+        await asyncio.sleep(0.05 if self.pings == 1 else 0.01)
+
+    async def complete(self, prompt, system_prompt):
+        return f"answer to {prompt}"
+
+
+class TestConnectionWarmer:
+    """Test cases for ConnectionWarmer."""
+
+    def setup_method(self):
+        self.metrics = Metrics()
+
+    @pytest.mark.asyncio
+    async def test_warms_up_and_records_saved_latency(self):
+        client = FakeClient()
+        warmer = ConnectionWarmer(client, refresh_after=10, metrics=self.metrics)
+        assert warmer.start()
+        await asyncio.sleep(0.1)
+
+        assert await warmer.client.complete("hi", "") == "answer to hi"
+        assert await warmer.client.complete("again", "") == "answer to again"
+        await warmer.stop()
+
+        assert client.pings == 2
+        saved = self.metrics.summary("llm.warmup.saved_seconds")
+        assert saved.count == 1  # only the first request found a fresh connection
+        assert 0.02 < saved.total < 0.1
+
+    @pytest.mark.asyncio
+    async def test_refreshes_when_idle_and_gives_up(self):
+        client = FakeClient()
+        warmer = ConnectionWarmer(client, refresh_after=0.05, give_up_after=0.3, metrics=self.metrics)
+        warmer.start()
+        await asyncio.sleep(0.5)
+        refreshes = self.metrics.summary("llm.warmup.refresh_seconds").count
+        assert refreshes >= 2
+        await asyncio.sleep(0.2)
+        assert self.metrics.summary("llm.warmup.refresh_seconds").count == refreshes  # stopped
+
+        await warmer.client.complete("back", "")  # activity resumes refreshing
+        await asyncio.sleep(0.15)
+        await warmer.stop()
+        assert self.metrics.summary("llm.warmup.refresh_seconds").count > refreshes
+
+    @pytest.mark.asyncio
+    async def test_failures_and_clients_without_warm_up(self):
+        client = Mock()
+        client.warm_up = AsyncMock(side_effect=RuntimeError("403"))
+        warmer = ConnectionWarmer(client, metrics=self.metrics)
+        warmer.start()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert self.metrics.counter("llm.warmup.failed") == 1
+        assert not warmer.start()  # not retried
+
+        plain = ConnectionWarmer(Mock(spec=["complete"]), metrics=self.metrics)
+        assert not plain.start()
+        assert not hasattr(plain.client, "complete_with_tools")
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("LLM_WARMUP", "0")
+        assert ConnectionWarmer.from_env(FakeClient()) is None
+        monkeypatch.setenv("LLM_WARMUP", "1")
+        monkeypatch.setenv("LLM_KEEPALIVE_SECONDS", "12")
+        assert ConnectionWarmer.from_env(FakeClient())._refresh_after == 12
@@ -0,0 +1,89 @@
+"""Tests for the pooled asyncio HTTP client."""
+
+import pytest
+from agent.net.http_client import HttpClient, HttpError
+
+
+class TestHttpClient:
+    """Test cases for HttpClient against a local stand-in server."""
+
+    @pytest.mark.asyncio
+    async def test_get_returns_body(self, local_http_server):
+        """Test a plain GET with Content-Length."""
+        async with local_http_server({"/ip": (200, b"203.0.113.7")}) as server:
+            client = HttpClient()
+            response = await client.get(server.url("/ip"))
+            await client.close()
+
+        assert response.status == 200
+        assert response.text() == "203.0.113.7"
+
+    @pytest.mark.asyncio
+    async def test_connection_is_reused(self, local_http_server):
+        """Test that sequential requests share one keep-alive connection."""
+        async with local_http_server({"/a": (200, b"a"), "/b": (200, b"b")}) as server:
+            client = HttpClient()
+            for path in ("/a", "/b", "/a"):
+                await client.get(server.url(path))
+            idle = client.idle_connections()
+            await client.close()
+
+        assert server.connections == 1
+        assert server.requests == ["/a", "/b", "/a"]
+        assert idle == 1
+
+    @pytest.mark.asyncio
+    async def test_connection_close_is_honoured(self, local_http_server):
+        """Test that a Connection: close response is not pooled."""
+        async with local_http_server({"/": {"status": 200, "body": b"x", "close": True}}) as server:
+            client = HttpClient()
+            await client.get(server.url("/"))
+            await client.get(server.url("/"))
+            await client.close()
+
+        assert server.connections == 2
+
+    @pytest.mark.asyncio
+    async def test_chunked_response(self, local_http_server):
+        """Test chunked transfer decoding."""
+        body = b"Paris|Sunny|+20C|+19C|5km/h|40%|0.0mm"
+        async with local_http_server({"/Paris": {"status": 200, "body": body, "chunked": True}}) as server:
+            client = HttpClient()
+            response = await client.get(server.url("/Paris?format=x"))
+            await client.close()
+
+        assert response.body == body
+        assert server.requests == ["/Paris?format=x"]
+
+    @pytest.mark.asyncio
+    async def test_response_size_limit(self, local_http_server):
+        """Test that oversized responses are rejected."""
+        async with local_http_server({"/big": (200, b"x" * 2048)}) as server:
+            client = HttpClient(max_body=1024)
+            with pytest.raises(HttpError, match="larger than 1024"):
+                await client.get(server.url("/big"))
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, local_http_server):
+        """Test that slow responses time out."""
+        async with local_http_server({"/slow": {"status": 200, "body": b"x", "delay": 1}}) as server:
+            client = HttpClient(timeout=0.1)
+            with pytest.raises(HttpError, match="Timed out"):
+                await client.get(server.url("/slow"))
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_non_2xx_status(self, local_http_server):
+        """Test that error statuses raise HttpError."""
+        async with local_http_server({}) as server:
+            client = HttpClient()
+            with pytest.raises(HttpError, match="HTTP 404"):
+                await client.get(server.url("/missing"))
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_unsupported_url(self):
+        """Test that non-HTTP URLs are rejected."""
+        with pytest.raises(HttpError, match="Unsupported URL"):
+            await HttpClient().get("ftp://example.com/")
@@ -0,0 +1,57 @@
+"""Tests for the asyncio stdin line reader."""
+
+import asyncio
+import os
+import signal
+import sys
+import threading
+import pytest
+from unittest.mock import patch
+from agent.utils.console import LineReader
+
+
+class TestLineReader:
+    """Test cases for LineReader."""
+
+    @pytest.mark.asyncio
+    async def test_loop_keeps_running_while_waiting(self):
+        typed = threading.Event()
+        ticks = []
+
+        def slow_input(prompt):
+            typed.wait(5)
+            return "hello"
+
+        async def background():
+            for _ in range(5):
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+            typed.set()
+
+        with patch("builtins.input", side_effect=slow_input):
+            line, _ = await asyncio.gather(LineReader().readline("> "), background())
+        assert line == "hello"
+        assert len(ticks) == 5  # ran while input() was blocked
+
+    @pytest.mark.asyncio
+    async def test_eof_is_raised(self):
+        with patch("builtins.input", side_effect=EOFError):
+            with pytest.raises(EOFError):
+                await LineReader().readline()
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="needs loop signal handlers")
+    @pytest.mark.asyncio
+    async def test_ctrl_c_interrupts_and_next_read_gets_the_line(self):
+        typed = threading.Event()
+        reader = LineReader()
+        loop = asyncio.get_running_loop()
+        previous = signal.getsignal(signal.SIGINT)
+
+        with patch("builtins.input", side_effect=lambda prompt: typed.wait(5) and "late line"):
+            loop.call_later(0.05, os.kill, os.getpid(), signal.SIGINT)
+            with pytest.raises(KeyboardInterrupt):
+                await reader.readline("> ")
+            assert signal.getsignal(signal.SIGINT) is previous
+
+            typed.set()
+            assert await reader.readline("> ") == "late line"
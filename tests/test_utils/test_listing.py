@@ -0,0 +1,84 @@
+"""Tests for the streaming directory lister."""
+
+import os
+from agent.utils.listing import DirectoryLister, ListingOptions
+
+
+def _make_files(root, names):
+    for name in names:
+        with open(os.path.join(root, name), "w") as f:
+            f.write("x" * len(name))
+
+
+def _names(lines):
+    return [line.split()[-1] for line in lines[:-1]]
+
+
+class TestDirectoryLister:
+    """Test cases for DirectoryLister."""
+
+    def test_lists_sorted_by_name_with_footer(self, temp_dir):
+        """Test default listing order and summary footer."""
+        _make_files(temp_dir, ["b.txt", "a.txt", "c.py"])
+        os.mkdir(os.path.join(temp_dir, "sub"))
+
+        lines = list(DirectoryLister(temp_dir).iter_lines(ListingOptions()))
+
+        assert _names(lines) == ["a.txt", "b.txt", "c.py", "sub/"]
+        assert lines[0].startswith("-rw")
+        assert lines[-1] == "-- entries 1-4 of 4"
+
+    def test_hidden_files_are_skipped_unless_requested(self, temp_dir):
+        """Test hidden file filtering."""
+        _make_files(temp_dir, [".secret", "visible"])
+
+        lines = list(DirectoryLister(temp_dir).iter_lines(ListingOptions()))
+        assert _names(lines) == ["visible"]
+        assert "1 hidden or filtered" in lines[-1]
+
+        lines = list(DirectoryLister(temp_dir).iter_lines(ListingOptions(show_hidden=True)))
+        assert _names(lines) == [".secret", "visible"]
+
+    def test_glob_filter(self, temp_dir):
+        """Test glob filtering is case-insensitive."""
+        _make_files(temp_dir, ["a.PY", "b.py", "c.txt"])
+
+        lines = list(DirectoryLister(temp_dir).iter_lines(ListingOptions(pattern="*.py")))
+
+        assert _names(lines) == ["a.PY", "b.py"]
+        assert "matching '*.py'" in lines[-1]
+
+    def test_pagination_and_cap(self, temp_dir):
+        """Test that only one page is printed but all entries are counted."""
+        _make_files(temp_dir, [f"f{i:02d}" for i in range(25)])
+        lister = DirectoryLister(temp_dir)
+
+        lines = list(lister.iter_lines(ListingOptions(page=2, page_size=10)))
+        assert _names(lines) == [f"f{i:02d}" for i in range(10, 20)]
+        assert lines[-1] == "-- entries 11-20 of 25; ask for page 3 to see more"
+
+        lines = list(lister.iter_lines(ListingOptions(page=4, page_size=10)))
+        assert lines == ["-- no entries on page 4 (25 total)"]
+
+        lines = list(lister.iter_lines(ListingOptions(page=0, page_size=10)))
+        assert lines[-1] == "-- entries 1-10 of 25; ask for page 2 to see more"
+
+    def test_sort_by_size_largest_first(self, temp_dir):
+        """Test sorting by size."""
+        _make_files(temp_dir, ["aa", "a", "aaaa"])
+
+        lines = list(DirectoryLister(temp_dir).iter_lines(ListingOptions(sort="size", reverse=True)))
+
+        assert _names(lines) == ["aaaa", "aa", "a"]
+
+    def test_unsorted_listing_streams(self, temp_dir):
+        """Test that unsorted listings yield rows before the scan finishes."""
+        _make_files(temp_dir, [f"f{i}" for i in range(50)])
+
+        lines = DirectoryLister(temp_dir).iter_lines(ListingOptions(sort="none", page_size=5))
+        first = next(lines)
+        rest = list(lines)
+
+        assert first.split()[-1].startswith("f")
+        assert len(rest) == 5  # four more rows and the footer
+        assert rest[-1].endswith("of 50; ask for page 2 to see more")
@@ -67,3 +67,27 @@ class TestOS:
         with patch('platform.system', return_value='DARWIN'):
             assert OS.is_macos() is True
 
+
+    @pytest.mark.parametrize("command, expected", [
+        ("ls -l", ["ls", "-l"]),
+        ("date '+%Y-%m-%d'", ["date", "+%Y-%m-%d"]),
+        ('echo "a b"', ["echo", "a b"]),
+        ("curl -s https://wttr.in/New_York", ["curl", "-s", "https://wttr.in/New_York"]),
+        ("ls -la | head", None),
+        ("echo $HOME", None),
+        ("ls *.py", None),
+        ("cat < file", None),
+        ("cd /tmp", None),
+        ("FOO=1 env", None),
+        ('echo "unterminated', None),
+        ("", None),
+    ])
+    def test_direct_args(self, command, expected):
+        """Test which commands can skip the shell."""
+        with patch('platform.system', return_value='Linux'):
+            assert OS.direct_args(command) == expected
+
+    def test_direct_args_windows(self):
+        """Test that Windows always goes through cmd."""
+        with patch('platform.system', return_value='Windows'):
+            assert OS.direct_args("dir") is None